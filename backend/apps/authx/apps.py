@@ -3,3 +3,6 @@ from django.apps import AppConfig
 class AuthxConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.authx'
+
+    def ready(self):
+        import apps.authx.signals
@@ -0,0 +1,93 @@
+"""
+Versioned cache of authenticated users (with their company) for JWT auth.
+
+Entries are keyed by a per-user version and validated against a per-company
+version; bumping a version makes every cached copy unreachable at once.
+
+A deactivation must reach every worker at once, so the cache is only used
+when AUTH_USER_CACHE_ALIAS is a shared backend (Redis, Memcached, ...). On a
+per-process backend users are read from the database on every request.
+
+Users are always read from the primary, even by safe-method requests routed
+to a read replica: a lagging replica would still authenticate a user who was
+just deactivated, and put that stale copy back in the cache after the
+invalidation.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+User = get_user_model()
+
+# Backends whose entries live in one process: an invalidation made by the
+# worker that handled a write would not reach the others.
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+def _cache():
+    """The user cache, or None when the configured backend is not shared."""
+    cache = caches[getattr(settings, 'AUTH_USER_CACHE_ALIAS', 'default')]
+    return None if isinstance(cache, PROCESS_LOCAL_BACKENDS) else cache
+
+def _load_user(user_id):
+    return User.objects.using(DEFAULT_DB_ALIAS).select_related('company').filter(pk=user_id).first()
+
+def _timeout():
+    return getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 300)
+
+def user_version_key(user_id):
+    return f"authx:user-version:{user_id}"
+
+def company_version_key(company_id):
+    return f"authx:company-version:{company_id}"
+
+def _bump(key):
+    cache = _cache()
+    if cache is None:
+        return
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted between add() and incr(); any new value invalidates.
+        cache.set(key, 1, timeout=None)
+
+def invalidate_user(user_id):
+    _bump(user_version_key(user_id))
+
+def invalidate_company(company_id):
+    _bump(company_version_key(company_id))
+
+def get_user(user_id, company_id=None):
+    """
+    Return the user (with ``company`` loaded) from cache or database, or None.
+    ``company_id`` may come from a token claim; it lets both versions be read
+    in one round-trip.
+    """
+    cache = _cache()
+    if cache is None:
+        return _load_user(user_id)
+    version_keys = [user_version_key(user_id)]
+    if company_id is not None:
+        version_keys.append(company_version_key(company_id))
+    versions = cache.get_many(version_keys)
+    entry_key = f"authx:user:{user_id}:{versions.get(version_keys[0], 0)}"
+
+    entry = cache.get(entry_key)
+    if entry is not None:
+        user, cached_company_version = entry
+        if user.company_id == company_id:
+            company_version = versions.get(company_version_key(company_id), 0)
+        else:
+            company_version = cache.get(company_version_key(user.company_id), 0)
+        if company_version == cached_company_version:
+            return user
+
+    user = _load_user(user_id)
+    if user is None:
+        return None
+    company_version = cache.get(company_version_key(user.company_id), 0)
+    cache.set(entry_key, (user, company_version), _timeout())
+    return user
@@ -28,5 +28,10 @@ class User(AbstractUser):
 
     objects = UserManager()
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['company', 'role', '-created_at'], name='user_company_role_idx'),
+        ]
+
     def __str__(self):
         return f"{self.email} ({self.role})"
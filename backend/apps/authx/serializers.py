@@ -2,11 +2,12 @@ from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from django.contrib.auth import get_user_model
 from rest_framework.validators import UniqueValidator
+from apps.core.serializers import SparseFieldsMixin
 from .models import Company
 
 User = get_user_model()
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('id', 'full_name', 'email', 'role', 'is_active', 'created_at')
@@ -69,6 +70,14 @@ class CompanySerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'created_at')
 
 class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        # Informational claims; CachedJWTAuthentication still checks the cached user.
+        token['role'] = user.role
+        token['company_id'] = user.company_id
+        return token
+
     def validate(self, attrs):
         data = super().validate(attrs)
         
@@ -0,0 +1,21 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import User, Company
+from .cache import invalidate_user, invalidate_company
+
+# Invalidate once the change is committed: a request that read the old row
+# before the commit could otherwise cache it under the new version.
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    # Covers toggle_status, role changes and any other account update.
+    user_id = instance.pk
+    transaction.on_commit(lambda: invalidate_user(user_id))
+
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+def invalidate_cached_company(sender, instance, **kwargs):
+    company_id = instance.pk
+    transaction.on_commit(lambda: invalidate_company(company_id))
@@ -0,0 +1,72 @@
+from unittest import mock
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from rest_framework.test import APIClient
+from apps.core.routers import ReplicaRouter
+from apps.core.testing import TenantTestCase
+from . import cache
+from .models import User
+from .serializers import MyTokenObtainPairSerializer
+
+
+class CachedUserTests(TenantTestCase):
+    client_user = 'owner'
+
+    def setUp(self):
+        super().setUp()
+        # Stands in for the shared backend (Redis) the cache requires.
+        self.shared = LocMemCache('authx-tests', {})
+        self.shared.clear()
+        patcher = mock.patch('apps.authx.cache._cache', return_value=self.shared)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def bearer(self, user):
+        client = APIClient()
+        token = MyTokenObtainPairSerializer.get_token(user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return client
+
+    def test_cached_user_is_served_without_queries(self):
+        self.assertEqual(cache.get_user(self.tech.pk, self.company.pk), self.tech)
+        with self.assertNumQueries(0):
+            user = cache.get_user(self.tech.pk, self.company.pk)
+        self.assertEqual((user, user.company), (self.tech, self.company))
+
+    def test_users_are_read_from_the_primary(self):
+        with mock.patch.object(ReplicaRouter, 'db_for_read', return_value='replica') as db_for_read:
+            self.assertEqual(cache.get_user(self.tech.pk, self.company.pk), self.tech)
+        db_for_read.assert_not_called()
+
+    def test_saves_invalidate_the_user_and_company(self):
+        cache.get_user(self.tech.pk, self.company.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.get(pk=self.tech.pk).save(update_fields=['full_name'])
+        with self.assertNumQueries(1):
+            cache.get_user(self.tech.pk, self.company.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.company.name = "Acme Renamed"
+            self.company.save()
+        self.assertEqual(cache.get_user(self.tech.pk, self.company.pk).company.name, "Acme Renamed")
+
+    def test_deactivated_user_is_rejected(self):
+        client = self.bearer(self.tech)
+        self.assertEqual(client.get('/auth/me/').status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/auth/employees/{self.tech.pk}/toggle_status/')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(client.get('/auth/me/').status_code, 401)
+
+    def test_read_racing_the_commit_is_not_kept(self):
+        client = self.bearer(self.tech)
+        self.assertEqual(client.get('/auth/me/').status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                tech = User.objects.get(pk=self.tech.pk)
+                tech.is_active = False
+                tech.save()
+                # A concurrent request still sees the committed, active row and caches it.
+                with mock.patch('apps.authx.cache._load_user', return_value=self.tech):
+                    self.assertTrue(cache.get_user(self.tech.pk, self.company.pk).is_active)
+        self.assertEqual(client.get('/auth/me/').status_code, 401)
@@ -4,12 +4,15 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from rest_framework.decorators import action
 from .serializers import (
     RegisterSerializer, UserSerializer, CreateEmployeeSerializer, 
     CompanySerializer, MyTokenObtainPairSerializer
 )
 from .permissions import IsOwnerOrManager   
+from apps.core.eager_loading import EagerLoadingMixin
+from apps.core.transactions import AtomicWritesMixin
 
 User = get_user_model()
 
@@ -21,10 +24,11 @@ class RegisterView(generics.CreateAPIView):
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user = serializer.save()
+        with transaction.atomic():
+            user = serializer.save()
         
         # Generate Tokens
-        refresh = RefreshToken.for_user(user)
+        refresh = MyTokenObtainPairSerializer.get_token(user)
         
         return Response({
             "message": f"Company '{user.company.name}' registered successfully. You are now the Company Owner.",
@@ -68,7 +72,7 @@ class RoleListView(APIView):
         ]
         return Response(roles)
 
-class BaseUserViewSet(viewsets.ModelViewSet):
+class BaseUserViewSet(AtomicWritesMixin, EagerLoadingMixin, viewsets.ModelViewSet):
     permission_classes = [IsOwnerOrManager]
 
     def get_serializer_class(self):
@@ -90,7 +94,8 @@ class BaseUserViewSet(viewsets.ModelViewSet):
         # Owners can toggle anyone. Managers can toggle Techs/Users.
         if user_role == 'COMPANY_OWNER' or (user_role == 'MANAGER' and user.role in ['TECHNICIAN', 'USER']):
             user.is_active = not user.is_active
-            user.save()
+            with transaction.atomic():
+                user.save()
             status_str = "activated" if user.is_active else "deactivated"
             return Response({"message": f"User account has been {status_str}."}, status=status.HTTP_200_OK)
         
@@ -99,7 +104,8 @@ class BaseUserViewSet(viewsets.ModelViewSet):
 class ManagerViewSet(BaseUserViewSet):
     """ViewSet for Owner to manage Managers."""
     def get_queryset(self):
-        return User.objects.filter(company=self.request.user.company, role='MANAGER')
+        queryset = User.objects.filter(company=self.request.user.company, role='MANAGER')
+        return self.eager_load(queryset)
 
     def perform_create(self, serializer):
         if self.request.user.role != 'COMPANY_OWNER':
@@ -115,10 +121,11 @@ class ManagerViewSet(BaseUserViewSet):
 class EmployeeViewSet(BaseUserViewSet):
     """ViewSet for Managers/Owners to manage Technicians and standard Users."""
     def get_queryset(self):
-        return User.objects.filter(
+        queryset = User.objects.filter(
             company=self.request.user.company, 
             role__in=['TECHNICIAN', 'USER']
         )
+        return self.eager_load(queryset)
 
     def perform_create(self, serializer):
         if self.request.user.role not in ['COMPANY_OWNER', 'MANAGER']:
@@ -0,0 +1,56 @@
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import close_old_connections, connection, connections
+
+_executor = None
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'CONCURRENT_QUERY_WORKERS', 4),
+            thread_name_prefix='db-query'
+        )
+    return _executor
+
+def _keep_worker_connections():
+    # CONN_MAX_AGE (0 by default) would close a worker's connection after
+    # every task, so each query would connect anew. Connections opened on a
+    # worker are kept for CONCURRENT_QUERY_CONN_MAX_AGE instead, health
+    # checked before reuse, without making request connections persistent.
+    max_age = getattr(settings, 'CONCURRENT_QUERY_CONN_MAX_AGE', 60)
+    for conn in connections.all(initialized_only=True):
+        if conn.connection is not None and getattr(conn, '_worker_connection', None) is not conn.connection:
+            conn._worker_connection = conn.connection
+            conn.close_at = time.monotonic() + max_age
+            conn.health_check_enabled = True
+
+def _run_in_worker(func):
+    close_old_connections()
+    try:
+        return func()
+    finally:
+        _keep_worker_connections()
+        close_old_connections()
+
+def run_concurrently(*funcs):
+    """
+    Call independent read-only functions (typically one query each) on a
+    bounded thread pool and return their results in order, so the wall time
+    is roughly that of the slowest one.
+
+    Runs them in order on the calling thread when the pool is disabled
+    (CONCURRENT_QUERY_WORKERS < 2) or inside a transaction, whose
+    uncommitted rows other connections cannot see. Only worth it for queries
+    that take noticeably longer than a pool hand-off.
+    """
+    if len(funcs) < 2 or getattr(settings, 'CONCURRENT_QUERY_WORKERS', 4) < 2 or connection.in_atomic_block:
+        return [func() for func in funcs]
+    # Each task runs in a copy of the caller's context, so request-scoped
+    # state such as database routing (apps.core.routers) carries over.
+    futures = [
+        _get_executor().submit(contextvars.copy_context().run, _run_in_worker, func) for func in funcs
+    ]
+    return [future.result() for future in futures]
@@ -0,0 +1,95 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+def _relation_path(model, source_attrs):
+    """
+    Resolve a serializer source (e.g. ['equipment', 'maintenance_team']) against
+    the model and return (lookup, is_many, related_model) for its relational
+    prefix, or None if the source does not start with a model relation.
+    """
+    lookup, is_many = [], False
+    for attr in source_attrs:
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            break
+        if not field.is_relation:
+            break
+        lookup.append(attr)
+        is_many = is_many or field.many_to_many or field.one_to_many
+        model = field.related_model
+    if not lookup:
+        return None
+    return '__'.join(lookup), is_many, model
+
+
+def get_eager_loading(serializer, prefix='', model=None, in_prefetch=False):
+    """
+    Walk a serializer's readable fields and return the (select_related,
+    prefetch_related) lookups needed to render it without N+1 queries.
+    Nested serializers are followed recursively.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    model = model or serializer.Meta.model
+    select_related, prefetch_related = set(), set()
+
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*':
+            continue
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+        is_nested = isinstance(nested, serializers.BaseSerializer)
+        is_many_related = isinstance(field, serializers.ManyRelatedField)
+
+        source_attrs = field.source_attrs
+        if not is_nested and not is_many_related:
+            # Plain fields only need a join when they reach across a relation.
+            source_attrs = source_attrs[:-1]
+        relation = _relation_path(model, source_attrs)
+        if relation is None:
+            continue
+        lookup, is_many, related_model = relation
+        lookup = prefix + lookup
+        nested_in_prefetch = in_prefetch or is_many
+
+        if nested_in_prefetch:
+            prefetch_related.add(lookup)
+        else:
+            select_related.add(lookup)
+
+        if is_nested:
+            nested_select, nested_prefetch = get_eager_loading(
+                nested, lookup + '__', related_model, nested_in_prefetch
+            )
+            select_related |= nested_select
+            prefetch_related |= nested_prefetch
+
+    return select_related, prefetch_related
+
+
+def eager_load(queryset, serializer):
+    """
+    Apply the joins and prefetches required by ``serializer`` (a class or an
+    instance) to ``queryset``.
+    """
+    if isinstance(serializer, type):
+        serializer = serializer()
+    select_related, prefetch_related = get_eager_loading(serializer, model=queryset.model)
+    if select_related:
+        queryset = queryset.select_related(*sorted(select_related))
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*sorted(prefetch_related))
+    return queryset
+
+
+class EagerLoadingMixin:
+    """
+    ViewSet mixin that derives select_related/prefetch_related from the
+    serializer in use, so new nested fields are covered automatically.
+    Call ``self.eager_load(queryset)`` at the end of ``get_queryset``.
+    """
+
+    def eager_load(self, queryset):
+        serializer = self.get_serializer_class()(context=self.get_serializer_context())
+        return eager_load(queryset, serializer)
@@ -0,0 +1,98 @@
+"""
+In-process publish/subscribe for server push (Server-Sent Events).
+
+Model signals publish small per-company events after commit; each open
+``/events/`` connection holds a Subscription whose queue is fed on the
+connection's event loop. The broker lives in the worker process, so every
+ASGI worker serves the events of writes made in that worker; run a single
+ASGI worker for push (or swap EVENT_BROKER for a shared backend).
+"""
+import asyncio
+import threading
+from collections import defaultdict
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+def company_channel(company_id):
+    return f"company:{company_id}"
+
+
+class Subscription:
+    def __init__(self, broker, channel, maxsize):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def deliver(self, event):
+        # Runs on the subscriber's event loop.
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A client this far behind should reload rather than replay.
+            self.overflowed = True
+
+    async def get(self, timeout):
+        """Return the next event, or None after ``timeout`` seconds of silence."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    def __init__(self):
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel):
+        """Subscribe to ``channel``; must be called from the consuming event loop."""
+        subscription = Subscription(self, channel, getattr(settings, 'EVENTS_QUEUE_SIZE', 100))
+        with self._lock:
+            self._subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.channel]
+
+    def publish(self, channel, event):
+        """Deliver ``event`` to every subscriber of ``channel``; safe from any thread."""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # The connection's loop is gone.
+                self.unsubscribe(subscription)
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+
+_broker = None
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        _broker = import_string(getattr(settings, 'EVENT_BROKER', 'apps.core.events.InProcessBroker'))()
+    return _broker
+
+def publish_on_commit(company_id, event_type, **data):
+    """Publish a company event once the current transaction commits."""
+    if company_id is None:
+        return
+    event = {'type': event_type, **data}
+    transaction.on_commit(lambda: get_broker().publish(company_channel(company_id), event))
@@ -0,0 +1,69 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+User = get_user_model()
+
+DEFAULT_PATHS = [
+    '/maintenance/',
+    '/maintenance/kanban/',
+    '/maintenance/calendar/',
+    '/maintenance/my_tasks/',
+    '/maintenance/my_reports/',
+    '/maintenance/stats/',
+    '/equipment/',
+    '/teams/',
+    '/auth/managers/',
+    '/auth/employees/',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Call API endpoints as a tenant user and print the database query plan "
+        "of every SELECT they run, to check which indexes are used."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help="Endpoint paths to explain (default: main list/board endpoints).")
+        parser.add_argument('--user', help="Email of the user to run as (default: owner of the largest company).")
+
+    def handle(self, *args, **options):
+        user = self.get_user(options['user'])
+        client = APIClient()
+        client.force_authenticate(user)
+        explain = 'EXPLAIN QUERY PLAN' if connection.vendor == 'sqlite' else 'EXPLAIN'
+
+        self.stdout.write(f"Running as {user.email} on {connection.vendor}\n")
+        for path in options['paths'] or DEFAULT_PATHS:
+            with CaptureQueriesContext(connection) as ctx:
+                response = client.get(path, {'all': 1})
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"{path} -> {response.status_code}, {len(ctx.captured_queries)} queries"
+            ))
+            for query in ctx.captured_queries:
+                sql = query['sql']
+                if not sql.lstrip().upper().startswith('SELECT'):
+                    continue
+                self.stdout.write(f"  {sql}")
+                with connection.cursor() as cursor:
+                    cursor.execute(f"{explain} {sql}")
+                    for row in cursor.fetchall():
+                        self.stdout.write("    " + " | ".join(str(col) for col in row))
+            self.stdout.write("")
+
+    def get_user(self, email):
+        if email:
+            try:
+                return User.objects.get(email=email)
+            except User.DoesNotExist:
+                raise CommandError(f"No user with email {email}.")
+        owner = User.objects.filter(role=User.Role.COMPANY_OWNER, company__isnull=False).annotate(
+            company_requests=Count('company__maintenancerequest')
+        ).order_by('-company_requests').first()
+        if owner is None:
+            raise CommandError("No company owner found; seed some data or pass --user.")
+        return owner
@@ -0,0 +1,127 @@
+import contextvars
+import functools
+import statistics
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+from rest_framework import serializers
+
+
+class QueryTimer:
+    """Database execute wrapper that counts queries and accumulates their time."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+class SerializationTimer:
+    """
+    Accumulates the time a request spends building its response data
+    (serializer .data, values projections), less the queries run meanwhile,
+    which its QueryTimer already counts.
+    """
+
+    def __init__(self, queries):
+        self.queries = queries
+        self.duration = 0.0
+        self.active = False
+
+
+_serialization = contextvars.ContextVar('request_serialization', default=None)
+
+
+@contextmanager
+def serialization_timer(queries):
+    """Make a SerializationTimer the current request's for the duration of the block."""
+    timer = SerializationTimer(queries)
+    token = _serialization.set(timer)
+    try:
+        yield timer
+    finally:
+        _serialization.reset(token)
+
+
+def timed_serialization(func):
+    """Count calls of ``func`` (outside nested ones) as the current request's serialization."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        timer = _serialization.get()
+        if timer is None or timer.active:
+            return func(*args, **kwargs)
+        timer.active = True
+        started, db_before = time.perf_counter(), timer.queries.duration
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timer.active = False
+            timer.duration += time.perf_counter() - started - (timer.queries.duration - db_before)
+    return wrapper
+
+
+def instrument_serializers():
+    """Time DRF serializers' .data as serialization. Safe to call more than once."""
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        data = cls.__dict__['data']
+        if not hasattr(data.fget, '__wrapped__'):
+            cls.data = property(timed_serialization(data.fget))
+
+
+class RequestMetrics:
+    """
+    Rolling in-memory window of per-request timings, grouped by URL name.
+    Each worker process keeps its own window.
+    """
+
+    def __init__(self, window=500):
+        self.window = window
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+        self._lock = threading.Lock()
+
+    def record(self, url_name, total, view, serialize, render, db, queries):
+        with self._lock:
+            self._samples[url_name].append((total, view, serialize, render, db, queries))
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+    def summary(self):
+        with self._lock:
+            samples = {name: list(values) for name, values in self._samples.items()}
+        return {name: self._summarize(values) for name, values in sorted(samples.items())}
+
+    @staticmethod
+    def _summarize(values):
+        totals = sorted(value[0] for value in values)
+
+        def percentile(pct):
+            return totals[min(len(totals) - 1, int(len(totals) * pct / 100))]
+
+        def mean(index):
+            return statistics.fmean(value[index] for value in values)
+
+        return {
+            "count": len(values),
+            "p50_ms": round(percentile(50), 2),
+            "p95_ms": round(percentile(95), 2),
+            "max_ms": round(totals[-1], 2),
+            "mean_view_ms": round(mean(1), 2),
+            "mean_serialize_ms": round(mean(2), 2),
+            "mean_render_ms": round(mean(3), 2),
+            "mean_db_ms": round(mean(4), 2),
+            "mean_queries": round(mean(5), 1),
+        }
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,136 @@
+import re
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+from .metrics import QueryTimer, instrument_serializers, request_metrics, serialization_timer
+from .routers import (
+    PIN_COOKIE, PIN_HEADER, RequestRouting, _request_routing, replica_alias, resolved_user, sign_pin
+)
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+re_accepts_brotli = re.compile(r'\bbr\b')
+
+
+class RequestMetricsMiddleware:
+    """
+    Opt-in (REQUEST_METRICS_ENABLED) per-request instrumentation.
+
+    Records query count, DB time, view time, serialization time (serializer
+    .data and values projections, less their queries) and render time
+    (encoding the response body), returns them in a Server-Timing header and aggregates them per URL name in a rolling window
+    served by the staff-only request metrics endpoint. When disabled the
+    middleware removes itself from the chain at startup.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        request_metrics.window = getattr(settings, 'REQUEST_METRICS_WINDOW', request_metrics.window)
+        instrument_serializers()
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        request._metrics_view_end = None
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            serialization = stack.enter_context(serialization_timer(timer))
+            response = self.get_response(request)
+        finished = time.perf_counter()
+
+        # process_template_response marks the end of the view for responses
+        # rendered lazily (all DRF responses); otherwise rendering is in the view.
+        view_end = request._metrics_view_end or finished
+        total_ms = (finished - started) * 1000
+        render_ms = (finished - view_end) * 1000
+        db_ms = timer.duration * 1000
+        serialize_ms = serialization.duration * 1000
+        view_ms = max(total_ms - render_ms - serialize_ms - db_ms, 0.0)
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={db_ms:.2f};desc="{timer.count} queries"',
+            f'view;dur={view_ms:.2f}',
+            f'serialize;dur={serialize_ms:.2f}',
+            f'render;dur={render_ms:.2f}',
+            f'total;dur={total_ms:.2f}',
+        ])
+        match = request.resolver_match
+        url_name = match.view_name if match and match.view_name else 'unresolved'
+        request_metrics.record(url_name, total_ms, view_ms, serialize_ms, render_ms, db_ms, timer.count)
+        return response
+
+    def process_template_response(self, request, response):
+        request._metrics_view_end = time.perf_counter()
+        return response
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Negotiated response compression: brotli when the client accepts it and
+    the brotli package is installed, gzip otherwise. Responses smaller than
+    COMPRESSION_MIN_SIZE bytes and Server-Sent Event streams are sent as is.
+    Streaming responses (exports) are gzipped chunk by chunk.
+    """
+
+    def process_response(self, request, response):
+        if response.get('Content-Type', '').startswith('text/event-stream'):
+            return response
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+        accepts = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if brotli is None or response.streaming or response.has_header('Content-Encoding') or \
+                not re_accepts_brotli.search(accepts):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        compressed = brotli.compress(response.content, quality=settings.COMPRESSION_BROTLI_QUALITY)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
+
+
+class ReplicaPinningMiddleware:
+    """
+    Routes the request's reads through ReplicaRouter (see apps.core.routers)
+    and, when it wrote, pins its user to the primary for REPLICA_PIN_SECONDS.
+    Removes itself from the chain when no replica database is configured.
+    """
+
+    def __init__(self, get_response):
+        if replica_alias() is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        routing = RequestRouting(request)
+        token = _request_routing.set(routing)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_routing.reset(token)
+        user = resolved_user(request)
+        if routing.wrote and user is not None:
+            pin = sign_pin(user.pk)
+            response[PIN_HEADER] = pin
+            response.set_cookie(
+                PIN_COOKIE, pin, max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite='Lax'
+            )
+        return response
@@ -0,0 +1,19 @@
+from rest_framework.pagination import CursorPagination
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Keyset pagination over (-created_at, id) for all list endpoints.
+    Page size defaults to REST_FRAMEWORK['PAGE_SIZE'] and can be tuned per
+    request with ?page_size=. Pass ?all=1 to get the unpaginated list the
+    frontend used before pagination was introduced.
+    """
+    ordering = ('-created_at', 'id')
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    unpaginated_query_param = 'all'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if request.query_params.get(self.unpaginated_query_param) in ('1', 'true', 'True'):
+            return None
+        return super().paginate_queryset(queryset, request, view)
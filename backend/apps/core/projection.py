@@ -0,0 +1,194 @@
+"""
+Read-only serialization from values() rows.
+
+ValuesProjection compiles a (possibly sparse) DRF serializer into a list of
+column mappers once, then renders plain row dicts with the same output as
+``serializer.data``. Serializers using anything it cannot reproduce exactly
+(method fields, custom to_representation, non-pk related fields, reverse
+relations, ...) compile to None and callers fall back to DRF.
+"""
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F
+from rest_framework import serializers
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+
+from .metrics import timed_serialization
+
+# Serializer fields whose to_representation returns database values unchanged.
+PASSTHROUGH_FIELDS = (
+    serializers.CharField, serializers.ChoiceField, serializers.IntegerField,
+    serializers.BooleanField, serializers.PrimaryKeyRelatedField,
+)
+# Field types serialized with their own to_representation.
+CONVERTED_FIELDS = (
+    serializers.DateTimeField, serializers.DateField, serializers.TimeField,
+    serializers.DecimalField, serializers.FloatField, serializers.DurationField,
+)
+
+
+class Unsupported(Exception):
+    pass
+
+
+class _Many:
+    """A many-to-many field rendered from a second query, as a pk list or nested objects."""
+
+    def __init__(self, field, parent_pk, projection):
+        self.related_query_name = field.related_query_name()
+        self.model = field.related_model
+        self.parent_pk = parent_pk
+        self.projection = projection
+
+    def fetch(self, parent_ids):
+        queryset = self.model._default_manager.filter(**{f"{self.related_query_name}__in": parent_ids})
+        if self.projection is None:
+            rows = queryset.values_list(F(f"{self.related_query_name}__pk"), 'pk')
+            grouped = {}
+            for parent_id, pk in rows:
+                grouped.setdefault(parent_id, []).append(pk)
+            return grouped
+        rows = list(queryset.values(*sorted(self.projection.columns), _parent=F(f"{self.related_query_name}__pk")))
+        rendered = self.projection.render(rows)
+        grouped = {}
+        for row, item in zip(rows, rendered):
+            grouped.setdefault(row['_parent'], []).append(item)
+        return grouped
+
+
+class ValuesProjection:
+    def __init__(self, serializer, model=None, prefix=''):
+        if isinstance(serializer, serializers.ListSerializer):
+            serializer = serializer.child
+        if type(serializer).to_representation is not serializers.Serializer.to_representation:
+            raise Unsupported(type(serializer).__name__)
+        model = model or serializer.Meta.model
+        self.pk_column = prefix + model._meta.pk.attname
+        self.columns = {self.pk_column}
+        # (key, kind, payload) in output order; kind is 'column', 'nested' or 'many'.
+        self.entries = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            self.entries.append((name, *self._compile(field, model, prefix)))
+
+    @classmethod
+    def for_serializer(cls, serializer):
+        try:
+            return cls(serializer)
+        except Unsupported:
+            return None
+
+    def _compile(self, field, model, prefix):
+        if len(field.source_attrs) != 1:
+            raise Unsupported(field.source)
+        try:
+            model_field = model._meta.get_field(field.source_attrs[0])
+        except FieldDoesNotExist:
+            raise Unsupported(field.source)
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+        if isinstance(field, serializers.ManyRelatedField) or isinstance(nested, serializers.BaseSerializer):
+            if model_field.many_to_many and not model_field.auto_created:
+                if isinstance(field, serializers.ManyRelatedField):
+                    if not isinstance(field.child_relation, serializers.PrimaryKeyRelatedField):
+                        raise Unsupported(field.source)
+                    return 'many', _Many(model_field, self.pk_column, None)
+                return 'many', _Many(model_field, self.pk_column, ValuesProjection(nested, model_field.related_model))
+            if model_field.many_to_one or (model_field.one_to_one and model_field.concrete):
+                projection = ValuesProjection(
+                    nested, model_field.related_model, prefix + model_field.name + '__'
+                )
+                self.columns |= projection.columns
+                return 'nested', projection
+            raise Unsupported(field.source)
+        if isinstance(field, serializers.RelatedField) and not isinstance(field, serializers.PrimaryKeyRelatedField):
+            raise Unsupported(field.source)
+        if not model_field.concrete or model_field.many_to_many:
+            raise Unsupported(field.source)
+        if isinstance(field, PASSTHROUGH_FIELDS):
+            mapper = None
+        elif isinstance(field, CONVERTED_FIELDS):
+            mapper = field.to_representation
+        else:
+            raise Unsupported(field.source)
+        column = prefix + model_field.name
+        self.columns.add(column)
+        return 'column', (column, mapper)
+
+    def values(self, queryset, *extra_columns):
+        """``queryset`` as row dicts holding every column this projection reads."""
+        columns = sorted(self.columns | set(extra_columns))
+        return queryset.select_related(None).prefetch_related(None).values(*columns)
+
+    @timed_serialization
+    def render(self, rows):
+        rows = list(rows)
+        related = {}
+        self._fetch_many(rows, related)
+        return [self._render_row(row, related) for row in rows]
+
+    def _fetch_many(self, rows, related):
+        for _, kind, payload in self.entries:
+            if kind == 'nested':
+                payload._fetch_many(rows, related)
+            elif kind == 'many':
+                parent_ids = {row[payload.parent_pk] for row in rows if row[payload.parent_pk] is not None}
+                related[id(payload)] = payload.fetch(parent_ids) if parent_ids else {}
+
+    def _render_row(self, row, related):
+        data = {}
+        for key, kind, payload in self.entries:
+            if kind == 'column':
+                column, mapper = payload
+                value = row[column]
+                data[key] = mapper(value) if mapper is not None and value is not None else value
+            elif kind == 'nested':
+                data[key] = None if row[payload.pk_column] is None else payload._render_row(row, related)
+            else:
+                data[key] = related[id(payload)].get(row[payload.parent_pk], [])
+        return data
+
+
+class ValuesReadMixin:
+    """
+    ViewSet mixin that serves GET list/retrieve from values() rows through a
+    ValuesProjection of the view's serializer (same JSON as the serializer),
+    falling back to the serializer when the projection is unsupported or
+    FAST_READ_SERIALIZATION is off. Assumes no object-level permissions on
+    retrieve.
+    """
+
+    def get_values_projection(self):
+        if not getattr(settings, 'FAST_READ_SERIALIZATION', True):
+            return None
+        return ValuesProjection.for_serializer(self.get_serializer())
+
+    def _projection_queryset(self, projection):
+        # Cursor pagination reads its ordering fields from the page rows.
+        ordering = getattr(self.paginator, 'ordering', None) or ()
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        return projection.values(
+            self.filter_queryset(self.get_queryset()), *(field.lstrip('-') for field in ordering)
+        )
+
+    def list(self, request, *args, **kwargs):
+        projection = self.get_values_projection()
+        if projection is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self._projection_queryset(projection)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(projection.render(page))
+        return Response(projection.render(queryset))
+
+    def retrieve(self, request, *args, **kwargs):
+        projection = self.get_values_projection()
+        if projection is None:
+            return super().retrieve(request, *args, **kwargs)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(
+            self._projection_queryset(projection), **{self.lookup_field: kwargs[lookup_url_kwarg]}
+        )
+        return Response(projection.render([row])[0])
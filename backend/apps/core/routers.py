@@ -0,0 +1,95 @@
+"""
+Primary/replica database routing.
+
+ReplicaPinningMiddleware tags every request; ReplicaRouter sends the reads of
+safe-method (GET/HEAD/OPTIONS) requests to DATABASE_REPLICA_ALIAS and
+everything else to the primary. Once a request writes, its remaining reads
+go to the primary too, and the writing user is pinned to the primary for
+REPLICA_PIN_SECONDS so they read their own writes despite replication lag.
+Code running outside a request (commands, workers) always uses the primary,
+and so does authentication (apps.authx.cache reads users from it directly).
+
+The pin travels with the client rather than living in a server-side store,
+so it holds whichever worker serves the next request: a signed, timestamped
+user id sent back as the PIN_COOKIE cookie and the PIN_HEADER header.
+Clients that do not keep cookies (cross-origin XHR) echo the header.
+"""
+from contextvars import ContextVar
+from django.conf import settings
+from django.core import signing
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.functional import empty
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PIN_COOKIE = 'db_pin'
+PIN_HEADER = 'X-DB-Pin'
+PIN_SALT = 'apps.core.routers.pin'
+
+_request_routing = ContextVar('request_routing', default=None)
+
+def replica_alias():
+    """The configured replica alias, or None when there is no replica database."""
+    alias = getattr(settings, 'DATABASE_REPLICA_ALIAS', None)
+    return alias if alias and alias in settings.DATABASES else None
+
+def sign_pin(user_id):
+    return signing.TimestampSigner(salt=PIN_SALT).sign(str(user_id))
+
+def pinned_user_id(request):
+    """The user id of a valid, unexpired pin sent with ``request``, or None."""
+    for value in (request.headers.get(PIN_HEADER), request.COOKIES.get(PIN_COOKIE)):
+        if not value:
+            continue
+        try:
+            return signing.TimestampSigner(salt=PIN_SALT).unsign(value, max_age=settings.REPLICA_PIN_SECONDS)
+        except signing.BadSignature:
+            continue
+    return None
+
+def resolved_user(request):
+    """request.user if authentication has already run, without triggering it."""
+    user = request.__dict__.get('user')
+    if getattr(user, '_wrapped', None) is empty:
+        return None
+    return user if user is not None and user.is_authenticated else None
+
+class RequestRouting:
+    """Routing state of the current request."""
+
+    def __init__(self, request):
+        self.request = request
+        self.safe = request.method in SAFE_METHODS
+        self.wrote = False
+        self.pinned = None
+
+    def use_replica(self):
+        if not self.safe or self.wrote:
+            return False
+        if self.pinned is None:
+            # Authentication runs inside the view, so the user is only known
+            # from its first queries on; decide once it is.
+            user = resolved_user(self.request)
+            if user is None:
+                return True
+            self.pinned = pinned_user_id(self.request) == str(user.pk)
+        return not self.pinned
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        routing = _request_routing.get()
+        if routing is not None and routing.use_replica():
+            return replica_alias()
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        routing = _request_routing.get()
+        if routing is not None:
+            routing.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary.
+        aliases = {DEFAULT_DB_ALIAS, replica_alias()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
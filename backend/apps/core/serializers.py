@@ -0,0 +1,64 @@
+from rest_framework import permissions, serializers
+
+
+def parse_field_paths(value):
+    """
+    Parse "id,equipment_details.name,equipment_details.location" into a tree:
+    {'id': {}, 'equipment_details': {'name': {}, 'location': {}}}.
+    """
+    tree = {}
+    for path in value.split(','):
+        node = tree
+        for name in path.strip().split('.'):
+            if name:
+                node = node.setdefault(name, {})
+    return tree
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin for ``?fields=`` and ``?expand=`` on GET requests.
+
+    ``fields`` keeps only the listed fields; ``expand`` keeps only the listed
+    nested serializers (e.g. ``expand=equipment_details`` drops the other
+    ``*_details`` objects and everything nested inside equipment_details).
+    Both accept dotted paths to reach nested serializers. Without either
+    parameter the full representation is returned.
+
+    Fields are pruned before EagerLoadingMixin inspects the serializer, so
+    nested objects that were not asked for are not queried either.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        only, expand = self._sparse_options()
+        if only is None and expand is None:
+            return fields
+        for name, field in list(fields.items()):
+            nested = field.child if isinstance(field, serializers.ListSerializer) else field
+            if only is not None and name not in only:
+                del fields[name]
+            elif isinstance(nested, serializers.BaseSerializer):
+                if expand is not None and name not in expand and (only is None or name not in only):
+                    del fields[name]
+                    continue
+                nested._sparse = (
+                    (only or {}).get(name) or None,
+                    expand.get(name, {}) if expand is not None else None,
+                )
+        return fields
+
+    def _sparse_options(self):
+        if hasattr(self, '_sparse'):
+            return self._sparse
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        request = self.context.get('request')
+        if parent is not None or request is None or request.method not in permissions.SAFE_METHODS:
+            return None, None
+        params = request.query_params
+        return (
+            parse_field_paths(params['fields']) if 'fields' in params else None,
+            parse_field_paths(params['expand']) if 'expand' in params else None,
+        )
@@ -0,0 +1,64 @@
+"""
+Fixtures shared by the apps' test cases.
+
+TenantTestCase builds one company with a user of every role, a maintenance
+team and a piece of equipment, plus a second company whose rows must never
+show up. Test cases extend setUpTestData with what only they need.
+"""
+from django.test import TestCase
+from rest_framework.test import APIClient
+from apps.authx.models import Company, User
+from apps.equipment.models import Equipment
+from apps.maintenance.models import MaintenanceRequest
+from apps.teams.models import MaintenanceTeam
+
+
+class TenantTestCase(TestCase):
+    # The attribute holding the user self.client is authenticated as.
+    client_user = 'manager'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = Company.objects.create(name="Acme")
+        cls.owner = cls.create_user("owner", User.Role.COMPANY_OWNER)
+        cls.manager = cls.create_user("manager", User.Role.MANAGER)
+        cls.tech = cls.create_user("tech", User.Role.TECHNICIAN)
+        cls.user = cls.create_user("user", User.Role.USER)
+        cls.team = MaintenanceTeam.objects.create(name="Crew", company=cls.company)
+        cls.equipment = cls.create_equipment("Press")
+
+        cls.other_company = Company.objects.create(name="Other Co")
+        cls.other_tech = cls.create_user("tech", User.Role.TECHNICIAN, company=cls.other_company)
+        cls.other_team = MaintenanceTeam.objects.create(name="Their crew", company=cls.other_company)
+        cls.other_equipment = cls.create_equipment("Their press", team=cls.other_team)
+
+    @classmethod
+    def create_user(cls, name, role, company=None, **fields):
+        company = company or cls.company
+        fields.setdefault('full_name', name.title())
+        return User.objects.create_user(email=f"{name}@{company.pk}.test", role=role, company=company, **fields)
+
+    @classmethod
+    def create_equipment(cls, name, team=None, **fields):
+        team = team or cls.team
+        fields.setdefault('serial_number', f"SN-{team.company_id}-{name}")
+        fields.setdefault('department', "Ops")
+        fields.setdefault('location', "Hall")
+        return Equipment.objects.create(name=name, maintenance_team=team, company=team.company, **fields)
+
+    @classmethod
+    def create_request(cls, equipment=None, created_by=None, **fields):
+        equipment = equipment or cls.equipment
+        fields.setdefault('subject', "Noise")
+        fields.setdefault('description', "-")
+        return MaintenanceRequest.objects.create(
+            equipment=equipment, company=equipment.company, created_by=created_by or cls.manager, **fields
+        )
+
+    def setUp(self):
+        self.client = self.client_for(getattr(self, self.client_user))
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
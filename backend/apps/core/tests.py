@@ -0,0 +1,452 @@
+import asyncio
+import datetime
+import gzip
+import json
+import re
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock, skipUnless
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.serializers import Serializer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.authx.models import User
+from apps.equipment.serializers import EquipmentSerializer
+from apps.maintenance.models import MaintenanceRequest
+from apps.maintenance.serializers import MaintenanceRequestSerializer
+from apps.teams.models import MaintenanceTeam
+from .concurrency import _run_in_worker
+from .eager_loading import get_eager_loading
+from .metrics import request_metrics
+from .middleware import ReplicaPinningMiddleware, brotli
+from .pagination import CreatedAtCursorPagination
+from .projection import ValuesProjection
+from .renderers import ORJSONParser, ORJSONRenderer
+from .routers import PIN_COOKIE, PIN_HEADER, ReplicaRouter, sign_pin
+from .testing import TenantTestCase
+
+
+@override_settings(EVENTS_HEARTBEAT_SECONDS=0.05)
+class EventStreamAuthTests(TenantTestCase):
+    client_user = 'user'
+
+    def stream_token(self):
+        response = self.client.post('/events/token/')
+        self.assertEqual(response.status_code, 200)
+        return response.data['token']
+
+    async def events(self, response):
+        """The event names of an open stream, read until it ends (or fails the test after 5s)."""
+        async def read():
+            names = []
+            async for chunk in response.streaming_content:
+                text = chunk.decode() if isinstance(chunk, bytes) else chunk
+                names += [line[len("event: "):] for line in text.splitlines() if line.startswith("event: ")]
+            return names
+        return await asyncio.wait_for(read(), 5)
+
+    def test_token_endpoint_requires_authentication(self):
+        self.assertEqual(APIClient().post('/events/token/').status_code, 401)
+
+    async def test_only_stream_tokens_are_accepted_in_the_query_string(self):
+        access = str(await sync_to_async(AccessToken.for_user)(self.user))
+        response = await self.async_client.get('/events/', {'token': access})
+        self.assertEqual(response.status_code, 401)
+
+        token = await sync_to_async(self.stream_token)()
+        response = await self.async_client.get('/events/', {'token': token})
+        self.assertEqual(response.status_code, 200)
+        first = await anext(aiter(response.streaming_content))
+        self.assertIn("event: ready", first.decode() if isinstance(first, bytes) else first)
+        await response.streaming_content.aclose()
+
+    @override_settings(EVENTS_STREAM_TOKEN_SECONDS=-1)
+    async def test_expired_stream_token_is_rejected(self):
+        token = await sync_to_async(self.stream_token)()
+        response = await self.async_client.get('/events/', {'token': token})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_stream_ends_once_the_user_is_deactivated(self):
+        token = await sync_to_async(self.stream_token)()
+        response = await self.async_client.get('/events/', {'token': token})
+        self.assertEqual(response.status_code, 200)
+        await sync_to_async(User.objects.filter(pk=self.user.pk).update)(is_active=False)
+        self.assertEqual((await self.events(response))[-1], 'unauthorized')
+
+    async def test_stream_ends_when_the_access_token_expires(self):
+        access = await sync_to_async(AccessToken.for_user)(self.user)
+        access.set_exp(lifetime=datetime.timedelta(seconds=1))
+        response = await self.async_client.get('/events/', headers={'Authorization': f"Bearer {access}"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(await self.events(response), ['ready', 'unauthorized'])
+
+
+class FastReadParityTests(TenantTestCase):
+    """The values() read path (FAST_READ_SERIALIZATION) renders what the serializers render."""
+
+    VARIANTS = [
+        '',
+        '?page_size=1',
+        '?expand=',
+        '?expand=equipment_details',
+        '?expand=equipment_details.maintenance_team_details',
+        '?fields=id,subject,status,created_at,assigned_technician_details.full_name',
+        '?fields=id,name,open_request_count,maintenance_team_details.members_details.email',
+        '?fields=id,scheduled_date,duration_hours&expand=equipment_details',
+    ]
+
+    client_user = 'owner'
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.tech = cls.create_user("lathe-tech", User.Role.TECHNICIAN, full_name="Tech Ñame")
+        cls.team.members.set([cls.tech])
+        empty = MaintenanceTeam.objects.create(name="Empty", company=cls.company)
+        cls.lathe = cls.create_equipment(
+            "Lathe", location="Bay 1", default_technician=cls.tech, assigned_employee=cls.owner,
+            purchase_date=datetime.date(2024, 2, 29),
+        )
+        cls.create_equipment("Old saw", team=empty, is_scrapped=True)
+        cls.assigned = cls.create_request(
+            cls.lathe, subject="Chatter", description="Vibrates at speed", maintenance_team=cls.team,
+            assigned_technician=cls.tech, duration_hours=Decimal('1.50'), scheduled_date=datetime.date(2026, 5, 1),
+            request_type=MaintenanceRequest.Type.PREVENTIVE, created_by=cls.owner,
+        )
+        cls.unassigned = cls.create_request(
+            cls.lathe, subject="Oil", description="", status=MaintenanceRequest.Status.IN_PROGRESS, created_by=cls.tech,
+        )
+        MaintenanceRequest.objects.filter(pk=cls.unassigned.pk).update(assigned_technician=None, maintenance_team=None)
+
+    def paths(self):
+        paths = []
+        for variant in self.VARIANTS:
+            paths += [f'/maintenance/{variant}', f'/maintenance/{self.assigned.pk}/{variant}']
+            paths += [f'/equipment/{variant}', f'/equipment/{self.lathe.pk}/{variant}']
+        return paths + [
+            f'/maintenance/{self.unassigned.pk}/', '/maintenance/0/', '/equipment/?all=1&fields=id,name',
+            '/maintenance/my_reports/',
+        ]
+
+    def get(self, path, fast):
+        with override_settings(FAST_READ_SERIALIZATION=fast):
+            with mock.patch.object(ValuesProjection, 'render', autospec=True, side_effect=ValuesProjection.render) as render:
+                response = self.client.get(path)
+        return response, render.called
+
+    def test_every_variant_matches_the_serializers(self):
+        for path in self.paths():
+            with self.subTest(path=path):
+                slow, used_projection = self.get(path, fast=False)
+                self.assertFalse(used_projection)
+                fast, _ = self.get(path, fast=True)
+                self.assertEqual((fast.status_code, fast.content), (slow.status_code, slow.content))
+
+    def test_plain_list_and_retrieve_use_the_projection(self):
+        for path in ('/maintenance/', f'/maintenance/{self.assigned.pk}/', '/equipment/', f'/equipment/{self.lathe.pk}/'):
+            with self.subTest(path=path):
+                response, used_projection = self.get(path, fast=True)
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(used_projection)
+
+
+class QueryPoolConnectionTests(TransactionTestCase):
+    def test_worker_connections_outlive_their_task(self):
+        def connection_deadline():
+            connection.ensure_connection()
+            return connection.close_at
+
+        with override_settings(CONCURRENT_QUERY_CONN_MAX_AGE=60), ThreadPoolExecutor(max_workers=1) as pool:
+            pool.submit(_run_in_worker, connection_deadline).result()
+            # CONN_MAX_AGE is 0, so the request's own connections still close after each use.
+            self.assertEqual(connection.settings_dict['CONN_MAX_AGE'], 0)
+            self.assertGreater(pool.submit(_run_in_worker, connection_deadline).result(), time.monotonic() + 30)
+
+
+def sleeping(func, seconds=0.05):
+    def wrapper(*args, **kwargs):
+        time.sleep(seconds)
+        return func(*args, **kwargs)
+    return wrapper
+
+
+@override_settings(REQUEST_METRICS_ENABLED=True)
+class RequestMetricsTests(TenantTestCase):
+    def setUp(self):
+        super().setUp()
+        request_metrics.reset()
+
+    def timings(self, response):
+        return {name: float(duration) for name, duration in re.findall(r'(\w+);dur=([\d.]+)', response['Server-Timing'])}
+
+    def test_serialization_is_timed_apart_from_the_view(self):
+        for fast in (True, False):
+            with self.subTest(fast=fast), override_settings(FAST_READ_SERIALIZATION=fast), \
+                    mock.patch.object(ValuesProjection, '_render_row', sleeping(ValuesProjection._render_row)), \
+                    mock.patch.object(Serializer, 'to_representation', sleeping(Serializer.to_representation)):
+                timings = self.timings(self.client.get(f'/equipment/{self.equipment.pk}/'))
+            self.assertGreaterEqual(timings['serialize'], 50)
+            self.assertLess(timings['view'], 50)
+            self.assertAlmostEqual(
+                timings['total'], sum(timings[name] for name in ('db', 'view', 'serialize', 'render')), delta=1
+            )
+        summary = request_metrics.summary()['equipment-detail']
+        self.assertEqual(summary['count'], 2)
+        self.assertGreaterEqual(summary['mean_serialize_ms'], 50)
+
+
+@override_settings(FAST_READ_SERIALIZATION=False)
+class EagerLoadingTests(TenantTestCase):
+    def test_lookups_follow_the_nested_serializers(self):
+        self.assertEqual(get_eager_loading(EquipmentSerializer()), (
+            {'maintenance_team', 'default_technician'}, {'maintenance_team__members'},
+        ))
+        self.assertEqual(get_eager_loading(MaintenanceRequestSerializer()), (
+            {'equipment', 'equipment__maintenance_team', 'equipment__default_technician', 'maintenance_team',
+             'assigned_technician', 'created_by'},
+            {'equipment__maintenance_team__members', 'maintenance_team__members'},
+        ))
+
+    def query_counts(self):
+        counts = []
+        for path in ('/maintenance/?all=1', '/equipment/?all=1'):
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.client.get(path).status_code, 200)
+            counts.append(len(queries))
+        return counts
+
+    def test_list_query_count_does_not_grow_with_the_rows(self):
+        self.client.get('/maintenance/stats/')  # builds the counters row the ETag reads
+        self.team.members.set([self.tech])
+        self.create_request(maintenance_team=self.team, assigned_technician=self.tech)
+        one_row = self.query_counts()
+        for name in ("Lathe", "Saw", "Drill"):
+            team = MaintenanceTeam.objects.create(name=f"{name} crew", company=self.company)
+            technician = self.create_user(f"{name.lower()}-tech", User.Role.TECHNICIAN)
+            team.members.set([technician, self.tech])
+            equipment = self.create_equipment(name, team=team, default_technician=technician)
+            self.create_request(equipment, maintenance_team=team, assigned_technician=technician, created_by=self.owner)
+        self.assertEqual(self.query_counts(), one_row)
+
+
+class CursorPaginationTests(TenantTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.requests = [cls.create_request(subject=f"Request {number}") for number in range(5)]
+        cls.create_request(cls.other_equipment, subject="Not ours", created_by=cls.other_tech)
+
+    def walk(self, path):
+        ids, pages = [], 0
+        while path:
+            response = self.client.get(path)
+            self.assertEqual(response.status_code, 200)
+            ids += [row['id'] for row in response.data['results']]
+            path, pages = response.data['next'], pages + 1
+        return ids, pages
+
+    def test_pages_cover_every_row_once_newest_first(self):
+        expected = [request.pk for request in sorted(self.requests, key=lambda r: (-r.created_at.timestamp(), r.pk))]
+        for path in ('/maintenance/?page_size=2', '/maintenance/my_reports/?page_size=2'):
+            with self.subTest(path=path):
+                self.assertEqual(self.walk(path), (expected, 3))
+
+    def test_all_returns_the_unpaginated_list(self):
+        response = self.client.get('/maintenance/?all=1')
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), 5)
+        self.assertEqual(self.client.get('/maintenance/?all=0').data['previous'], None)
+
+    def test_page_size_is_capped(self):
+        with mock.patch.object(CreatedAtCursorPagination, 'max_page_size', 2):
+            self.assertEqual(len(self.client.get('/maintenance/?page_size=100').data['results']), 2)
+
+
+class ExplainQueriesCommandTests(TenantTestCase):
+    def explain(self, *args):
+        out = StringIO()
+        call_command('explain_queries', *args, stdout=out)
+        return out.getvalue()
+
+    @skipUnless(connection.vendor == 'sqlite', "The plans checked are SQLite's")
+    def test_tenant_queries_use_the_company_indexes(self):
+        out = self.explain('/maintenance/', '/maintenance/my_reports/', '/maintenance/my_tasks/', '--user', self.manager.email)
+        self.assertIn(f"Running as {self.manager.email} on sqlite", out)
+        for path, index in (
+            ('/maintenance/', 'mr_company_created_idx'),
+            ('/maintenance/my_reports/', 'mr_company_author_idx'),
+            ('/maintenance/my_tasks/', 'mr_company_tech_idx'),
+        ):
+            with self.subTest(path=path):
+                section = out.split(f"{path} -> 200", 1)[1].split("\n\n", 1)[0]
+                self.assertIn(f"USING INDEX {index} (company_id=?", section)
+
+    def test_unknown_user_is_an_error(self):
+        with self.assertRaisesMessage(CommandError, "No user with email nobody@example.com."):
+            self.explain('/maintenance/', '--user', 'nobody@example.com')
+
+
+class SparseFieldsTests(TenantTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.request = cls.create_request(assigned_technician=cls.tech, maintenance_team=cls.team)
+
+    def get(self, query, fast=True):
+        with override_settings(FAST_READ_SERIALIZATION=fast):
+            response = self.client.get(f'/maintenance/{self.request.pk}/{query}')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_fields_and_expand_prune_the_representation(self):
+        for fast in (True, False):
+            with self.subTest(fast=fast):
+                self.assertEqual(set(self.get('?fields=id,subject', fast)), {'id', 'subject'})
+                data = self.get('?fields=id,equipment_details.name,equipment_details.maintenance_team_details.name', fast)
+                self.assertEqual(data, {'id': self.request.pk, 'equipment_details': {
+                    'name': "Press", 'maintenance_team_details': {'name': "Crew"},
+                }})
+                data = self.get('?expand=equipment_details', fast)
+                self.assertIn('subject', data)
+                self.assertNotIn('assigned_technician_details', data)
+                self.assertNotIn('maintenance_team_details', data['equipment_details'])
+                full = self.get('', fast)
+                self.assertEqual(full['assigned_technician_details']['full_name'], "Tech")
+
+    def test_pruned_relations_are_not_queried(self):
+        with override_settings(FAST_READ_SERIALIZATION=False), CaptureQueriesContext(connection) as queries:
+            self.client.get(f'/maintenance/{self.request.pk}/?fields=id,subject')
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('JOIN', queries[0]['sql'])
+
+    def test_writes_return_the_full_representation(self):
+        response = self.client.patch(f'/maintenance/{self.request.pk}/?fields=id', {'subject': "Hum"}, format='json')
+        self.assertEqual(response.data['subject'], "Hum")
+        self.assertIn('equipment_details', response.data)
+
+
+class ORJSONTests(SimpleTestCase):
+    def test_renders_what_the_drf_renderer_renders(self):
+        data = {
+            'when': datetime.datetime(2026, 5, 1, 8, 30, tzinfo=datetime.timezone.utc), 'day': datetime.date(2026, 5, 1),
+            'hours': Decimal('1.50'), 'label': gettext_lazy("Repaired"), 'uid': uuid.UUID(int=7),
+            'span': datetime.timedelta(minutes=90), 'text': "line\u2028break", 'ids': (1, 2), 1: None,
+        }
+        fast = ORJSONRenderer().render(data, 'application/json')
+        self.assertEqual(json.loads(fast), json.loads(JSONRenderer().render(data, 'application/json')))
+        self.assertIn(b'line\\u2028break', fast)
+
+    def test_parses_utf8_and_rejects_broken_json(self):
+        parser = ORJSONParser()
+        self.assertEqual(parser.parse(BytesIO('{"name": "Pr\u00e9ss"}'.encode())), {'name': "Pr\u00e9ss"})
+        with self.assertRaises(ParseError):
+            parser.parse(BytesIO(b'{"name": '))
+
+
+@override_settings(COMPRESSION_MIN_SIZE=200)
+class CompressionTests(TenantTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for number in range(5):
+            cls.create_request(subject=f"Request {number}")
+
+    def get(self, path, encoding):
+        return self.client.get(path, HTTP_ACCEPT_ENCODING=encoding)
+
+    def test_large_responses_are_gzipped(self):
+        plain = self.get('/maintenance/?all=1', '')
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        with mock.patch('apps.core.middleware.brotli', None):
+            response = self.get('/maintenance/?all=1', 'br, gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+
+    def test_small_responses_are_sent_as_is(self):
+        size = len(self.get('/maintenance/?all=1', '').content)
+        with override_settings(COMPRESSION_MIN_SIZE=size + 1):
+            self.assertFalse(self.get('/maintenance/?all=1', 'gzip').has_header('Content-Encoding'))
+
+    @skipUnless(brotli, "brotli is not installed")
+    def test_brotli_is_preferred_when_accepted(self):
+        plain = self.get('/maintenance/?all=1', '')
+        response = self.get('/maintenance/?all=1', 'gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), plain.content)
+
+
+class ReplicaRoutingTests(TenantTestCase):
+    """ReplicaRouter and ReplicaPinningMiddleware, with a replica alias patched in."""
+
+    def setUp(self):
+        super().setUp()
+        for target in ('apps.core.routers.replica_alias', 'apps.core.middleware.replica_alias'):
+            patcher = mock.patch(target, return_value='replica')
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.router = ReplicaRouter()
+
+    def serve(self, request, view):
+        """Run ``view`` inside ReplicaPinningMiddleware; returns (response, what the view returned)."""
+        seen = []
+
+        def get_response(request):
+            request.user = self.tech  # what authentication does inside the view
+            seen.append(view())
+            return HttpResponse()
+
+        return ReplicaPinningMiddleware(get_response)(request), seen[0]
+
+    def read(self):
+        return self.router.db_for_read(MaintenanceRequest)
+
+    def test_safe_requests_read_from_the_replica(self):
+        _, alias = self.serve(RequestFactory().get('/maintenance/'), self.read)
+        self.assertEqual(alias, 'replica')
+        _, alias = self.serve(RequestFactory().post('/maintenance/'), self.read)
+        self.assertEqual(alias, 'default')
+        self.assertEqual(self.read(), 'default')  # outside a request
+
+    def test_a_write_pins_its_user_to_the_primary(self):
+        def write_then_read():
+            self.router.db_for_write(MaintenanceRequest)
+            return self.read()
+
+        response, alias = self.serve(RequestFactory().get('/maintenance/'), write_then_read)
+        self.assertEqual(alias, 'default')
+        pin = response[PIN_HEADER]
+        self.assertEqual(response.cookies[PIN_COOKIE].value, pin)
+        self.assertEqual(response.cookies[PIN_COOKIE]['max-age'], settings.REPLICA_PIN_SECONDS)
+
+        for request in (
+            RequestFactory().get('/maintenance/', HTTP_X_DB_PIN=pin),
+            RequestFactory(HTTP_COOKIE=f'{PIN_COOKIE}={pin}').get('/maintenance/'),
+        ):
+            response, alias = self.serve(request, self.read)
+            self.assertEqual(alias, 'default')
+            self.assertFalse(response.has_header(PIN_HEADER))
+
+    def test_foreign_forged_and_expired_pins_are_ignored(self):
+        for pin in (sign_pin(self.owner.pk), sign_pin(self.tech.pk) + 'x'):
+            with self.subTest(pin=pin):
+                _, alias = self.serve(RequestFactory().get('/maintenance/', HTTP_X_DB_PIN=pin), self.read)
+                self.assertEqual(alias, 'replica')
+        pin = sign_pin(self.tech.pk)
+        with mock.patch('django.core.signing.time.time', return_value=time.time() + settings.REPLICA_PIN_SECONDS + 1):
+            _, alias = self.serve(RequestFactory().get('/maintenance/', HTTP_X_DB_PIN=pin), self.read)
+        self.assertEqual(alias, 'replica')
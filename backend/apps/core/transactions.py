@@ -0,0 +1,22 @@
+from django.db import transaction
+
+
+class AtomicWritesMixin:
+    """
+    ViewSet mixin that runs create, update/partial_update and destroy in one
+    transaction, so a model write and the counter updates its signals make
+    (apps.maintenance.signals) commit or roll back together. Subclasses that
+    override these actions must call super().
+    """
+
+    def create(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().create(request, *args, **kwargs)
+
+    def update(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().update(request, *args, **kwargs)
+
+    def destroy(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().destroy(request, *args, **kwargs)
@@ -0,0 +1,150 @@
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from apps.authx import cache as user_cache
+from apps.authx.authentication import CachedJWTAuthentication
+from .events import company_channel, get_broker
+from .metrics import request_metrics
+
+
+class RequestMetricsView(APIView):
+    """Staff-only view of the rolling per-URL request metrics of this worker."""
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response({
+            "window": request_metrics.window,
+            "routes": request_metrics.summary(),
+        })
+
+    def delete(self, request):
+        request_metrics.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+STREAM_TOKEN_SALT = 'apps.core.views.event-stream'
+
+
+class EventStreamTokenView(APIView):
+    """
+    Issue a short-lived token for opening /events/?token= (EventSource cannot
+    send an Authorization header), so long-lived access tokens stay out of
+    URLs and access logs. The token is only accepted by the event stream,
+    only for EVENTS_STREAM_TOKEN_SECONDS, and the stream it opens ends when
+    the access token it was issued for expires.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        token = signing.TimestampSigner(salt=STREAM_TOKEN_SALT).sign_object({
+            "user": request.user.pk,
+            "company": request.user.company_id,
+            "exp": request.auth.get('exp') if request.auth is not None else None,
+        })
+        return Response({"token": token, "expires_in": settings.EVENTS_STREAM_TOKEN_SECONDS})
+
+
+def _authenticate(request):
+    """
+    Authenticate an event stream from the Authorization header or a stream
+    token in ?token=. Return (user, expiry timestamp of the credentials) or None.
+    """
+    authenticator = CachedJWTAuthentication()
+    try:
+        result = authenticator.authenticate(request)
+    except (AuthenticationFailed, InvalidToken):
+        return None
+    if result is not None:
+        user, token = result
+        return user, token['exp']
+
+    stream_token = request.GET.get('token')
+    if not stream_token:
+        return None
+    try:
+        claims = signing.TimestampSigner(salt=STREAM_TOKEN_SALT).unsign_object(
+            stream_token, max_age=settings.EVENTS_STREAM_TOKEN_SECONDS
+        )
+    except signing.BadSignature:
+        return None
+    user = user_cache.get_user(claims['user'], claims['company'])
+    if not _authorized(user, claims['company'], claims['exp']):
+        return None
+    return user, claims['exp']
+
+
+def _authorized(user, company_id, expires_at):
+    """Whether the credentials are unexpired and ``user`` is still active in ``company_id``."""
+    if expires_at is not None and time.time() >= expires_at:
+        return False
+    return user is not None and user.is_active and company_id is not None and user.company_id == company_id
+
+
+def _still_authorized(user_id, company_id, expires_at):
+    return _authorized(user_cache.get_user(user_id, company_id), company_id, expires_at)
+
+
+def _sse(event_type, data, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event_type}")
+    lines.append(f"data: {json.dumps(data, cls=DjangoJSONEncoder)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def company_events(request):
+    """
+    Server-Sent Events stream of the user's company changes (requests and
+    equipment created/updated/deleted). Requires the ASGI application.
+
+    The user is re-checked at least once per heartbeat; the stream ends with
+    an 'unauthorized' event once they are deactivated, leave the company or
+    their token expires.
+    """
+    authenticated = await sync_to_async(_authenticate)(request)
+    user, expires_at = authenticated or (None, None)
+    if user is None or user.company_id is None:
+        return JsonResponse({"detail": "Authentication credentials were not provided or are invalid."}, status=401)
+
+    subscription = get_broker().subscribe(company_channel(user.company_id))
+    heartbeat = getattr(settings, 'EVENTS_HEARTBEAT_SECONDS', 15)
+    still_authorized = sync_to_async(_still_authorized)
+
+    async def stream():
+        event_id = 0
+        next_check = time.monotonic() + heartbeat
+        try:
+            yield "retry: 5000\n\n" + _sse('ready', {"company": user.company_id})
+            while True:
+                event = await subscription.get(heartbeat)
+                if subscription.overflowed:
+                    yield _sse('resync', {"reason": "Too many pending events; reload the board."})
+                    return
+                if time.monotonic() >= next_check:
+                    if not await still_authorized(user.pk, user.company_id, expires_at):
+                        yield _sse('unauthorized', {"reason": "Credentials expired or revoked; sign in again."})
+                        return
+                    next_check = time.monotonic() + heartbeat
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                event_id += 1
+                yield _sse(event['type'], event, event_id)
+        finally:
+            subscription.close()
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
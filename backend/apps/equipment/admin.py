@@ -1,10 +1,12 @@
 from django.contrib import admin
+from apps.search.admin import FullTextSearchAdminMixin
 from .models import Equipment
 
 @admin.register(Equipment)
-class EquipmentAdmin(admin.ModelAdmin):
+class EquipmentAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
     list_display = ('name', 'serial_number', 'department', 'company', 'is_scrapped', 'created_at')
     list_filter = ('company', 'department', 'is_scrapped')
-    search_fields = ('name', 'serial_number', 'asset_id')
+    search_fields = ('name', 'serial_number', 'location')
+    search_index = 'equipment'
     ordering = ('-created_at',)
-    readonly_fields = ('created_at',)
+    readonly_fields = ('created_at', 'updated_at')
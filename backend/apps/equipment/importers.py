@@ -0,0 +1,195 @@
+import csv
+import io
+import json
+from itertools import islice
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from rest_framework import serializers
+from apps.core.events import publish_on_commit
+from apps.teams.models import MaintenanceTeam
+from .models import Equipment
+
+User = get_user_model()
+
+MAX_REPORTED_ERRORS = 1000
+
+class EquipmentImportRowSerializer(serializers.Serializer):
+    """
+    Field-level validation for one imported row. References and serial number
+    uniqueness are checked per chunk by EquipmentImporter, not per row.
+    """
+    name = serializers.CharField(max_length=255)
+    serial_number = serializers.CharField(max_length=100)
+    department = serializers.CharField(max_length=100)
+    location = serializers.CharField(max_length=255)
+    assigned_employee = serializers.CharField(max_length=255, required=False, allow_blank=True, allow_null=True)
+    purchase_date = serializers.DateField(required=False, allow_null=True)
+    warranty_expiry_date = serializers.DateField(required=False, allow_null=True)
+    maintenance_team = serializers.CharField(help_text="Team id or name.")
+    default_technician = serializers.CharField(required=False, allow_blank=True, allow_null=True, help_text="Technician id or email.")
+
+    def to_internal_value(self, data):
+        # CSV cells are strings; treat empty optional cells as missing.
+        data = {key: value for key, value in data.items() if key and value not in ('', None)}
+        return super().to_internal_value(data)
+
+def read_rows(upload):
+    """Yield row dicts from a CSV or NDJSON upload without reading it all into memory."""
+    name = (upload.name or '').lower()
+    is_ndjson = name.endswith(('.ndjson', '.jsonl')) or upload.content_type in (
+        'application/x-ndjson', 'application/jsonl'
+    )
+    text = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='' if not is_ndjson else None)
+    if not is_ndjson:
+        yield from csv.DictReader(text)
+        return
+    for line in text:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield row if isinstance(row, dict) else {'__invalid__': line[:100]}
+
+class EquipmentImporter:
+    """
+    Validates and inserts equipment rows in chunks: team/technician references
+    are resolved with one query per chunk (and remembered across chunks),
+    serial numbers are checked with one query per chunk, and valid rows are
+    inserted with bulk_create.
+    """
+
+    def __init__(self, company, batch_size=1000):
+        self.company = company
+        self.batch_size = batch_size
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+        self._teams = {}
+        self._technicians = {}
+        self._seen_serials = set()
+
+    def run(self, rows):
+        numbered = enumerate(rows, start=1)
+        while True:
+            chunk = list(islice(numbered, self.batch_size))
+            if not chunk:
+                break
+            self._import_chunk(chunk)
+        return self.report()
+
+    def report(self):
+        return {
+            "created": self.created,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+    def _error(self, row_number, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row_number, "errors": errors})
+
+    def _import_chunk(self, chunk):
+        validated = []
+        for row_number, row in chunk:
+            if '__invalid__' in row:
+                self._error(row_number, {"non_field_errors": ["Row is not a JSON object."]})
+                continue
+            serializer = EquipmentImportRowSerializer(data=row)
+            if serializer.is_valid():
+                validated.append((row_number, serializer.validated_data))
+            else:
+                self._error(row_number, serializer.errors)
+
+        self._resolve_references(validated)
+        serials = [data['serial_number'] for _, data in validated]
+        existing = set(Equipment.objects.filter(serial_number__in=serials).values_list('serial_number', flat=True))
+
+        to_create = []
+        for row_number, data in validated:
+            errors = {}
+            serial = data['serial_number']
+            if serial in existing or serial in self._seen_serials:
+                errors['serial_number'] = ["Equipment with this serial number already exists."]
+            team = self._teams.get(data['maintenance_team'])
+            if team is None:
+                errors['maintenance_team'] = ["Unknown maintenance team."]
+            technician = None
+            if data.get('default_technician'):
+                technician = self._technicians.get(data['default_technician'])
+                if technician is None:
+                    errors['default_technician'] = ["Unknown technician."]
+            if errors:
+                self._error(row_number, errors)
+                continue
+            self._seen_serials.add(serial)
+            to_create.append((row_number, Equipment(
+                name=data['name'],
+                serial_number=serial,
+                department=data['department'],
+                location=data['location'],
+                assigned_employee=data.get('assigned_employee'),
+                purchase_date=data.get('purchase_date'),
+                warranty_expiry_date=data.get('warranty_expiry_date'),
+                maintenance_team_id=team,
+                default_technician_id=technician,
+                company=self.company,
+            )))
+
+        if not to_create:
+            return
+        try:
+            with transaction.atomic():
+                equipment = [equipment for _, equipment in to_create]
+                self._stamp_sync_versions(equipment)
+                Equipment.objects.bulk_create(equipment, batch_size=self.batch_size)
+                self._update_dashboard_counters(len(to_create))
+        except IntegrityError:
+            # A concurrent import took one of the serial numbers; nothing from this chunk was saved.
+            for row_number, _ in to_create:
+                self._error(row_number, {"non_field_errors": ["Conflicting concurrent write, retry this row."]})
+            return
+        self.created += len(to_create)
+
+    def _resolve_references(self, validated):
+        team_refs = {data['maintenance_team'] for _, data in validated} - self._teams.keys()
+        if team_refs:
+            ids = [ref for ref in team_refs if ref.isdigit()]
+            teams = MaintenanceTeam.objects.filter(company=self.company).filter(
+                Q(id__in=ids) | Q(name__in=team_refs)
+            ).values_list('id', 'name')
+            for team_id, name in teams:
+                self._teams[str(team_id)] = team_id
+                self._teams.setdefault(name, team_id)
+            for ref in team_refs:
+                self._teams.setdefault(ref, None)
+
+        technician_refs = {
+            data['default_technician'] for _, data in validated if data.get('default_technician')
+        } - self._technicians.keys()
+        if technician_refs:
+            ids = [ref for ref in technician_refs if ref.isdigit()]
+            technicians = User.objects.filter(company=self.company, role=User.Role.TECHNICIAN).filter(
+                Q(id__in=ids) | Q(email__in=technician_refs)
+            ).values_list('id', 'email')
+            for technician_id, email in technicians:
+                self._technicians[str(technician_id)] = technician_id
+                self._technicians[email] = technician_id
+            for ref in technician_refs:
+                self._technicians.setdefault(ref, None)
+
+    def _stamp_sync_versions(self, equipment):
+        # bulk_create skips Equipment.save, which takes the delta sync change version.
+        from apps.maintenance.versions import stamp
+        stamp(equipment)
+
+    def _update_dashboard_counters(self, count):
+        # bulk_create skips the post_save hooks that maintain CompanyStats and push events.
+        from apps.maintenance.stats import bump_version
+        bump_version(self.company.pk, total_equipment=count)
+        publish_on_commit(self.company.pk, 'equipment.bulk_created', count=count)
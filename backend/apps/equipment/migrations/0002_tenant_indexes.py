@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authx', '0002_tenant_indexes'),
+        ('equipment', '0001_initial'),
+        ('teams', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['company', '-created_at'], name='equipment_company_created_idx'),
+        ),
+    ]
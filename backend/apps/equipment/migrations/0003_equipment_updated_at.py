@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:11
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authx', '0002_tenant_indexes'),
+        ('equipment', '0002_tenant_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipment',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['company', 'updated_at'], name='equipment_company_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:17
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_open_request_count(apps, schema_editor):
+    Equipment = apps.get_model('equipment', 'Equipment')
+    MaintenanceRequest = apps.get_model('maintenance', 'MaintenanceRequest')
+    open_requests = MaintenanceRequest.objects.filter(
+        equipment=OuterRef('pk'), status__in=['NEW', 'IN_PROGRESS']
+    ).order_by().values('equipment').annotate(count=Count('*')).values('count')
+    Equipment.objects.update(open_request_count=Coalesce(Subquery(open_requests), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0003_equipment_updated_at'),
+        ('maintenance', '0006_request_counter_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipment',
+            name='open_request_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_open_request_count, migrations.RunPython.noop),
+    ]
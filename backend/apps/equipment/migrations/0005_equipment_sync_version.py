@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0004_equipment_open_request_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipment',
+            name='sync_version',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['company', 'sync_version'], name='equipment_company_sync_idx'),
+        ),
+    ]
@@ -22,7 +22,30 @@ class Equipment(models.Model):
     
     company = models.ForeignKey('authx.Company', on_delete=models.CASCADE, null=True, blank=True)
     is_scrapped = models.BooleanField(default=False)
+    # Requests in NEW or IN_PROGRESS, kept up to date by the maintenance app
+    # with F() updates; reconcile with `manage.py reconcile_open_request_counts`.
+    open_request_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # The company change version of the last write (see apps.maintenance.versions).
+    sync_version = models.PositiveBigIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['company', '-created_at'], name='equipment_company_created_idx'),
+            models.Index(fields=['company', 'updated_at'], name='equipment_company_updated_idx'),
+            models.Index(fields=['company', 'sync_version'], name='equipment_company_sync_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.serial_number})"
+
+    def save(self, *args, **kwargs):
+        # Never write back a possibly stale in-memory open_request_count.
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'open_request_count'
+            ]
+        from apps.maintenance.versions import save_versioned  # the maintenance app imports this module
+        save_versioned(self, super().save, *args, **kwargs)
@@ -0,0 +1,154 @@
+import datetime
+import json
+from io import StringIO
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from apps.core.testing import TenantTestCase
+from apps.maintenance.models import CompanyStats, MaintenanceRequest
+from .models import Equipment
+
+
+class OpenRequestCountTests(TenantTestCase):
+    client_user = 'owner'
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.pump = cls.equipment
+        cls.valve = cls.create_equipment("Valve")
+
+    def request_on(self, equipment, status=MaintenanceRequest.Status.NEW):
+        return self.create_request(equipment, subject="Leak", status=status, created_by=self.owner)
+
+    def count(self, equipment):
+        return Equipment.objects.values_list('open_request_count', flat=True).get(pk=equipment.pk)
+
+    def test_follows_request_lifecycle(self):
+        first = self.request_on(self.pump)
+        self.request_on(self.pump, status=MaintenanceRequest.Status.IN_PROGRESS)
+        self.request_on(self.pump, status=MaintenanceRequest.Status.REPAIRED)
+        self.assertEqual(self.count(self.pump), 2)
+
+        first.status = MaintenanceRequest.Status.REPAIRED
+        first.duration_hours = 1
+        first.save()
+        self.assertEqual(self.count(self.pump), 1)
+
+        first.status = MaintenanceRequest.Status.NEW
+        first.equipment = self.valve
+        first.save()
+        self.assertEqual((self.count(self.pump), self.count(self.valve)), (1, 1))
+
+        first.delete()
+        self.assertEqual(self.count(self.valve), 0)
+
+    def test_saving_a_stale_equipment_instance_keeps_the_count(self):
+        stale = Equipment.objects.get(pk=self.pump.pk)
+        self.request_on(self.pump)
+        stale.location = "Dock"
+        stale.save()
+        self.assertEqual(self.count(self.pump), 1)
+
+    def test_served_by_the_api_without_a_count_query(self):
+        self.request_on(self.pump)
+        response = self.client.get(f'/equipment/{self.pump.pk}/')
+        self.assertEqual(response.data['open_request_count'], 1)
+
+    def test_count_change_moves_updated_at(self):
+        before = timezone.now() - datetime.timedelta(minutes=5)
+        Equipment.objects.filter(pk=self.pump.pk).update(updated_at=before)
+        self.request_on(self.pump)
+        self.assertGreater(Equipment.objects.get(pk=self.pump.pk).updated_at, before)
+
+    def test_count_change_reaches_delta_sync(self):
+        cursor = self.client.get('/maintenance/sync/').data['cursor']
+        self.request_on(self.valve)
+        equipment = self.client.get('/maintenance/sync/', {'cursor': cursor}).data['equipment']
+        self.assertEqual([(row['id'], row['open_request_count']) for row in equipment], [(self.valve.pk, 1)])
+
+    def test_drift_below_zero_is_clamped_and_reconciled(self):
+        request = self.request_on(self.pump)
+        Equipment.objects.filter(pk=self.pump.pk).update(open_request_count=0)
+        request.status = MaintenanceRequest.Status.REPAIRED
+        request.duration_hours = 1
+        request.save()  # would take the column to -1
+        self.assertEqual(self.count(self.pump), 0)
+
+        self.request_on(self.pump)
+        Equipment.objects.filter(pk=self.pump.pk).update(open_request_count=7)
+        out = StringIO()
+        call_command('reconcile_open_request_counts', '--check', stdout=out)
+        self.assertIn("1 equipment row(s) out of sync.", out.getvalue())
+        call_command('reconcile_open_request_counts', stdout=StringIO())
+        self.assertEqual(self.count(self.pump), 1)
+
+
+class BulkImportTests(TenantTestCase):
+    def upload(self, name, content, batch_size=2, content_type='text/csv'):
+        return self.client.post(
+            f'/equipment/bulk-import/?batch_size={batch_size}',
+            {'file': SimpleUploadedFile(name, content, content_type=content_type)}, format='multipart',
+        )
+
+    def csv(self, *rows):
+        header = "name,serial_number,department,location,maintenance_team,default_technician,purchase_date"
+        return "\n".join([header, *rows]).encode()
+
+    def test_imports_valid_rows_and_reports_the_rest(self):
+        self.client.get('/maintenance/stats/')  # build the counters row
+        response = self.upload('equipment.csv', self.csv(
+            f"Panel A,IMP-1,Ops,Hall,Crew,{self.tech.email},2025-01-31",
+            f"Panel B,IMP-2,Ops,Hall,{self.team.pk},{self.tech.pk},",
+            f"Panel C,{self.equipment.serial_number},Ops,Hall,Crew,,",  # serial already in the database
+            "Panel D,IMP-1,Ops,Hall,Crew,,",                     # serial repeated in the file
+            "Panel E,IMP-5,Ops,Hall,Their crew,,",               # another company's team
+            f"Panel F,IMP-6,Ops,Hall,Crew,{self.other_tech.email},",  # another company's technician
+            "Panel G,,Ops,Hall,Crew,,not-a-date",
+        ))
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual((response.data['created'], response.data['failed']), (2, 5))
+        errors = {error['row']: error['errors'] for error in response.data['errors']}
+        self.assertEqual(sorted(errors), [3, 4, 5, 6, 7])
+        self.assertIn('serial_number', errors[3])
+        self.assertIn('serial_number', errors[4])
+        self.assertEqual(errors[5], {'maintenance_team': ["Unknown maintenance team."]})
+        self.assertEqual(errors[6], {'default_technician': ["Unknown technician."]})
+        self.assertEqual(set(errors[7]), {'serial_number', 'purchase_date'})
+
+        panel = Equipment.objects.get(serial_number="IMP-1")
+        self.assertEqual(
+            (panel.company, panel.maintenance_team, panel.default_technician, panel.purchase_date),
+            (self.company, self.team, self.tech, datetime.date(2025, 1, 31)),
+        )
+        self.assertEqual(CompanyStats.objects.get(pk=self.company.pk).total_equipment, 3)
+
+    def test_ndjson_with_a_broken_line(self):
+        rows = [
+            json.dumps({"name": "Pump", "serial_number": "IMP-N1", "department": "Ops",
+                        "location": "Pit", "maintenance_team": "Crew"}),
+            "{not json",
+            "",
+            json.dumps(["not", "an", "object"]),
+        ]
+        response = self.upload('equipment.ndjson', "\n".join(rows).encode(), content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual([error['row'] for error in response.data['errors']], [2, 3])
+
+    def test_nothing_imported_is_a_400(self):
+        response = self.upload('equipment.csv', self.csv(f"Dup,{self.equipment.serial_number},Ops,Hall,Crew,,"))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['failed'], 1)
+        self.assertEqual(self.client.post('/equipment/bulk-import/', {}, format='multipart').status_code, 400)
+
+    def test_non_utf8_file_stops_with_a_report(self):
+        response = self.upload('equipment.csv', self.csv("Valve,IMP-U1,Ops,Hall,Crew,,") + b"\nBad \xff,IMP-U2")
+        self.assertIn('non_field_errors', response.data)
+
+    def test_requires_owner_or_manager(self):
+        response = self.client_for(self.tech).post('/equipment/bulk-import/', {
+            'file': SimpleUploadedFile('equipment.csv', self.csv(), content_type='text/csv')
+        }, format='multipart')
+        self.assertEqual(response.status_code, 403)
@@ -1,28 +1,34 @@
+from django.conf import settings
 from apps.authx.permissions import IsOwnerOrManager
-from rest_framework import permissions
+from rest_framework import permissions, status
+from rest_framework.parsers import MultiPartParser
 from rest_framework import viewsets
 from rest_framework.response import Response
-from django.db.models import Count, Q
 from .models import Equipment
 from .serializers import EquipmentSerializer
+from .importers import EquipmentImporter, read_rows
 from rest_framework.decorators import action
-class EquipmentViewSet(viewsets.ModelViewSet):
+from apps.core.eager_loading import EagerLoadingMixin, eager_load
+from apps.core.projection import ValuesReadMixin
+from apps.core.transactions import AtomicWritesMixin
+from apps.maintenance.conditional import conditional_on_company
+
+class EquipmentViewSet(AtomicWritesMixin, EagerLoadingMixin, ValuesReadMixin, viewsets.ModelViewSet):
     queryset = Equipment.objects.all().order_by('-created_at')
     serializer_class = EquipmentSerializer
 
     def get_permissions(self):
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'bulk_import']:
             return [IsOwnerOrManager()]
         return [permissions.IsAuthenticated()]
 
     def get_queryset(self):
-        # Annotate with count of open (not REPAIRED or SCRAP) requests
-        return Equipment.objects.filter(company=self.request.user.company).annotate(
-            open_request_count=Count(
-                'maintenancerequest', 
-                filter=Q(maintenancerequest__status__in=['NEW', 'IN_PROGRESS'])
-            )
-        )
+        # open_request_count is a maintained column, so no join over the requests is needed.
+        return self.eager_load(Equipment.objects.filter(company=self.request.user.company))
+
+    @conditional_on_company
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
 
     def perform_create(self, serializer):
         serializer.save(company=self.request.user.company)
@@ -33,6 +39,41 @@ class EquipmentViewSet(viewsets.ModelViewSet):
         # Circular dependency avoidance: import inside method or use string reference if possible.
         # But here safely importing should work if app is loaded.
         from apps.maintenance.serializers import MaintenanceRequestSerializer
-        requests = equipment.maintenancerequest_set.all()
-        serializer = MaintenanceRequestSerializer(requests, many=True)
+        context = self.get_serializer_context()
+        requests = eager_load(
+            equipment.maintenancerequest_set.all(), MaintenanceRequestSerializer(context=context)
+        )
+        page = self.paginate_queryset(requests)
+        if page is not None:
+            serializer = MaintenanceRequestSerializer(page, many=True, context=context)
+            return self.get_paginated_response(serializer.data)
+        serializer = MaintenanceRequestSerializer(requests, many=True, context=context)
         return Response(serializer.data)
+
+    @action(detail=False, methods=['post'], url_path='bulk-import', parser_classes=[MultiPartParser])
+    def bulk_import(self, request):
+        """
+        Import equipment from an uploaded CSV or NDJSON `file`.
+        Columns: name, serial_number, department, location, maintenance_team
+        (id or name) and optionally assigned_employee, purchase_date,
+        warranty_expiry_date, default_technician (id or email).
+        Rows are processed in chunks of ?batch_size= and a per-row error
+        report is returned; valid rows are imported even if others fail.
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"file": ["No file was submitted."]}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            batch_size = int(request.query_params.get('batch_size', settings.EQUIPMENT_IMPORT_BATCH_SIZE))
+        except ValueError:
+            return Response({"batch_size": ["A valid integer is required."]}, status=status.HTTP_400_BAD_REQUEST)
+        batch_size = min(max(batch_size, 1), settings.EQUIPMENT_IMPORT_MAX_BATCH_SIZE)
+
+        importer = EquipmentImporter(request.user.company, batch_size=batch_size)
+        try:
+            report = importer.run(read_rows(upload))
+        except UnicodeDecodeError:
+            report = importer.report()
+            report["non_field_errors"] = ["File must be UTF-8 encoded; import stopped at the undecodable line."]
+        response_status = status.HTTP_201_CREATED if report["created"] else status.HTTP_400_BAD_REQUEST
+        return Response(report, status=response_status)
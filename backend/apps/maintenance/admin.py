@@ -1,11 +1,13 @@
 from django.contrib import admin
-from .models import MaintenanceRequest
+from apps.search.admin import FullTextSearchAdminMixin
+from .models import MaintenanceRequest, MaintenancePlan, CompanyStats, TechnicianWorkload
 
 @admin.register(MaintenanceRequest)
-class MaintenanceRequestAdmin(admin.ModelAdmin):
+class MaintenanceRequestAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
     list_display = ('subject', 'request_type', 'status', 'equipment', 'company', 'created_at')
     list_filter = ('request_type', 'status', 'company')
     search_fields = ('subject', 'description')
+    search_index = 'maintenance_requests'
     ordering = ('-created_at',)
     readonly_fields = ('created_at', 'updated_at')
     
@@ -23,3 +25,20 @@ class MaintenanceRequestAdmin(admin.ModelAdmin):
             'fields': ('created_by', 'created_at', 'updated_at')
         }),
     )
+
+@admin.register(CompanyStats)
+class CompanyStatsAdmin(admin.ModelAdmin):
+    list_display = ('company', 'total_equipment', 'total_teams', 'total_employees', 'open_requests', 'updated_at')
+    readonly_fields = ('updated_at',)
+
+@admin.register(TechnicianWorkload)
+class TechnicianWorkloadAdmin(admin.ModelAdmin):
+    list_display = ('technician', 'company', 'open_count')
+    list_filter = ('company',)
+    ordering = ('-open_count',)
+
+@admin.register(MaintenancePlan)
+class MaintenancePlanAdmin(admin.ModelAdmin):
+    list_display = ('name', 'equipment', 'maintenance_team', 'interval', 'interval_unit', 'is_active', 'generated_until', 'company')
+    list_filter = ('is_active', 'interval_unit', 'company')
+    readonly_fields = ('generated_until', 'created_at', 'updated_at')
@@ -0,0 +1,237 @@
+"""
+Workload-aware technician assignment.
+
+A technician's load is the planned hours of their open (NEW / IN_PROGRESS)
+requests, counting requests without duration_hours as
+ASSIGNMENT_DEFAULT_HOURS, then their open request count. WorkloadIndex keeps
+a min-heap of member loads per team in process memory, so picking the least
+loaded member is a heap peek instead of a COUNT per candidate. Loads are
+adjusted from apply_request_changes when a transaction commits; a team's
+heap is rebuilt from the database after ASSIGNMENT_INDEX_TTL seconds (to
+pick up writes made by other processes) or when its membership changes.
+"""
+import heapq
+import threading
+import time
+from decimal import Decimal
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, DecimalField, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from apps.core.events import publish_on_commit
+from .models import MaintenanceRequest
+from .stats import OPEN_STATUSES, REQUEST_STATE_FIELDS
+
+User = get_user_model()
+
+def default_hours():
+    return Decimal(str(settings.ASSIGNMENT_DEFAULT_HOURS))
+
+def request_hours(duration_hours):
+    return default_hours() if duration_hours is None else duration_hours
+
+def load_queryset(technician_ids):
+    """(technician_id, planned hours, open count) for the given technicians' open requests."""
+    hours = Coalesce('duration_hours', Value(default_hours()), output_field=DecimalField(max_digits=12, decimal_places=2))
+    return MaintenanceRequest.objects.filter(
+        assigned_technician_id__in=technician_ids, status__in=OPEN_STATUSES
+    ).order_by().values('assigned_technician_id').annotate(
+        count=Count('id'), hours=Sum(hours)
+    ).values_list('assigned_technician_id', 'hours', 'count')
+
+def current_loads(technician_ids):
+    """{technician_id: (planned hours, open count)}, zero for technicians without open work."""
+    loads = {technician_id: (Decimal(0), 0) for technician_id in technician_ids}
+    for technician_id, hours, count in load_queryset(technician_ids):
+        loads[technician_id] = (Decimal(hours), count)
+    return loads
+
+def team_members(team_id):
+    """Ids of the team's active technicians, the candidates for assignment."""
+    return list(User.objects.filter(
+        teams=team_id, role=User.Role.TECHNICIAN, is_active=True
+    ).values_list('id', flat=True))
+
+class TeamQueue:
+    """A private copy of a team's loads for assigning a batch of requests."""
+
+    def __init__(self, loads):
+        self.loads = dict(loads)
+        self.heap = [(hours, count, technician_id) for technician_id, (hours, count) in self.loads.items()]
+        heapq.heapify(self.heap)
+
+    def take(self, hours):
+        """Return the least loaded technician (or None) and charge them ``hours``."""
+        if not self.heap:
+            return None
+        load, count, technician_id = heapq.heappop(self.heap)
+        self.loads[technician_id] = (load + hours, count + 1)
+        heapq.heappush(self.heap, (load + hours, count + 1, technician_id))
+        return technician_id
+
+class WorkloadIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loads = {}          # technician_id -> (hours, count)
+        self._teams = {}          # team_id -> (built_at, member ids, heap)
+        self._member_teams = {}   # technician_id -> {team_id}
+
+    def _team(self, team_id):
+        entry = self._teams.get(team_id)
+        if entry is not None and time.monotonic() - entry[0] < settings.ASSIGNMENT_INDEX_TTL:
+            return entry
+        self._drop(team_id)
+        members = team_members(team_id)
+        loads = current_loads(members)
+        entry = (time.monotonic(), set(members), [])
+        self._teams[team_id] = entry
+        for technician_id in members:
+            self._member_teams.setdefault(technician_id, set()).add(team_id)
+        for technician_id, load in loads.items():
+            self._set_load(technician_id, load)
+        return entry
+
+    def _drop(self, team_id):
+        entry = self._teams.pop(team_id, None)
+        if entry is None:
+            return
+        for technician_id in entry[1]:
+            teams = self._member_teams.get(technician_id, set())
+            teams.discard(team_id)
+            if not teams:
+                self._member_teams.pop(technician_id, None)
+                self._loads.pop(technician_id, None)
+
+    def _set_load(self, technician_id, load):
+        self._loads[technician_id] = load
+        for team_id in self._member_teams.get(technician_id, ()):
+            heapq.heappush(self._teams[team_id][2], (load[0], load[1], technician_id))
+
+    def _valid_top(self, heap):
+        # Lazy deletion: entries whose load is no longer current are discarded.
+        while heap:
+            hours, count, technician_id = heap[0]
+            if self._loads.get(technician_id) == (hours, count):
+                return technician_id
+            heapq.heappop(heap)
+        return None
+
+    def pick(self, team_id):
+        """The least loaded active technician of ``team_id``, or None if it has none."""
+        with self._lock:
+            return self._valid_top(self._team(team_id)[2])
+
+    def queue(self, team_id):
+        """A TeamQueue snapshot of the team's current loads."""
+        with self._lock:
+            _, members, _ = self._team(team_id)
+            return TeamQueue({technician_id: self._loads[technician_id] for technician_id in members})
+
+    def apply(self, deltas):
+        """Add {technician_id: (hours, count)} to the tracked loads."""
+        with self._lock:
+            for technician_id, (hours, count) in deltas.items():
+                load = self._loads.get(technician_id)
+                if load is not None:
+                    self._set_load(technician_id, (load[0] + hours, load[1] + count))
+
+    def invalidate_technician(self, technician_id, team_ids=()):
+        """Drop the heaps of every team ``technician_id`` is indexed in, plus ``team_ids``."""
+        with self._lock:
+            for team_id in set(self._member_teams.get(technician_id, ())) | set(team_ids):
+                self._drop(team_id)
+
+    def invalidate(self, team_id=None):
+        with self._lock:
+            if team_id is None:
+                self._teams.clear()
+                self._member_teams.clear()
+                self._loads.clear()
+            else:
+                self._drop(team_id)
+
+workload_index = WorkloadIndex()
+
+def workload_deltas(changes):
+    """{technician_id: (hours, count)} load deltas for (old_state, new_state) request changes."""
+    deltas = {}
+    for old_state, new_state in changes:
+        for state, sign in ((old_state, -1), (new_state, 1)):
+            if state is None:
+                continue
+            request = dict(zip(REQUEST_STATE_FIELDS, state))
+            technician_id = request['assigned_technician_id']
+            if technician_id and request['status'] in OPEN_STATUSES:
+                hours, count = deltas.get(technician_id, (Decimal(0), 0))
+                deltas[technician_id] = (hours + sign * request_hours(request['duration_hours']), count + sign)
+    return {technician_id: delta for technician_id, delta in deltas.items() if any(delta)}
+
+def track_request_changes(changes):
+    """Move the indexed loads by ``changes`` once the surrounding transaction commits."""
+    deltas = workload_deltas(changes)
+    if deltas:
+        transaction.on_commit(lambda: workload_index.apply(deltas))
+
+def pick_technician(team, fallback=None):
+    """Least loaded member of ``team``; ``fallback`` if auto-assignment is off or nobody qualifies."""
+    if team is None or not settings.TECHNICIAN_AUTO_ASSIGNMENT:
+        return fallback
+    # The heap can trail a change committed by another process; never hand
+    # work to an account that has been disabled or moved off the team since.
+    for _ in range(2):
+        technician_id = workload_index.pick(team.pk)
+        if technician_id is None:
+            break
+        technician = User.objects.filter(
+            pk=technician_id, teams=team, role=User.Role.TECHNICIAN, is_active=True
+        ).first()
+        if technician is not None:
+            return technician
+        workload_index.invalidate_technician(technician_id, [team.pk])
+    return fallback
+
+@transaction.atomic
+def rebalance_team(team):
+    """
+    Reassign the team's NEW requests so planned hours are spread evenly over
+    its active technicians: longest requests first, each to whoever is least
+    loaded (their IN_PROGRESS and other teams' work included). Returns a summary.
+    """
+    backlog = list(MaintenanceRequest.objects.select_for_update().filter(
+        maintenance_team=team, status=MaintenanceRequest.Status.NEW
+    ).only('id', 'updated_at', *REQUEST_STATE_FIELDS))
+    loads = current_loads(team_members(team.pk))
+    # Take the backlog off everyone's load before handing it out again.
+    for request in backlog:
+        if request.assigned_technician_id in loads:
+            hours, count = loads[request.assigned_technician_id]
+            loads[request.assigned_technician_id] = (hours - request_hours(request.duration_hours), count - 1)
+
+    queue = TeamQueue(loads)
+    changed = []
+    now = timezone.now()
+    backlog.sort(key=lambda request: (-request_hours(request.duration_hours), request.id))
+    for request in backlog:
+        technician_id = queue.take(request_hours(request.duration_hours))
+        if technician_id is None or technician_id == request.assigned_technician_id:
+            continue
+        request.assigned_technician_id = technician_id
+        request.updated_at = now
+        changed.append(request)
+    # The tracked update behind bulk_update moves the counters and the index.
+    MaintenanceRequest.objects.bulk_update(changed, ['assigned_technician', 'updated_at'], batch_size=1000)
+    if changed:
+        publish_on_commit(
+            team.company_id, 'maintenancerequest.bulk_updated',
+            changes=[{"id": request.id, "assigned_technician": request.assigned_technician_id} for request in changed]
+        )
+    return {
+        "requests": len(backlog),
+        "reassigned": len(changed),
+        "workload": [
+            {"technician": technician_id, "open_requests": count, "planned_hours": f"{hours:.2f}"}
+            for technician_id, (hours, count) in sorted(queue.loads.items())
+        ],
+    }
@@ -0,0 +1,45 @@
+"""
+Conditional GET support (ETag / Last-Modified) for tenant-scoped endpoints.
+
+A company's change token is its CompanyStats.version plus the latest
+MaintenanceRequest.updated_at, read with one primary-key lookup and one
+index seek. Unchanged views answer 304 before the main query runs.
+"""
+import hashlib
+from django.db.models import Max
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from .models import MaintenanceRequest
+from .stats import get_company_stats
+
+def company_change_token(request):
+    """Return (version, last_modified) for the user's company, memoized per request."""
+    if not hasattr(request, '_company_change_token'):
+        company = request.user.company
+        token = None
+        if company is not None:
+            stats = get_company_stats(company)
+            last_request = MaintenanceRequest.objects.filter(company=company).aggregate(
+                last=Max('updated_at')
+            )['last']
+            last_modified = max(filter(None, (stats.updated_at, last_request)))
+            token = (f"{company.pk}:{stats.version}:{last_request and last_request.timestamp()}", last_modified)
+        request._company_change_token = token
+    return request._company_change_token
+
+def company_etag(request, *args, **kwargs):
+    token = company_change_token(request)
+    if token is None:
+        return None
+    # The representation also depends on the URL (filters, cursor) and negotiated format.
+    key = f"{token[0]}:{request.get_full_path()}:{request.META.get('HTTP_ACCEPT', '')}"
+    return '"%s"' % hashlib.md5(key.encode()).hexdigest()
+
+def company_last_modified(request, *args, **kwargs):
+    token = company_change_token(request)
+    return token and token[1]
+
+# For APIView / ViewSet methods, e.g. ``@conditional_on_company`` above ``def get``.
+conditional_on_company = method_decorator(
+    condition(etag_func=company_etag, last_modified_func=company_last_modified)
+)
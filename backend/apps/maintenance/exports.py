@@ -0,0 +1,64 @@
+import csv
+import datetime
+import json
+from decimal import Decimal
+
+# (column name, values() lookup) for each exported field.
+EXPORT_COLUMNS = (
+    ('id', 'id'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+    ('request_type', 'request_type'),
+    ('status', 'status'),
+    ('subject', 'subject'),
+    ('description', 'description'),
+    ('scheduled_date', 'scheduled_date'),
+    ('duration_hours', 'duration_hours'),
+    ('equipment_id', 'equipment_id'),
+    ('equipment_name', 'equipment__name'),
+    ('equipment_serial_number', 'equipment__serial_number'),
+    ('maintenance_team', 'maintenance_team__name'),
+    ('assigned_technician', 'assigned_technician__full_name'),
+    ('created_by', 'created_by__full_name'),
+)
+
+def iter_export_rows(queryset, chunk_size=2000):
+    """
+    Yield export rows as tuples, fetching ``chunk_size`` rows per query by
+    keyset on id. Unlike QuerySet.iterator(), this keeps memory flat on
+    MySQL too, where mysqlclient buffers a whole result set client-side.
+    """
+    lookups = [lookup for _, lookup in EXPORT_COLUMNS]
+    queryset = queryset.order_by('id').values_list(*lookups)
+    last_id = 0
+    while True:
+        rows = list(queryset.filter(id__gt=last_id)[:chunk_size])
+        if not rows:
+            return
+        yield from rows
+        last_id = rows[-1][0]
+
+def _format(value):
+    """Format a value the way the API serializers render it."""
+    if isinstance(value, datetime.datetime):
+        value = value.isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    if isinstance(value, (datetime.date, Decimal)):
+        return str(value)
+    return value
+
+class _Echo:
+    """File-like object whose write() returns the value, for streaming csv.writer output."""
+    def write(self, value):
+        return value
+
+def stream_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow([name for name, _ in EXPORT_COLUMNS])
+    for row in rows:
+        yield writer.writerow([_format(value) for value in row])
+
+def stream_ndjson(rows):
+    names = [name for name, _ in EXPORT_COLUMNS]
+    for row in rows:
+        yield json.dumps({name: _format(value) for name, value in zip(names, row)}) + '\n'
@@ -0,0 +1,38 @@
+import datetime
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.maintenance.models import MaintenancePlan
+from apps.maintenance.plans import materialize_plans
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the upcoming preventive maintenance requests of every active plan "
+        "(idempotent: each run only adds occurrences not generated yet). Run it daily."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--horizon-days', type=int, default=settings.PREVENTIVE_PLAN_HORIZON_DAYS,
+            help="Generate occurrences up to this many days ahead (default PREVENTIVE_PLAN_HORIZON_DAYS)."
+        )
+        parser.add_argument('--company', type=int, action='append', help="Only process this company id (repeatable).")
+        parser.add_argument('--plan', type=int, action='append', help="Only process this plan id (repeatable).")
+        parser.add_argument('--batch-size', type=int, default=2000, help="bulk_create batch size.")
+
+    def handle(self, *args, **options):
+        plans = MaintenancePlan.objects.all()
+        if options['company']:
+            plans = plans.filter(company_id__in=options['company'])
+        if options['plan']:
+            plans = plans.filter(id__in=options['plan'])
+
+        today = timezone.localdate()
+        horizon = today + datetime.timedelta(days=options['horizon_days'])
+        started = time.perf_counter()
+        created = materialize_plans(plans, horizon, today, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {created} preventive request(s) through {horizon} in {time.perf_counter() - started:.1f}s."
+        ))
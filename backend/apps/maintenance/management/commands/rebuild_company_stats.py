@@ -0,0 +1,77 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+from apps.authx.models import Company
+from apps.equipment.models import Equipment
+from apps.maintenance.models import CompanyStats, TechnicianWorkload
+from apps.maintenance.stats import (
+    compute_company_stats, compute_technician_workload, open_request_counts, rebuild_company_stats
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild (or, with --check, reconcile) every incrementally maintained counter of a company: "
+        "the dashboard counters, technician workload rows and Equipment.open_request_count."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--company', type=int, action='append', help="Only process this company id (repeatable).")
+        parser.add_argument('--check', action='store_true', help="Report drift without writing anything.")
+
+    def handle(self, *args, **options):
+        companies = Company.objects.order_by('id')
+        if options['company']:
+            companies = companies.filter(id__in=options['company'])
+
+        drifted = 0
+        for company_id in companies.values_list('id', flat=True):
+            if options['check']:
+                drift = self.find_drift(company_id)
+                if drift:
+                    drifted += 1
+                    self.stdout.write(self.style.WARNING(f"Company {company_id}: {drift}"))
+                continue
+            with transaction.atomic():
+                rebuild_company_stats(company_id)
+                equipment = Equipment.objects.filter(company_id=company_id)
+                equipment.filter(pk__in=self.drifted_equipment(company_id).values('pk')).update(
+                    open_request_count=open_request_counts()
+                )
+            self.stdout.write(f"Company {company_id}: rebuilt")
+
+        if options['check']:
+            style = self.style.WARNING if drifted else self.style.SUCCESS
+            self.stdout.write(style(f"{drifted} company(ies) out of sync."))
+        else:
+            self.stdout.write(self.style.SUCCESS("Company stats rebuilt."))
+
+    def drifted_equipment(self, company_id):
+        return Equipment.objects.filter(company_id=company_id).annotate(
+            actual=open_request_counts()
+        ).exclude(open_request_count=F('actual'))
+
+    def find_drift(self, company_id):
+        """Return {field: (stored, actual)} for every counter that disagrees."""
+        drift = {
+            f"equipment {equipment_id}": (stored, actual)
+            for equipment_id, stored, actual in self.drifted_equipment(company_id).values_list(
+                'id', 'open_request_count', 'actual'
+            )
+        }
+        expected = compute_company_stats(company_id)
+        stored = CompanyStats.objects.filter(pk=company_id).values(*expected).first()
+        if stored is None:
+            # Not built yet; the dashboard builds it on first read.
+            return drift
+        drift.update({
+            field: (stored.get(field), value)
+            for field, value in expected.items() if stored.get(field) != value
+        })
+        stored_workload = dict(
+            TechnicianWorkload.objects.filter(company_id=company_id).values_list('technician_id', 'open_count')
+        )
+        for technician_id, value in compute_technician_workload(company_id).items():
+            if stored_workload.get(technician_id) != value:
+                drift[f"technician {technician_id}"] = (stored_workload.get(technician_id), value)
+        return drift
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F
+from apps.equipment.models import Equipment
+from apps.maintenance.stats import open_request_counts
+
+
+class Command(BaseCommand):
+    help = "Recompute (or, with --check, report drift in) Equipment.open_request_count."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--company', type=int, action='append', help="Only process this company id (repeatable).")
+        parser.add_argument('--check', action='store_true', help="Report drift without writing anything.")
+
+    def handle(self, *args, **options):
+        equipment = Equipment.objects.all()
+        if options['company']:
+            equipment = equipment.filter(company_id__in=options['company'])
+        drifted = equipment.annotate(actual=open_request_counts()).exclude(open_request_count=F('actual'))
+
+        if options['check']:
+            rows = list(drifted.values_list('id', 'open_request_count', 'actual'))
+            for equipment_id, stored, actual in rows:
+                self.stdout.write(self.style.WARNING(f"Equipment {equipment_id}: {stored} stored, {actual} actual"))
+            style = self.style.WARNING if rows else self.style.SUCCESS
+            self.stdout.write(style(f"{len(rows)} equipment row(s) out of sync."))
+            return
+
+        # One set-based UPDATE, touching only the rows that drifted.
+        fixed = equipment.filter(pk__in=drifted.values('pk')).update(open_request_count=open_request_counts())
+        self.stdout.write(self.style.SUCCESS(f"Reconciled {fixed} equipment row(s)."))
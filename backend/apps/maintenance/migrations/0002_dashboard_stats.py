@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authx', '0001_initial'),
+        ('maintenance', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompanyStats',
+            fields=[
+                ('company', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='authx.company')),
+                ('total_equipment', models.IntegerField(default=0)),
+                ('total_teams', models.IntegerField(default=0)),
+                ('total_employees', models.IntegerField(default=0)),
+                ('open_requests', models.IntegerField(default=0)),
+                ('new_requests', models.IntegerField(default=0)),
+                ('in_progress_requests', models.IntegerField(default=0)),
+                ('repaired_requests', models.IntegerField(default=0)),
+                ('scrap_requests', models.IntegerField(default=0)),
+                ('corrective_requests', models.IntegerField(default=0)),
+                ('preventive_requests', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TechnicianWorkload',
+            fields=[
+                ('technician', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='workload', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('open_count', models.IntegerField(default=0)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='technician_workloads', to='authx.company')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['company', '-open_count'], name='techworkload_company_open_idx')],
+            },
+        ),
+    ]
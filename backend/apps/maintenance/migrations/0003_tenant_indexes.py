@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authx', '0002_tenant_indexes'),
+        ('equipment', '0002_tenant_indexes'),
+        ('maintenance', '0002_dashboard_stats'),
+        ('teams', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(fields=['company', '-created_at'], name='mr_company_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(fields=['company', 'status', '-created_at'], name='mr_company_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(fields=['company', 'request_type', 'scheduled_date'], name='mr_company_type_sched_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(fields=['company', 'assigned_technician', '-created_at'], name='mr_company_tech_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(fields=['company', 'created_by', '-created_at'], name='mr_company_author_idx'),
+        ),
+    ]
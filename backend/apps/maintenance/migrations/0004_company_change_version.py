@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authx', '0002_tenant_indexes'),
+        ('equipment', '0002_tenant_indexes'),
+        ('maintenance', '0003_tenant_indexes'),
+        ('teams', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='companystats',
+            name='version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(fields=['company', 'updated_at'], name='mr_company_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authx', '0002_tenant_indexes'),
+        ('maintenance', '0004_company_change_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_name', models.CharField(max_length=50)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+                ('company', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='authx.company')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['company', 'deleted_at'], name='tombstone_company_deleted_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authx', '0002_tenant_indexes'),
+        ('equipment', '0003_equipment_updated_at'),
+        ('maintenance', '0005_tombstone'),
+        ('teams', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(fields=['company', 'status', 'request_type'], name='mr_company_status_type_idx'),
+        ),
+    ]
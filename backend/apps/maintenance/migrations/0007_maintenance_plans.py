@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authx', '0002_tenant_indexes'),
+        ('equipment', '0004_equipment_open_request_count'),
+        ('maintenance', '0006_request_counter_index'),
+        ('teams', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MaintenancePlan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Subject of the generated requests.', max_length=255)),
+                ('description', models.TextField(blank=True)),
+                ('interval', models.PositiveSmallIntegerField(default=1)),
+                ('interval_unit', models.CharField(choices=[('DAY', 'Days'), ('WEEK', 'Weeks'), ('MONTH', 'Months')], default='MONTH', max_length=10)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('generated_until', models.DateField(blank=True, editable=False, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('company', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='authx.company')),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='maintenance_plans', to=settings.AUTH_USER_MODEL)),
+                ('equipment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='maintenance_plans', to='equipment.equipment')),
+                ('maintenance_team', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='maintenance_plans', to='teams.maintenanceteam')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='maintenancerequest',
+            name='plan',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='requests', to='maintenance.maintenanceplan'),
+        ),
+        migrations.AddConstraint(
+            model_name='maintenancerequest',
+            constraint=models.UniqueConstraint(fields=('plan', 'equipment', 'scheduled_date'), name='mr_plan_occurrence_uniq'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenanceplan',
+            index=models.Index(fields=['company', 'is_active'], name='plan_company_active_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='maintenanceplan',
+            constraint=models.CheckConstraint(condition=models.Q(('equipment__isnull', True), ('maintenance_team__isnull', True), _connector='XOR'), name='plan_equipment_xor_team'),
+        ),
+    ]
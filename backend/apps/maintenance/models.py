@@ -3,6 +3,22 @@ from django.conf import settings
 from apps.equipment.models import Equipment
 from apps.teams.models import MaintenanceTeam
 
+class MaintenanceRequestQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        """
+        QuerySet.update that, when it touches a field feeding the counters or
+        transition hooks (status, technician, ...), applies their side effects
+        too (see apps.maintenance.transitions). bulk_update goes through here.
+        """
+        from .transitions import tracks, update_tracked  # transitions imports this module
+        if tracks(kwargs):
+            return update_tracked(self, kwargs)
+        return super().update(**kwargs)
+
+    def update_untracked(self, **kwargs):
+        """The plain QuerySet.update, for callers that account for the changes themselves."""
+        return super().update(**kwargs)
+
 class MaintenanceRequest(models.Model):
     class Type(models.TextChoices):
         CORRECTIVE = 'CORRECTIVE', 'Corrective (Breakdown)'
@@ -36,8 +52,161 @@ class MaintenanceRequest(models.Model):
     
     company = models.ForeignKey('authx.Company', on_delete=models.CASCADE, null=True, blank=True)
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='created_requests')
+    # Set on preventive requests generated from a MaintenancePlan.
+    plan = models.ForeignKey(
+        'MaintenancePlan', on_delete=models.SET_NULL, null=True, blank=True, related_name='requests'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # The company change version of the last write (see apps.maintenance.versions).
+    sync_version = models.PositiveBigIntegerField(default=0, editable=False)
+
+    objects = MaintenanceRequestQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            # One generated occurrence per plan, equipment and date (manual requests have no plan).
+            models.UniqueConstraint(fields=['plan', 'equipment', 'scheduled_date'], name='mr_plan_occurrence_uniq'),
+        ]
+        # Every query is tenant-scoped, so each access path leads with company.
+        indexes = [
+            models.Index(fields=['company', '-created_at'], name='mr_company_created_idx'),
+            models.Index(fields=['company', 'status', '-created_at'], name='mr_company_status_idx'),
+            models.Index(fields=['company', 'status', 'request_type'], name='mr_company_status_type_idx'),
+            models.Index(fields=['company', 'request_type', 'scheduled_date'], name='mr_company_type_sched_idx'),
+            models.Index(fields=['company', 'assigned_technician', '-created_at'], name='mr_company_tech_idx'),
+            models.Index(fields=['company', 'created_by', '-created_at'], name='mr_company_author_idx'),
+            models.Index(fields=['company', 'updated_at'], name='mr_company_updated_idx'),
+            models.Index(fields=['company', 'sync_version'], name='mr_company_sync_idx'),
+        ]
 
     def __str__(self):
         return f"{self.subject} ({self.status})"
+
+    def save(self, *args, **kwargs):
+        from .versions import save_versioned  # versions imports this module
+        save_versioned(self, super().save, *args, **kwargs)
+
+class CompanyStats(models.Model):
+    """
+    Per-company dashboard counters, maintained incrementally by the signals in
+    apps.maintenance.signals and rebuilt by `manage.py rebuild_company_stats`.
+    """
+    company = models.OneToOneField('authx.Company', on_delete=models.CASCADE, primary_key=True, related_name='stats')
+
+    total_equipment = models.IntegerField(default=0)
+    total_teams = models.IntegerField(default=0)
+    total_employees = models.IntegerField(default=0)
+    open_requests = models.IntegerField(default=0)
+
+    new_requests = models.IntegerField(default=0)
+    in_progress_requests = models.IntegerField(default=0)
+    repaired_requests = models.IntegerField(default=0)
+    scrap_requests = models.IntegerField(default=0)
+
+    corrective_requests = models.IntegerField(default=0)
+    preventive_requests = models.IntegerField(default=0)
+
+    # Bumped whenever equipment, teams, users or deleted requests change what
+    # the tenant's endpoints return; request edits are covered by updated_at.
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Stats for company {self.company_id}"
+
+class TechnicianWorkload(models.Model):
+    """Open (NEW / IN_PROGRESS) request count per technician."""
+    technician = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='workload'
+    )
+    company = models.ForeignKey('authx.Company', on_delete=models.CASCADE, related_name='technician_workloads')
+    open_count = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['company', '-open_count'], name='techworkload_company_open_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.technician_id}: {self.open_count}"
+
+class Tombstone(models.Model):
+    """Record of a deleted MaintenanceRequest or Equipment row, for delta sync clients."""
+    company = models.ForeignKey('authx.Company', on_delete=models.CASCADE, null=True, blank=True)
+    model_name = models.CharField(max_length=50)
+    object_id = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+    sync_version = models.PositiveBigIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['company', 'deleted_at'], name='tombstone_company_deleted_idx'),
+            models.Index(fields=['company', 'sync_version'], name='tombstone_company_sync_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model_name} #{self.object_id} deleted at {self.deleted_at}"
+
+class SyncSequence(models.Model):
+    """
+    Per-company counter of the change versions stamped on synced rows as
+    sync_version; see apps.maintenance.versions.
+    """
+    company = models.OneToOneField(
+        'authx.Company', on_delete=models.CASCADE, primary_key=True, related_name='sync_sequence'
+    )
+    value = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"Sync sequence of company {self.company_id}: {self.value}"
+
+class MaintenancePlan(models.Model):
+    """
+    A recurring preventive maintenance schedule for one piece of equipment or
+    for every (non-scrapped) piece of equipment of a team. Occurrences are
+    materialized as MaintenanceRequests by `manage.py generate_preventive_requests`.
+    """
+    class IntervalUnit(models.TextChoices):
+        DAY = 'DAY', 'Days'
+        WEEK = 'WEEK', 'Weeks'
+        MONTH = 'MONTH', 'Months'
+
+    name = models.CharField(max_length=255, help_text="Subject of the generated requests.")
+    description = models.TextField(blank=True)
+    equipment = models.ForeignKey(
+        Equipment, on_delete=models.CASCADE, null=True, blank=True, related_name='maintenance_plans'
+    )
+    maintenance_team = models.ForeignKey(
+        MaintenanceTeam, on_delete=models.CASCADE, null=True, blank=True, related_name='maintenance_plans'
+    )
+    interval = models.PositiveSmallIntegerField(default=1)
+    interval_unit = models.CharField(max_length=10, choices=IntervalUnit.choices, default=IntervalUnit.MONTH)
+    start_date = models.DateField()
+    end_date = models.DateField(null=True, blank=True)
+    is_active = models.BooleanField(default=True)
+    # Last date occurrences have been generated through. Each run continues per
+    # equipment after its latest occurrence; None regenerates the whole window.
+    generated_until = models.DateField(null=True, blank=True, editable=False)
+
+    company = models.ForeignKey('authx.Company', on_delete=models.CASCADE, null=True, blank=True)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='maintenance_plans')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(equipment__isnull=True) ^ models.Q(maintenance_team__isnull=True),
+                name='plan_equipment_xor_team',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['company', 'is_active'], name='plan_company_active_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} (every {self.interval} {self.get_interval_unit_display().lower()})"
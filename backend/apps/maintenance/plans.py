@@ -0,0 +1,158 @@
+import calendar
+import datetime
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from apps.core.events import publish_on_commit
+from apps.equipment.models import Equipment
+from .assignment import default_hours, workload_index
+from .models import MaintenanceRequest, MaintenancePlan
+from .stats import apply_request_changes, request_state
+from .versions import stamp
+
+PLAN_CHUNK_SIZE = 500
+
+def _add_months(date, months):
+    month = date.month - 1 + months
+    year = date.year + month // 12
+    month = month % 12 + 1
+    return date.replace(year=year, month=month, day=min(date.day, calendar.monthrange(year, month)[1]))
+
+def occurrence_dates(plan, after, until):
+    """
+    Dates of ``plan`` in (after, until], each computed from start_date (so
+    month-end schedules do not drift: Jan 31, Feb 28, Mar 31, ...).
+    """
+    until = min(until, plan.end_date) if plan.end_date else until
+    start, interval = plan.start_date, plan.interval
+    if plan.interval_unit == MaintenancePlan.IntervalUnit.MONTH:
+        months_after = (after.year - start.year) * 12 + after.month - start.month
+        index = max(months_after // interval, 0)
+        step = lambda i: _add_months(start, i * interval)  # noqa: E731
+    else:
+        days = interval * (7 if plan.interval_unit == MaintenancePlan.IntervalUnit.WEEK else 1)
+        index = max((after - start).days // days, 0)
+        step = lambda i: start + datetime.timedelta(days=i * days)  # noqa: E731
+    dates = []
+    date = step(index)
+    while date <= until:
+        if date > after:
+            dates.append(date)
+        index += 1
+        date = step(index)
+    return dates
+
+def materialize_plans(plans, horizon, today=None, batch_size=2000):
+    """
+    Create the missing preventive requests of ``plans`` (a MaintenancePlan
+    queryset) up to ``horizon``, and return how many were created.
+
+    Each (plan, equipment) pair continues after its latest generated
+    occurrence, or from today for equipment a team plan has not covered yet
+    (e.g. added to the team after earlier runs), so a run only inserts new
+    occurrences and re-running is a no-op. The team is
+    filled from the equipment and the technician picked by load, as
+    MaintenanceRequestSerializer does. Plans are locked and processed in
+    chunks, each in one transaction.
+    """
+    today = today or timezone.localdate()
+    plan_ids = list(plans.filter(is_active=True).order_by('id').values_list('id', flat=True))
+    created = 0
+    for offset in range(0, len(plan_ids), PLAN_CHUNK_SIZE):
+        created += _materialize_chunk(plan_ids[offset:offset + PLAN_CHUNK_SIZE], horizon, today, batch_size)
+    return created
+
+@transaction.atomic
+def _materialize_chunk(plan_ids, horizon, today, batch_size):
+    plans = list(MaintenancePlan.objects.select_for_update().filter(id__in=plan_ids, is_active=True))
+    team_ids = {plan.maintenance_team_id for plan in plans if plan.maintenance_team_id}
+    equipment_ids = {plan.equipment_id for plan in plans if plan.equipment_id}
+    equipment_by_team, equipment_by_id = {}, {}
+    for row in Equipment.objects.filter(
+        Q(maintenance_team_id__in=team_ids) | Q(id__in=equipment_ids), is_scrapped=False
+    ).values_list('id', 'maintenance_team_id', 'default_technician_id', 'company_id'):
+        equipment_by_id[row[0]] = row
+        equipment_by_team.setdefault(row[1], []).append(row)
+
+    queues = {}
+
+    def technician_for(team_id, fallback):
+        if team_id is None or not settings.TECHNICIAN_AUTO_ASSIGNMENT:
+            return fallback
+        if team_id not in queues:
+            queues[team_id] = workload_index.queue(team_id)
+        return queues[team_id].take(default_hours()) or fallback
+
+    windows = {}
+    for plan in plans:
+        # Never back-fill the past.
+        after = max(today, plan.start_date) - datetime.timedelta(days=1)
+        until = min(horizon, plan.end_date) if plan.end_date else horizon
+        if after < until:
+            windows[plan.id] = after, until
+
+    # The (plan, equipment) watermarks: the latest occurrence of each pair.
+    # Occurrences kept from before a watermark reset (see MaintenancePlanViewSet)
+    # are skipped rather than inserted twice.
+    existing, watermarks = set(), {}
+    if windows:
+        for occurrence in MaintenanceRequest.objects.filter(
+            plan_id__in=windows, scheduled_date__gt=min(after for after, _ in windows.values())
+        ).values_list('plan_id', 'equipment_id', 'scheduled_date'):
+            existing.add(occurrence)
+            pair = occurrence[:2]
+            watermarks[pair] = max(watermarks.get(pair, occurrence[2]), occurrence[2])
+
+    requests = []
+    for plan in plans:
+        if plan.id not in windows:
+            continue
+        start_after, until = windows[plan.id]
+        dates_after = {}
+        if plan.maintenance_team_id:
+            targets = equipment_by_team.get(plan.maintenance_team_id, [])
+        else:
+            targets = [equipment_by_id[plan.equipment_id]] if plan.equipment_id in equipment_by_id else []
+        for equipment_id, team_id, technician_id, company_id in targets:
+            if company_id != plan.company_id:
+                continue
+            team_id = plan.maintenance_team_id or team_id
+            after = start_after
+            if plan.generated_until is not None:
+                # A reset watermark (schedule change) regenerates the whole window.
+                after = max(after, watermarks.get((plan.id, equipment_id), after))
+            if after not in dates_after:
+                dates_after[after] = occurrence_dates(plan, after, until)
+            for date in dates_after[after]:
+                if (plan.id, equipment_id, date) in existing:
+                    continue
+                requests.append(MaintenanceRequest(
+                    request_type=MaintenanceRequest.Type.PREVENTIVE,
+                    subject=plan.name,
+                    description=plan.description,
+                    equipment_id=equipment_id,
+                    maintenance_team_id=team_id,
+                    assigned_technician_id=technician_for(team_id, technician_id),
+                    scheduled_date=date,
+                    company_id=plan.company_id,
+                    created_by_id=plan.created_by_id,
+                    plan_id=plan.id,
+                ))
+
+    stamp(requests)
+    MaintenanceRequest.objects.bulk_create(requests, batch_size=batch_size)
+
+    advanced = [plan for plan in plans if plan.id in windows and plan.generated_until != windows[plan.id][1]]
+    for plan in advanced:
+        plan.generated_until = windows[plan.id][1]
+    MaintenancePlan.objects.bulk_update(advanced, ['generated_until'])
+
+    # bulk_create skips post_save: keep the counters and push subscribers in step.
+    apply_request_changes([(None, request_state(obj)) for obj in requests])
+    per_company = {}
+    for obj in requests:
+        per_company[obj.company_id] = per_company.get(obj.company_id, 0) + 1
+    for company_id, count in per_company.items():
+        publish_on_commit(company_id, 'maintenancerequest.bulk_created', count=count)
+    return len(requests)
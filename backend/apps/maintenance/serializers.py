@@ -1,10 +1,12 @@
 from rest_framework import serializers
-from .models import MaintenanceRequest
+from .models import MaintenanceRequest, MaintenancePlan
+from .assignment import pick_technician
 from apps.equipment.serializers import EquipmentSerializer
 from apps.teams.serializers import MaintenanceTeamSerializer
 from apps.authx.serializers import UserSerializer
+from apps.core.serializers import SparseFieldsMixin
 
-class MaintenanceRequestSerializer(serializers.ModelSerializer):
+class MaintenanceRequestSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     equipment_details = EquipmentSerializer(source='equipment', read_only=True)
     maintenance_team_details = MaintenanceTeamSerializer(source='maintenance_team', read_only=True)
     assigned_technician_details = UserSerializer(source='assigned_technician', read_only=True)
@@ -44,7 +46,9 @@ class MaintenanceRequestSerializer(serializers.ModelSerializer):
             if not validated_data.get('maintenance_team'):
                 validated_data['maintenance_team'] = equipment.maintenance_team
             if not validated_data.get('assigned_technician'):
-                validated_data['assigned_technician'] = equipment.default_technician
+                validated_data['assigned_technician'] = pick_technician(
+                    validated_data['maintenance_team'], fallback=equipment.default_technician
+                )
         
         # User from context
         request = self.context.get('request')
@@ -52,3 +56,73 @@ class MaintenanceRequestSerializer(serializers.ModelSerializer):
             validated_data['created_by'] = request.user
             
         return super().create(validated_data)
+
+class MaintenanceRequestCardSerializer(serializers.ModelSerializer):
+    """
+    Compact, read-only projection used by the Kanban board.
+    Full details are fetched from the detail endpoint when a card is opened.
+    """
+    equipment_name = serializers.CharField(source='equipment.name', read_only=True)
+    maintenance_team_name = serializers.CharField(source='maintenance_team.name', read_only=True, default=None)
+    assigned_technician_name = serializers.CharField(source='assigned_technician.full_name', read_only=True, default=None)
+
+    class Meta:
+        model = MaintenanceRequest
+        fields = (
+            'id', 'subject', 'request_type', 'status', 'scheduled_date', 'duration_hours',
+            'equipment', 'equipment_name', 'maintenance_team', 'maintenance_team_name',
+            'assigned_technician', 'assigned_technician_name', 'created_at', 'updated_at',
+        )
+        read_only_fields = fields
+
+class StatusTransitionSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=MaintenanceRequest.Status.choices)
+    duration_hours = serializers.DecimalField(max_digits=5, decimal_places=2, required=False, allow_null=True)
+
+class BulkStatusTransitionSerializer(serializers.Serializer):
+    """
+    Errors in an entry are keyed by its request id, like the view's own, or by
+    its position ("#2") when the entry has no valid id.
+    """
+    transitions = serializers.ListField(allow_empty=False)
+
+    def validate_transitions(self, items):
+        transitions, errors, seen = [], {}, set()
+        for index, item in enumerate(items):
+            entry = StatusTransitionSerializer(data=item)
+            if not entry.is_valid():
+                try:
+                    key = str(entry.fields['id'].run_validation(item.get('id', serializers.empty)))
+                except (AttributeError, serializers.ValidationError):
+                    key = f"#{index}"
+                errors[key] = entry.errors
+            elif entry.validated_data['id'] in seen:
+                errors[str(entry.validated_data['id'])] = {"id": ["Each request may appear only once."]}
+            else:
+                seen.add(entry.validated_data['id'])
+                transitions.append(entry.validated_data)
+        if errors:
+            raise serializers.ValidationError(errors)
+        return transitions
+
+class MaintenancePlanSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = MaintenancePlan
+        fields = '__all__'
+        read_only_fields = ('company', 'created_by', 'generated_until', 'created_at', 'updated_at')
+
+    def validate(self, data):
+        equipment = data.get('equipment', getattr(self.instance, 'equipment', None))
+        team = data.get('maintenance_team', getattr(self.instance, 'maintenance_team', None))
+        if bool(equipment) == bool(team):
+            raise serializers.ValidationError("Set either equipment or maintenance_team, not both.")
+        if equipment and equipment.is_scrapped:
+            raise serializers.ValidationError("Cannot plan maintenance for scrapped equipment.")
+        if data.get('interval') == 0:
+            raise serializers.ValidationError({"interval": "Must be at least 1."})
+        start_date = data.get('start_date', getattr(self.instance, 'start_date', None))
+        end_date = data.get('end_date', getattr(self.instance, 'end_date', None))
+        if end_date and start_date and end_date < start_date:
+            raise serializers.ValidationError({"end_date": "Must not be before start_date."})
+        return data
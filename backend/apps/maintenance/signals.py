@@ -1,11 +1,162 @@
-from django.db.models.signals import post_save
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, pre_delete, post_delete, m2m_changed
 from django.dispatch import receiver
-from .models import MaintenanceRequest
+from apps.equipment.models import Equipment
+from apps.teams.models import MaintenanceTeam
+from .models import MaintenanceRequest, TechnicianWorkload, Tombstone
+from . import stats
+from .assignment import workload_index
+from .transitions import propagate_scrap
+from .versions import stamp
+from apps.core.events import publish_on_commit
+
+User = get_user_model()
+
+# ---------------------------------------------------------------------------
+# Dashboard counters and change versions
+#
+# Each tracked instance remembers the fields that feed the counters when it is
+# loaded, so a save only has to apply the difference between the old and new
+# state with single-statement F() updates. Changes that request.updated_at
+# cannot reveal (equipment, teams, users, deleted requests) also bump
+# CompanyStats.version for conditional GETs.
+# ---------------------------------------------------------------------------
+
+def _remember(instance, fields):
+    # Read from __dict__ so deferred fields are not fetched.
+    instance._stats_state = tuple(instance.__dict__.get(field) for field in fields)
+
+def _previous(instance, created):
+    return None if created else getattr(instance, '_stats_state', None)
+
+@receiver(post_init, sender=MaintenanceRequest)
+def remember_request_state(sender, instance, **kwargs):
+    _remember(instance, stats.REQUEST_STATE_FIELDS)
 
 @receiver(post_save, sender=MaintenanceRequest)
-def update_equipment_status(sender, instance, created, **kwargs):
-    if instance.status == MaintenanceRequest.Status.SCRAP:
-        equipment = instance.equipment
-        if not equipment.is_scrapped:
-            equipment.is_scrapped = True
-            equipment.save()
+def update_request_counters(sender, instance, created, **kwargs):
+    old_state = _previous(instance, created)
+    _remember(instance, stats.REQUEST_STATE_FIELDS)
+    changes = [(old_state, instance._stats_state)]
+    stats.apply_request_changes(changes)
+    # Status transition hooks only act when the status actually changed.
+    propagate_scrap(changes)
+
+@receiver(post_delete, sender=MaintenanceRequest)
+def remove_request_counters(sender, instance, **kwargs):
+    stats.apply_request_changes([(getattr(instance, '_stats_state', None), None)])
+    stats.bump_version(instance.company_id)
+
+def _apply_company_count_change(field, old_company_id, new_company_id):
+    if old_company_id == new_company_id:
+        stats.bump_version(new_company_id)
+        return
+    stats.bump_version(old_company_id, **{field: -1})
+    stats.bump_version(new_company_id, **{field: 1})
+
+COUNTED_MODELS = {
+    Equipment: 'total_equipment',
+    MaintenanceTeam: 'total_teams',
+    User: 'total_employees',
+}
+
+USER_STATE_FIELDS = ('company_id', 'role', 'is_active')
+
+def remember_company(sender, instance, **kwargs):
+    _remember(instance, USER_STATE_FIELDS if sender is User else ('company_id',))
+
+def update_company_count(sender, instance, created, **kwargs):
+    old_state = _previous(instance, created)
+    remember_company(sender, instance)
+    old_company_id = old_state[0] if old_state else None
+    _apply_company_count_change(COUNTED_MODELS[sender], old_company_id, instance.company_id)
+    if sender is User:
+        _sync_technician_workload(instance, old_state)
+        _refresh_assignment_candidates(instance, old_state)
+
+def remove_company_count(sender, instance, **kwargs):
+    state = getattr(instance, '_stats_state', None)
+    _apply_company_count_change(COUNTED_MODELS[sender], state[0] if state else None, None)
+
+@receiver(m2m_changed, sender=MaintenanceTeam.members.through)
+def bump_version_on_membership_change(sender, instance, action, **kwargs):
+    if action.startswith('post_'):
+        stats.bump_version(instance.company_id)
+        # Team heaps are built from the member list; rebuild the affected ones.
+        team_ids = [instance.pk] if isinstance(instance, MaintenanceTeam) else kwargs.get('pk_set')
+        transaction.on_commit(lambda: [workload_index.invalidate(team_id) for team_id in team_ids or [None]])
+
+for model in COUNTED_MODELS:
+    post_init.connect(remember_company, sender=model, dispatch_uid=f'stats_init_{model.__name__}')
+    post_save.connect(update_company_count, sender=model, dispatch_uid=f'stats_save_{model.__name__}')
+    post_delete.connect(remove_company_count, sender=model, dispatch_uid=f'stats_delete_{model.__name__}')
+
+def _sync_technician_workload(user, old_state):
+    """Keep a workload row for every technician that belongs to a company."""
+    is_tracked = user.role == User.Role.TECHNICIAN and user.company_id is not None
+    if old_state is not None and old_state[:2] == (user.company_id, user.role):
+        return
+    if not is_tracked:
+        TechnicianWorkload.objects.filter(pk=user.pk).delete()
+        return
+    open_count = 0
+    if old_state is not None:
+        open_count = MaintenanceRequest.objects.filter(
+            assigned_technician=user, status__in=stats.OPEN_STATUSES
+        ).count()
+    TechnicianWorkload.objects.update_or_create(
+        technician=user, defaults={'company_id': user.company_id, 'open_count': open_count}
+    )
+
+def _refresh_assignment_candidates(user, old_state):
+    """Rebuild the assignment heaps of the user's teams when they can no longer (or can again) be picked."""
+    if old_state is None or old_state == user._stats_state:
+        return
+    user_id = user.pk
+    transaction.on_commit(lambda: workload_index.invalidate_technician(
+        user_id, MaintenanceTeam.objects.filter(members=user_id).values_list('id', flat=True)
+    ))
+
+# ---------------------------------------------------------------------------
+# Tombstones for delta sync
+# ---------------------------------------------------------------------------
+
+# pre_delete runs inside the deletion's transaction, before the counter
+# updates of post_delete, so the change version is taken first (see versions.py).
+@receiver(pre_delete, sender=MaintenanceRequest)
+@receiver(pre_delete, sender=Equipment)
+def record_tombstone(sender, instance, **kwargs):
+    tombstone = Tombstone(
+        company_id=instance.company_id,
+        model_name=sender._meta.model_name,
+        object_id=instance.pk,
+    )
+    stamp([tombstone])
+    tombstone.save()
+
+# ---------------------------------------------------------------------------
+# Server push (/events/)
+# ---------------------------------------------------------------------------
+
+@receiver(post_save, sender=MaintenanceRequest)
+def publish_request_saved(sender, instance, created, **kwargs):
+    publish_on_commit(
+        instance.company_id,
+        'maintenancerequest.created' if created else 'maintenancerequest.updated',
+        id=instance.pk, status=instance.status, equipment=instance.equipment_id,
+        assigned_technician=instance.assigned_technician_id, scheduled_date=instance.scheduled_date,
+    )
+
+@receiver(post_save, sender=Equipment)
+def publish_equipment_saved(sender, instance, created, **kwargs):
+    publish_on_commit(
+        instance.company_id,
+        'equipment.created' if created else 'equipment.updated',
+        id=instance.pk, is_scrapped=instance.is_scrapped,
+    )
+
+@receiver(post_delete, sender=MaintenanceRequest)
+@receiver(post_delete, sender=Equipment)
+def publish_deleted(sender, instance, **kwargs):
+    publish_on_commit(instance.company_id, f'{sender._meta.model_name}.deleted', id=instance.pk)
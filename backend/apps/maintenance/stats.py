@@ -0,0 +1,236 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+from apps.authx.models import Company
+from apps.core.concurrency import run_concurrently
+from apps.equipment.models import Equipment
+from apps.teams.models import MaintenanceTeam
+from .models import MaintenanceRequest, CompanyStats, TechnicianWorkload
+from .versions import take_versions, version_expression
+
+User = get_user_model()
+
+OPEN_STATUSES = (MaintenanceRequest.Status.NEW, MaintenanceRequest.Status.IN_PROGRESS)
+
+def status_field(status):
+    return f"{status.lower()}_requests"
+
+def type_field(request_type):
+    return f"{request_type.lower()}_requests"
+
+def _count_subquery(queryset):
+    """Scalar subquery counting ``queryset`` rows for the outer company."""
+    counts = queryset.filter(company=OuterRef('pk')).order_by().values('company').annotate(count=Count('*'))
+    return Coalesce(Subquery(counts.values('count')), 0)
+
+def _entity_counts(company_id):
+    # One round-trip for the three non-request counters.
+    counts = Company.objects.filter(pk=company_id).values(
+        total_equipment=_count_subquery(Equipment.objects.all()),
+        total_teams=_count_subquery(MaintenanceTeam.objects.all()),
+        total_employees=_count_subquery(User.objects.all()),
+    ).first()
+    return counts or {"total_equipment": 0, "total_teams": 0, "total_employees": 0}
+
+def _request_counts(company_id):
+    """
+    The open, per-status and per-type counters from one GROUP BY over
+    (status, request_type), which mr_company_status_type_idx covers.
+    """
+    counters = {"open_requests": 0}
+    counters.update({status_field(status): 0 for status in MaintenanceRequest.Status.values})
+    counters.update({type_field(request_type): 0 for request_type in MaintenanceRequest.Type.values})
+    buckets = MaintenanceRequest.objects.filter(company_id=company_id).order_by().values_list(
+        'status', 'request_type'
+    ).annotate(count=Count('*'))
+    for status, request_type, count in buckets:
+        counters[status_field(status)] += count
+        counters[type_field(request_type)] += count
+        if status in OPEN_STATUSES:
+            counters["open_requests"] += count
+    return counters
+
+def _company_stats_queries(company_id):
+    return (lambda: _entity_counts(company_id), lambda: _request_counts(company_id))
+
+def _company_stats_from_results(results):
+    entity_counts, request_counts = results
+    return {**entity_counts, **request_counts}
+
+def compute_company_stats(company_id):
+    """Compute the CompanyStats counters for a company from the live tables."""
+    return _company_stats_from_results(run_concurrently(*_company_stats_queries(company_id)))
+
+def compute_technician_workload(company_id):
+    """Return {technician_id: open request count} for a company's technicians."""
+    technicians = User.objects.filter(company_id=company_id, role=User.Role.TECHNICIAN).annotate(
+        request_count=Count('assigned_requests', filter=Q(assigned_requests__status__in=OPEN_STATUSES))
+    )
+    return dict(technicians.values_list('id', 'request_count'))
+
+def rebuild_company_stats(company_id):
+    """Recompute and persist the counters and technician workload rows for a company."""
+    # The aggregates are independent reads, so run them side by side before
+    # taking the write transaction.
+    *results, workload = run_concurrently(
+        *_company_stats_queries(company_id), lambda: compute_technician_workload(company_id)
+    )
+    with transaction.atomic():
+        return _save_company_stats(company_id, _company_stats_from_results(results), workload)
+
+def _save_company_stats(company_id, counters, workload):
+    stats, _ = CompanyStats.objects.update_or_create(company_id=company_id, defaults=counters)
+    TechnicianWorkload.objects.filter(company_id=company_id).exclude(technician_id__in=workload).delete()
+    for technician_id, open_count in workload.items():
+        TechnicianWorkload.objects.update_or_create(
+            technician_id=technician_id,
+            defaults={'company_id': company_id, 'open_count': open_count}
+        )
+    return stats
+
+def apply_stats_delta(company_id, deltas):
+    """
+    Atomically add ``deltas`` ({field: int}) to a company's counters.
+    Companies without a stats row are skipped; the row is built on first read.
+    """
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if company_id is None or not deltas:
+        return
+    CompanyStats.objects.filter(pk=company_id).update(
+        updated_at=timezone.now(),
+        **{field: F(field) + delta for field, delta in deltas.items()}
+    )
+
+def bump_version(company_id, **deltas):
+    """Mark a company's data as changed (see CompanyStats.version), with optional counter deltas."""
+    apply_stats_delta(company_id, {'version': 1, **deltas})
+
+def apply_workload_delta(technician_id, delta):
+    if technician_id is None or not delta:
+        return
+    TechnicianWorkload.objects.filter(pk=technician_id).update(open_count=F('open_count') + delta)
+
+def apply_equipment_deltas(deltas, companies):
+    """
+    Add {equipment_id: int} to Equipment.open_request_count, one UPDATE per
+    distinct delta. updated_at and sync_version move too, so delta sync
+    clients pick up the new count; ``companies`` maps each equipment id to its
+    company. Drift never takes the column below zero (it would abort the
+    caller's save); reconcile_open_request_counts repairs it.
+    """
+    by_delta = {}
+    for equipment_id, delta in deltas.items():
+        if equipment_id is not None and delta:
+            by_delta.setdefault(delta, []).append(equipment_id)
+    if not by_delta:
+        return
+    versions = take_versions(companies[equipment_id] for ids in by_delta.values() for equipment_id in ids)
+    now = timezone.now()
+    for delta, equipment_ids in by_delta.items():
+        Equipment.objects.filter(pk__in=equipment_ids).update(
+            open_request_count=Greatest(F('open_request_count') + delta, 0), updated_at=now,
+            sync_version=version_expression(versions),
+        )
+
+def open_request_counts():
+    """Scalar subquery: the live open request count of the outer Equipment row."""
+    counts = MaintenanceRequest.objects.filter(
+        equipment=OuterRef('pk'), status__in=OPEN_STATUSES
+    ).order_by().values('equipment').annotate(count=Count('*'))
+    return Coalesce(Subquery(counts.values('count')), 0)
+
+REQUEST_STATE_FIELDS = (
+    'company_id', 'status', 'request_type', 'assigned_technician_id', 'equipment_id', 'duration_hours'
+)
+
+def request_state(request):
+    """The fields of a request that feed the counters and technician loads, as a tuple."""
+    return tuple(request.__dict__.get(field) for field in REQUEST_STATE_FIELDS)
+
+def apply_request_changes(changes):
+    """
+    Apply a batch of request state changes, given as (old_state, new_state)
+    pairs (None for created/deleted), with one update per company and per
+    technician, and one per distinct delta for equipment. The in-process
+    assignment index is moved by the same changes on commit.
+    """
+    from .assignment import track_request_changes  # assignment imports this module
+    company_deltas, technician_deltas, equipment_deltas, equipment_companies = {}, {}, {}, {}
+    for old_state, new_state in changes:
+        if old_state == new_state:
+            continue
+        for state, sign in ((old_state, -1), (new_state, 1)):
+            if state is None:
+                continue
+            company_id, status, request_type, technician_id, equipment_id, _ = state
+            is_open = status in OPEN_STATUSES
+            deltas = company_deltas.setdefault(company_id, {})
+            for field, delta in (
+                (status_field(status), sign),
+                (type_field(request_type), sign),
+                ('open_requests', sign if is_open else 0),
+            ):
+                deltas[field] = deltas.get(field, 0) + delta
+            if is_open and technician_id:
+                technician_deltas[technician_id] = technician_deltas.get(technician_id, 0) + sign
+            if is_open:
+                equipment_deltas[equipment_id] = equipment_deltas.get(equipment_id, 0) + sign
+                equipment_companies[equipment_id] = company_id
+    for company_id, deltas in company_deltas.items():
+        apply_stats_delta(company_id, deltas)
+    for technician_id, delta in technician_deltas.items():
+        apply_workload_delta(technician_id, delta)
+    apply_equipment_deltas(equipment_deltas, equipment_companies)
+    track_request_changes(changes)
+
+def get_company_stats(company):
+    """Return the stats row for a company, building it on first access."""
+    if company is None:
+        return CompanyStats()
+    try:
+        return CompanyStats.objects.get(pk=company.pk)
+    except CompanyStats.DoesNotExist:
+        return rebuild_company_stats(company.pk)
+
+def _top_technicians(company):
+    return list(TechnicianWorkload.objects.filter(
+        company=company
+    ).select_related('technician').order_by('-open_count')[:5])
+
+def get_dashboard_stats(company):
+    """Build the dashboard payload from the maintained counters."""
+    if company is None:
+        stats, top_technicians = CompanyStats(), []
+    else:
+        # A primary key lookup and an indexed top-5: cheaper in sequence on the
+        # request's connection than handed to the query pool.
+        stats = CompanyStats.objects.filter(pk=company.pk).first()
+        top_technicians = _top_technicians(company)
+        if stats is None:
+            # First read for this company: build the counters and workload rows, then read them.
+            stats = rebuild_company_stats(company.pk)
+            top_technicians = _top_technicians(company)
+
+    status_dist = {
+        status: getattr(stats, status_field(status)) for status in MaintenanceRequest.Status.values
+    }
+    type_dist = {
+        request_type: getattr(stats, type_field(request_type)) for request_type in MaintenanceRequest.Type.values
+    }
+    return {
+        "counters": {
+            "total_equipment": stats.total_equipment,
+            "total_teams": stats.total_teams,
+            "total_employees": stats.total_employees,
+            "open_requests": stats.open_requests,
+        },
+        # Only report buckets that have requests, as the aggregate queries did.
+        "status_distribution": {key: count for key, count in status_dist.items() if count},
+        "type_distribution": {key: count for key, count in type_dist.items() if count},
+        "technician_workload": [
+            {"name": workload.technician.full_name, "count": workload.open_count}
+            for workload in top_technicians
+        ]
+    }
@@ -0,0 +1,102 @@
+"""
+Delta sync: the MaintenanceRequest and Equipment rows created, updated or
+deleted since a client-held cursor.
+
+The cursor stores a (sync_version, id) keyset position per stream. Change
+versions become visible in commit order (see apps.maintenance.versions), so
+a row committed after a sync ran always sorts after that sync's position,
+however long its transaction took. The cursor also records when it was
+issued, to detect tombstones purged since.
+"""
+import base64
+import datetime
+import json
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from apps.core.eager_loading import eager_load
+from apps.equipment.models import Equipment
+from apps.equipment.serializers import EquipmentSerializer
+from .models import MaintenanceRequest, Tombstone
+from .serializers import MaintenanceRequestSerializer
+
+STREAMS = {
+    # name: (model, serializer)
+    'requests': (MaintenanceRequest, MaintenanceRequestSerializer),
+    'equipment': (Equipment, EquipmentSerializer),
+    'deleted': (Tombstone, None),
+}
+
+class InvalidCursor(ValueError):
+    pass
+
+class ExpiredCursor(ValueError):
+    pass
+
+def encode_cursor(positions, issued):
+    payload = {'issued': issued.isoformat(), **{name: list(position) for name, position in positions.items()}}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+def decode_cursor(cursor):
+    """Return {stream: (sync_version, id)}; an empty cursor means "from the beginning"."""
+    if not cursor:
+        return {}
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        raise InvalidCursor("Invalid sync cursor.")
+    if not isinstance(payload, dict):
+        raise InvalidCursor("Invalid sync cursor.")
+    if 'issued' not in payload:
+        # Issued before cursors held change versions.
+        raise ExpiredCursor("Sync cursor is no longer supported; resync from scratch.")
+    try:
+        issued = datetime.datetime.fromisoformat(payload['issued'])
+        positions = {}
+        for name in STREAMS:
+            if name in payload:
+                version, pk = payload[name]
+                if type(version) is not int or type(pk) is not int:
+                    raise TypeError
+                positions[name] = (version, pk)
+    except (ValueError, TypeError):
+        raise InvalidCursor("Invalid sync cursor.")
+    # Cursors are only ever issued with aware timestamps.
+    if timezone.is_naive(issued):
+        raise InvalidCursor("Invalid sync cursor.")
+    retention = datetime.timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    if issued < timezone.now() - retention:
+        raise ExpiredCursor("Sync cursor is older than the tombstone retention; resync from scratch.")
+    return positions
+
+def _changed_since(queryset, position, limit):
+    if position:
+        version, pk = position
+        queryset = queryset.filter(Q(sync_version__gt=version) | Q(sync_version=version, id__gt=pk))
+    return list(queryset.order_by('sync_version', 'id')[:limit + 1])
+
+def get_changes(company, cursor, limit, context=None):
+    """Return the sync payload for ``company`` after ``cursor``."""
+    positions = decode_cursor(cursor)
+    issued = timezone.now()
+    payload = {'deleted': {'maintenancerequest': [], 'equipment': []}}
+    has_more = False
+
+    for name, (model, serializer_class) in STREAMS.items():
+        queryset = model.objects.filter(company=company)
+        if serializer_class is not None:
+            queryset = eager_load(queryset, serializer_class)
+        rows = _changed_since(queryset, positions.get(name), limit)
+        if len(rows) > limit:
+            rows, has_more = rows[:limit], True
+        if rows:
+            positions[name] = (rows[-1].sync_version, rows[-1].pk)
+        if serializer_class is None:
+            for tombstone in rows:
+                payload['deleted'].setdefault(tombstone.model_name, []).append(tombstone.object_id)
+        else:
+            payload[name] = serializer_class(rows, many=True, context=context).data
+
+    payload['cursor'] = encode_cursor(positions, issued)
+    payload['has_more'] = has_more
+    return payload
@@ -0,0 +1,689 @@
+import base64
+import csv
+import datetime
+import json
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from apps.authx.models import User
+from apps.core.testing import TenantTestCase
+from apps.equipment.models import Equipment
+from .assignment import current_loads, pick_technician, workload_index
+from .exports import EXPORT_COLUMNS
+from .models import CompanyStats, MaintenancePlan, MaintenanceRequest, TechnicianWorkload
+from .plans import materialize_plans
+from .stats import OPEN_STATUSES, compute_company_stats, compute_technician_workload
+
+
+class TechnicianAssignmentTests(TenantTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.techs = [cls.tech] + [cls.create_user(f"tech{i}", User.Role.TECHNICIAN) for i in (1, 2)]
+        cls.team.members.set(cls.techs)
+        cls.equipment.default_technician = cls.tech
+        cls.equipment.save()
+
+    def setUp(self):
+        workload_index.invalidate()
+        super().setUp()
+
+    def open_request(self, technician, hours=None, status=MaintenanceRequest.Status.NEW):
+        return self.create_request(
+            subject="Work", maintenance_team=self.team, assigned_technician=technician,
+            duration_hours=hours, status=status,
+        )
+
+    def create_via_api(self, **data):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/maintenance/', {
+                'subject': "Noise", 'description': "-", 'equipment': self.equipment.pk, **data
+            }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return response.data
+
+    def test_picks_member_with_fewest_planned_hours(self):
+        self.open_request(self.techs[0], hours=Decimal('8'))
+        self.open_request(self.techs[1], hours=Decimal('2'))
+        self.open_request(self.techs[1], hours=Decimal('2'))
+        self.open_request(self.techs[2], hours=Decimal('6'))
+        # tech1 has two requests but only 4 planned hours.
+        self.assertEqual(pick_technician(self.team), self.techs[1])
+
+    def test_open_count_breaks_ties_and_missing_duration_counts_as_default(self):
+        with self.settings(ASSIGNMENT_DEFAULT_HOURS=2):
+            self.open_request(self.techs[0], hours=Decimal('2'))
+            self.open_request(self.techs[1])
+            self.open_request(self.techs[1], hours=Decimal('0'))
+            self.open_request(self.techs[2], hours=Decimal('5'))
+            self.assertEqual(current_loads([self.techs[1].pk])[self.techs[1].pk], (Decimal('2'), 2))
+            self.assertEqual(pick_technician(self.team), self.techs[0])
+
+    def test_closed_requests_do_not_count(self):
+        self.open_request(self.techs[0], hours=Decimal('1'))
+        self.open_request(self.techs[1], hours=Decimal('40'), status=MaintenanceRequest.Status.REPAIRED)
+        self.open_request(self.techs[2], hours=Decimal('1'))
+        self.assertEqual(pick_technician(self.team), self.techs[1])
+
+    def test_consecutive_creates_spread_over_the_team(self):
+        assigned = [self.create_via_api(duration_hours='3.00')['assigned_technician'] for _ in range(6)]
+        self.assertEqual(sorted(assigned), sorted([tech.pk for tech in self.techs] * 2))
+
+    def test_index_follows_status_changes(self):
+        busy = self.open_request(self.techs[0], hours=Decimal('10'))
+        self.open_request(self.techs[1], hours=Decimal('3'))
+        self.open_request(self.techs[2], hours=Decimal('4'))
+        self.assertEqual(pick_technician(self.team), self.techs[1])
+        with self.captureOnCommitCallbacks(execute=True):
+            busy.status = MaintenanceRequest.Status.REPAIRED
+            busy.save()
+        self.assertEqual(pick_technician(self.team), self.techs[0])
+
+    def test_explicit_technician_is_kept(self):
+        self.open_request(self.techs[2], hours=Decimal('9'))
+        data = self.create_via_api(assigned_technician=self.techs[2].pk)
+        self.assertEqual(data['assigned_technician'], self.techs[2].pk)
+
+    def test_falls_back_to_default_technician(self):
+        self.team.members.clear()
+        workload_index.invalidate()
+        self.assertEqual(self.create_via_api()['assigned_technician'], self.techs[0].pk)
+        with self.settings(TECHNICIAN_AUTO_ASSIGNMENT=False):
+            self.assertEqual(pick_technician(self.team, fallback=self.techs[0]), self.techs[0])
+
+    def test_deactivated_technician_is_not_picked(self):
+        self.open_request(self.techs[1], hours=Decimal('5'))
+        self.open_request(self.techs[2], hours=Decimal('5'))
+        self.assertEqual(pick_technician(self.team), self.techs[0])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.techs[0].is_active = False
+            self.techs[0].save()
+        self.assertIn(pick_technician(self.team), self.techs[1:])
+
+    def test_stale_heap_is_rechecked_before_assigning(self):
+        self.open_request(self.techs[1], hours=Decimal('5'))
+        self.open_request(self.techs[2], hours=Decimal('5'))
+        self.assertEqual(pick_technician(self.team), self.techs[0])
+        # As if another process deactivated the account: no signal reaches this index.
+        User.objects.filter(pk=self.techs[0].pk).update(is_active=False)
+        self.assertIn(pick_technician(self.team), self.techs[1:])
+
+    def test_membership_change_rebuilds_team_heap(self):
+        self.open_request(self.techs[1], hours=Decimal('5'))
+        self.open_request(self.techs[2], hours=Decimal('5'))
+        self.assertEqual(pick_technician(self.team), self.techs[0])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.team.members.remove(self.techs[0])
+        self.assertIn(pick_technician(self.team), self.techs[1:])
+
+    def test_rebalance_spreads_new_backlog(self):
+        for hours in ('8', '6', '4', '2'):
+            self.open_request(self.techs[0], hours=Decimal(hours))
+        self.open_request(self.techs[1], hours=Decimal('5'), status=MaintenanceRequest.Status.IN_PROGRESS)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/teams/{self.team.pk}/rebalance/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['requests'], 4)
+        loads = current_loads([tech.pk for tech in self.techs])
+        self.assertEqual(sorted(hours for hours, _ in loads.values()), [Decimal('8'), Decimal('8'), Decimal('9')])
+        # The in-progress request stays where it is.
+        self.assertTrue(MaintenanceRequest.objects.filter(
+            assigned_technician=self.techs[1], status=MaintenanceRequest.Status.IN_PROGRESS
+        ).exists())
+        # A second run has nothing left to improve.
+        self.assertEqual(self.client.post(f'/teams/{self.team.pk}/rebalance/').data['reassigned'], 0)
+
+    def test_rebalance_requires_manager(self):
+        self.assertEqual(self.client_for(self.tech).post(f'/teams/{self.team.pk}/rebalance/').status_code, 403)
+
+
+class DeltaSyncTests(TenantTestCase):
+    client_user = 'user'
+
+    def sync(self, cursor=None, **params):
+        if cursor:
+            params['cursor'] = cursor
+        return self.client.get('/maintenance/sync/', params)
+
+    def new_request(self, subject):
+        return self.create_request(subject=subject, created_by=self.user)
+
+    def encoded(self, payload):
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    def test_full_then_incremental(self):
+        first = self.new_request("First")
+        data = self.sync().data
+        self.assertEqual([row['id'] for row in data['requests']], [first.pk])
+        self.assertEqual([row['id'] for row in data['equipment']], [self.equipment.pk])
+        self.assertFalse(data['has_more'])
+
+        self.assertEqual(self.sync(data['cursor']).data['requests'], [])
+        first.subject = "First, edited"
+        first.save()
+        second = self.new_request("Second")
+        changed = self.sync(data['cursor']).data
+        self.assertEqual([row['id'] for row in changed['requests']], [first.pk, second.pk])
+
+    def test_deletions_are_reported_by_id(self):
+        doomed = self.new_request("Doomed")
+        cursor = self.sync().data['cursor']
+        doomed_id = doomed.pk
+        doomed.delete()
+        self.assertEqual(self.sync(cursor).data['deleted']['maintenancerequest'], [doomed_id])
+
+    def test_pages_with_has_more(self):
+        created = [self.new_request(f"R{i}").pk for i in range(5)]
+        seen, cursor = [], None
+        for _ in range(5):
+            data = self.sync(cursor, limit=2).data
+            seen += [row['id'] for row in data['requests']]
+            cursor = data['cursor']
+            if not data['has_more']:
+                break
+        self.assertEqual(seen, created)
+
+    def test_rows_committed_late_are_not_skipped(self):
+        cursor = self.sync().data['cursor']
+        late = self.new_request("Long transaction")
+        # As if its transaction had stayed open for an hour after updated_at was taken.
+        MaintenanceRequest.objects.filter(pk=late.pk).update_untracked(
+            updated_at=timezone.now() - datetime.timedelta(hours=1)
+        )
+        self.assertEqual([row['id'] for row in self.sync(cursor).data['requests']], [late.pk])
+
+    def test_bulk_writes_carry_new_versions(self):
+        request = self.new_request("Bulk")
+        cursor = self.sync().data['cursor']
+        MaintenanceRequest.objects.filter(pk=request.pk).update(status=MaintenanceRequest.Status.IN_PROGRESS)
+        self.create_equipment("Imported", sync_version=0)  # save() stamps it regardless
+        data = self.sync(cursor).data
+        self.assertEqual([row['id'] for row in data['requests']], [request.pk])
+        self.assertEqual([row['name'] for row in data['equipment']], ["Imported"])
+
+    def test_malformed_cursors_are_rejected(self):
+        issued = timezone.now().isoformat()
+        naive = datetime.datetime(2026, 1, 1, 12, 0).isoformat()
+        for cursor in (
+            "not-base64!", self.encoded(["list"]), self.encoded({'issued': "yesterday"}),
+            self.encoded({'issued': naive}), self.encoded({'issued': issued, 'requests': [naive, 1]}),
+            self.encoded({'issued': issued, 'requests': [1]}), self.encoded({'issued': issued, 'deleted': [True, 1]}),
+        ):
+            response = self.sync(cursor)
+            self.assertEqual(response.status_code, 400, cursor)
+            self.assertIn('cursor', response.data)
+
+    def test_cursor_older_than_tombstone_retention_is_gone(self):
+        old = timezone.now() - datetime.timedelta(days=31)
+        self.assertEqual(self.sync(self.encoded({'issued': old.isoformat()})).status_code, 410)
+
+    def test_timestamp_cursors_need_a_full_resync(self):
+        self.assertEqual(self.sync(self.encoded({'requests': [timezone.now().isoformat(), 1]})).status_code, 410)
+
+
+class DashboardCounterTests(TenantTestCase):
+    client_user = 'owner'
+
+    def setUp(self):
+        super().setUp()
+        # Build the counters row, as the first dashboard read does.
+        self.assertEqual(self.client.get('/maintenance/stats/').status_code, 200)
+
+    def stored(self):
+        return CompanyStats.objects.filter(pk=self.company.pk).values(*compute_company_stats(self.company.pk)).get()
+
+    def post_request(self, **data):
+        return self.client.post('/maintenance/', {
+            'subject': "Pressure drop", 'description': "-", 'equipment': self.equipment.pk,
+            'assigned_technician': self.tech.pk, **data
+        }, format='json')
+
+    def assertInSync(self):
+        self.assertEqual(self.stored(), compute_company_stats(self.company.pk))
+        self.assertEqual(
+            dict(TechnicianWorkload.objects.filter(company=self.company).values_list('technician_id', 'open_count')),
+            compute_technician_workload(self.company.pk),
+        )
+
+    def test_counters_follow_api_writes(self):
+        created = self.post_request()
+        self.assertEqual(created.status_code, 201, created.data)
+        detail = f"/maintenance/{created.data['id']}/"
+        self.assertEqual(self.client.get('/maintenance/stats/').data['counters']['open_requests'], 1)
+        self.assertInSync()
+
+        self.client.patch(detail, {'status': MaintenanceRequest.Status.REPAIRED, 'duration_hours': '2.00'}, format='json')
+        self.assertEqual(self.stored()['repaired_requests'], 1)
+        self.assertInSync()
+
+        self.client.delete(detail)
+        self.assertEqual(self.stored()['repaired_requests'], 0)
+        self.client.post('/equipment/', {
+            'name': "Spare", 'serial_number': "SPARE-1", 'department': "Plant", 'location': "Store",
+            'maintenance_team': self.team.pk,
+        }, format='json')
+        self.assertEqual(self.stored()['total_equipment'], 2)
+        self.assertInSync()
+
+    def test_failed_counter_update_rolls_back_the_write(self):
+        before = self.stored()
+        with mock.patch('apps.maintenance.stats.apply_workload_delta', side_effect=DatabaseError("lost")):
+            with self.assertRaises(DatabaseError):
+                self.post_request()
+        self.assertFalse(MaintenanceRequest.objects.exists())
+        self.assertEqual(self.stored(), before)
+
+        request = self.create_request(subject="Kept", assigned_technician=self.tech, created_by=self.owner)
+        with mock.patch('apps.maintenance.stats.apply_equipment_deltas', side_effect=DatabaseError("lost")):
+            with self.assertRaises(DatabaseError):
+                self.client.patch(f'/maintenance/{request.pk}/', {'status': MaintenanceRequest.Status.SCRAP}, format='json')
+        request.refresh_from_db()
+        self.assertEqual(request.status, MaintenanceRequest.Status.NEW)
+        self.assertInSync()
+
+    def test_rebuild_command_repairs_drift(self):
+        self.post_request()
+        CompanyStats.objects.filter(pk=self.company.pk).update(open_requests=9, total_teams=0)
+        TechnicianWorkload.objects.filter(technician=self.tech).update(open_count=4)
+        Equipment.objects.filter(pk=self.equipment.pk).update(open_request_count=3)
+
+        out = StringIO()
+        call_command('rebuild_company_stats', '--check', '--company', str(self.company.pk), stdout=out)
+        for drift in ("'open_requests': (9, 1)", f"'technician {self.tech.pk}': (4, 1)",
+                      f"'equipment {self.equipment.pk}': (3, 1)", "1 company(ies) out of sync."):
+            self.assertIn(drift, out.getvalue())
+        self.assertEqual(self.stored()['open_requests'], 9)
+
+        call_command('rebuild_company_stats', stdout=StringIO())
+        self.assertInSync()
+        self.assertEqual(Equipment.objects.get(pk=self.equipment.pk).open_request_count, 1)
+        out = StringIO()
+        call_command('rebuild_company_stats', '--check', stdout=out)
+        self.assertIn("0 company(ies) out of sync.", out.getvalue())
+
+
+class PreventivePlanTests(TenantTestCase):
+    today = datetime.date(2026, 3, 2)
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.plan = MaintenancePlan.objects.create(
+            name="Filter change", maintenance_team=cls.team, interval=1,
+            interval_unit=MaintenancePlan.IntervalUnit.WEEK, start_date=datetime.date(2026, 1, 5),
+            company=cls.company, created_by=cls.manager,
+        )
+
+    def run_plans(self, weeks):
+        return materialize_plans(
+            MaintenancePlan.objects.all(), self.today + datetime.timedelta(weeks=weeks), self.today
+        )
+
+    def dates(self, equipment):
+        return list(MaintenanceRequest.objects.filter(plan=self.plan, equipment=equipment).order_by(
+            'scheduled_date'
+        ).values_list('scheduled_date', flat=True))
+
+    def test_generates_the_window_once(self):
+        self.assertEqual(self.run_plans(weeks=4), 5)  # Mar 2 through Mar 30
+        self.assertEqual(self.dates(self.equipment)[0], datetime.date(2026, 3, 2))
+        self.assertEqual(self.run_plans(weeks=4), 0)
+        self.assertEqual(self.run_plans(weeks=6), 2)
+        self.plan.refresh_from_db()
+        self.assertEqual(self.plan.generated_until, self.today + datetime.timedelta(weeks=6))
+
+    def test_today_is_the_local_date(self):
+        with mock.patch('django.utils.timezone.localdate', return_value=self.today):
+            materialize_plans(MaintenancePlan.objects.all(), self.today + datetime.timedelta(weeks=1))
+        self.assertEqual(self.dates(self.equipment), [self.today, self.today + datetime.timedelta(weeks=1)])
+
+    def test_equipment_added_to_the_team_gets_the_generated_window(self):
+        self.run_plans(weeks=4)
+        boiler = self.create_equipment("Boiler")
+        self.assertEqual(self.run_plans(weeks=4), 5)
+        self.assertEqual(self.dates(boiler), self.dates(self.equipment))
+        self.assertEqual(self.run_plans(weeks=5), 2)
+        self.assertEqual(len(self.dates(boiler)), 6)
+
+    def test_schedule_change_regenerates_without_duplicates(self):
+        self.run_plans(weeks=4)
+        started = MaintenanceRequest.objects.filter(plan=self.plan).order_by('scheduled_date')[1]
+        started.status = MaintenanceRequest.Status.IN_PROGRESS
+        started.save()
+
+        with mock.patch('django.utils.timezone.localdate', return_value=self.today):
+            response = self.client.patch(f'/maintenance/plans/{self.plan.pk}/', {'start_date': '2026-01-06'}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(self.dates(self.equipment), [started.scheduled_date])
+
+        self.assertEqual(self.run_plans(weeks=4), 4)
+        self.assertEqual(self.dates(self.equipment), sorted(
+            [started.scheduled_date] + [datetime.date(2026, 3, 3) + datetime.timedelta(weeks=i) for i in range(4)]
+        ))
+
+
+class TrackedUpdateTests(TenantTestCase):
+    client_user = 'owner'
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.forklift = cls.equipment
+        cls.loader = cls.create_equipment("Loader")
+
+    def setUp(self):
+        workload_index.invalidate()
+        super().setUp()
+        self.client.get('/maintenance/stats/')  # build the counters row
+
+    def request_on(self, equipment, technician=None):
+        return self.create_request(equipment, subject="Worn", assigned_technician=technician, created_by=self.owner)
+
+    def assertCountersInSync(self):
+        self.assertEqual(
+            CompanyStats.objects.filter(pk=self.company.pk).values(*compute_company_stats(self.company.pk)).get(),
+            compute_company_stats(self.company.pk),
+        )
+        self.assertEqual(
+            dict(TechnicianWorkload.objects.filter(company=self.company).values_list('technician_id', 'open_count')),
+            compute_technician_workload(self.company.pk),
+        )
+        for equipment in (self.forklift, self.loader):
+            self.assertEqual(
+                Equipment.objects.get(pk=equipment.pk).open_request_count,
+                MaintenanceRequest.objects.filter(equipment=equipment, status__in=OPEN_STATUSES).count(),
+            )
+
+    def test_queryset_update_runs_the_scrap_hooks(self):
+        doomed = self.request_on(self.forklift, self.tech)
+        sibling = self.request_on(self.forklift, self.tech)
+        self.request_on(self.loader, self.tech)
+        with mock.patch('apps.maintenance.transitions.publish_on_commit') as publish:
+            updated = MaintenanceRequest.objects.filter(pk=doomed.pk).update(status=MaintenanceRequest.Status.SCRAP)
+        self.assertEqual(updated, 1)
+        self.assertTrue(Equipment.objects.get(pk=self.forklift.pk).is_scrapped)
+        self.assertFalse(Equipment.objects.get(pk=self.loader.pk).is_scrapped)
+        sibling.refresh_from_db()
+        self.assertEqual(sibling.status, MaintenanceRequest.Status.SCRAP)
+        self.assertGreater(sibling.updated_at, doomed.updated_at)
+        self.assertCountersInSync()
+        published = [call.args[1] for call in publish.call_args_list]
+        self.assertEqual(published.count('maintenancerequest.bulk_updated'), 2)
+        self.assertIn('equipment.bulk_updated', published)
+
+    def test_technician_update_moves_workload(self):
+        request = self.request_on(self.loader)
+        MaintenanceRequest.objects.filter(pk=request.pk).update(assigned_technician=self.tech)
+        self.assertCountersInSync()
+        self.assertEqual(current_loads([self.tech.pk])[self.tech.pk][1], 1)
+
+    def test_untracked_update_stays_a_single_statement(self):
+        request = self.request_on(self.loader)
+        with self.assertNumQueries(1):
+            MaintenanceRequest.objects.filter(pk=request.pk).update(subject="Renamed")
+
+    def test_bulk_transition_counts_once(self):
+        requests = [self.request_on(self.loader, self.tech) for _ in range(3)]
+        response = self.client.post('/maintenance/bulk-transition/', {'transitions': [
+            {'id': requests[0].pk, 'status': MaintenanceRequest.Status.REPAIRED, 'duration_hours': '2.00'},
+            {'id': requests[1].pk, 'status': MaintenanceRequest.Status.IN_PROGRESS},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertCountersInSync()
+
+        response = self.client.post('/maintenance/bulk-transition/', {'transitions': [
+            {'id': requests[1].pk, 'status': MaintenanceRequest.Status.SCRAP},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(
+            set(MaintenanceRequest.objects.filter(equipment=self.loader).values_list('status', flat=True)),
+            {MaintenanceRequest.Status.REPAIRED, MaintenanceRequest.Status.SCRAP},
+        )
+        self.assertCountersInSync()
+
+
+class BulkTransitionTests(TenantTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.timed, cls.untimed = [
+            cls.create_request(subject=subject, duration_hours=hours)
+            for subject, hours in (("Belt", Decimal('3.00')), ("Roller", None))
+        ]
+        cls.foreign = cls.create_request(cls.other_equipment, subject="Not ours")
+
+    def transition(self, *transitions):
+        return self.client.post('/maintenance/bulk-transition/', {'transitions': list(transitions)}, format='json')
+
+    def statuses(self):
+        return dict(MaintenanceRequest.objects.values_list('id', 'status'))
+
+    def test_applies_every_transition(self):
+        response = self.transition(
+            {'id': self.timed.pk, 'status': MaintenanceRequest.Status.REPAIRED},
+            {'id': self.untimed.pk, 'status': MaintenanceRequest.Status.REPAIRED, 'duration_hours': '0.50'},
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data, {"updated": 2})
+        self.untimed.refresh_from_db()
+        self.assertEqual((self.untimed.status, self.untimed.duration_hours), ('REPAIRED', Decimal('0.50')))
+
+    def test_errors_are_keyed_by_id_and_nothing_is_applied(self):
+        before = self.statuses()
+        response = self.transition(
+            {'id': self.timed.pk, 'status': MaintenanceRequest.Status.IN_PROGRESS},
+            {'id': self.untimed.pk, 'status': MaintenanceRequest.Status.REPAIRED},
+            {'id': self.foreign.pk, 'status': MaintenanceRequest.Status.REPAIRED},
+            {'id': 999999, 'status': MaintenanceRequest.Status.NEW},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {"transitions": {
+            str(self.untimed.pk): {"duration_hours": ["Required when status is Repaired."]},
+            str(self.foreign.pk): {"id": ["Not found."]},
+            "999999": {"id": ["Not found."]},
+        }})
+        self.assertEqual(self.statuses(), before)
+
+    def test_rejects_malformed_bodies(self):
+        self.assertEqual(self.transition().data, {"transitions": ["This list may not be empty."]})
+        response = self.transition(
+            {'id': self.timed.pk, 'status': 'DONE'}, {'status': MaintenanceRequest.Status.NEW}, "not an entry",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {"transitions": {
+            str(self.timed.pk): {"status": ['"DONE" is not a valid choice.']},
+            "#1": {"id": ["This field is required."]},
+            "#2": {"non_field_errors": ["Invalid data. Expected a dictionary, but got str."]},
+        }})
+
+    def test_duplicate_ids_are_keyed_by_id(self):
+        before = self.statuses()
+        duplicate = {'id': self.timed.pk, 'status': MaintenanceRequest.Status.IN_PROGRESS}
+        response = self.transition(duplicate, {'id': self.untimed.pk, 'status': 'NEW'}, duplicate)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {"transitions": {
+            str(self.timed.pk): {"id": ["Each request may appear only once."]},
+        }})
+        self.assertEqual(self.statuses(), before)
+
+
+class KanbanBoardTests(TenantTestCase):
+    def setUp(self):
+        super().setUp()
+        self.team.members.set([self.tech])
+        self.board()  # builds the counters row the ETag reads
+
+    def board(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/maintenance/kanban/')
+        self.assertEqual(response.status_code, 200)
+        return response.data, len(queries)
+
+    def test_cards_are_bucketed_by_status(self):
+        new = self.create_request(subject="Belt", assigned_technician=self.tech, maintenance_team=self.team)
+        repaired = self.create_request(subject="Gasket", status=MaintenanceRequest.Status.REPAIRED)
+        self.create_request(self.other_equipment, subject="Not ours", created_by=self.other_tech)
+
+        data, _ = self.board()
+        self.assertEqual(list(data), MaintenanceRequest.Status.values)
+        self.assertEqual([card['id'] for card in data['NEW']], [new.pk])
+        self.assertEqual([card['id'] for card in data['REPAIRED']], [repaired.pk])
+        self.assertEqual((data['IN_PROGRESS'], data['SCRAP']), ([], []))
+        card = data['NEW'][0]
+        self.assertEqual(
+            (card['equipment_name'], card['maintenance_team_name'], card['assigned_technician_name']),
+            ("Press", "Crew", "Tech"),
+        )
+        self.assertNotIn('equipment_details', card)
+        self.assertNotIn('description', card)
+
+    def test_query_count_does_not_grow_with_the_cards(self):
+        self.create_request(assigned_technician=self.tech, maintenance_team=self.team)
+        _, one_card = self.board()
+        for subject in ("Belt", "Gasket", "Roller", "Bearing"):
+            self.create_request(
+                self.create_equipment(subject), subject=subject, assigned_technician=self.tech, maintenance_team=self.team
+            )
+        data, five_cards = self.board()
+        self.assertEqual(len(data['NEW']), 5)
+        self.assertEqual(five_cards, one_card)
+
+
+class ExportTests(TenantTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.old = cls.create_request(subject="Old, \"quoted\"", duration_hours=Decimal('1.50'))
+        MaintenanceRequest.objects.filter(pk=cls.old.pk).update_untracked(
+            created_at=datetime.datetime(2020, 1, 1, 8, 0, tzinfo=datetime.timezone.utc)
+        )
+        cls.repaired = cls.create_request(
+            subject="Belt", status=MaintenanceRequest.Status.REPAIRED, duration_hours=Decimal('2.00'),
+        )
+        cls.new = [cls.create_request(subject=f"Open {number}") for number in range(3)]
+        cls.create_request(cls.other_equipment, subject="Not ours", created_by=cls.other_tech)
+
+    def export(self, query=''):
+        response = self.client.get(f'/maintenance/export/{query}')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_has_every_column_and_row(self):
+        rows = list(csv.reader(StringIO(self.export())))
+        self.assertEqual(rows[0], [name for name, _ in EXPORT_COLUMNS])
+        self.assertEqual([int(row[0]) for row in rows[1:]], sorted(r.pk for r in [self.old, self.repaired, *self.new]))
+        old = dict(zip(rows[0], rows[1]))
+        self.assertEqual(
+            (old['created_at'], old['subject'], old['duration_hours'], old['equipment_name'], old['created_by']),
+            ("2020-01-01T08:00:00Z", 'Old, "quoted"', "1.50", "Press", "Manager"),
+        )
+
+    def test_ndjson_with_filters(self):
+        lines = self.export('?export_format=ndjson&status=REPAIRED,NEW&start=2021-01-01').splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual([row['id'] for row in rows], sorted(r.pk for r in [self.repaired, *self.new]))
+        self.assertEqual(rows[0]['duration_hours'], "2.00")
+        self.assertEqual(
+            [json.loads(line)['id'] for line in self.export('?export_format=ndjson&end=2020-01-01').splitlines()],
+            [self.old.pk],
+        )
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_rows_are_read_in_chunks(self):
+        with self.assertNumQueries(4):  # 2 + 2 + 1 rows, then an empty chunk
+            self.assertEqual(len(self.export('?export_format=ndjson').splitlines()), 5)
+
+    def test_invalid_parameters_are_rejected(self):
+        self.assertEqual(self.client.get('/maintenance/export/?export_format=xml').data,
+                         {"export_format": ["Must be 'csv' or 'ndjson'."]})
+        response = self.client.get('/maintenance/export/?start=yesterday&status=DONE')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data), {'start', 'status'})
+
+
+class ConditionalGetTests(TenantTestCase):
+    PATHS = ('/maintenance/kanban/', '/maintenance/calendar/', '/equipment/', '/maintenance/stats/')
+
+    def setUp(self):
+        super().setUp()
+        self.client.get('/maintenance/stats/')  # builds the counters row the ETag reads
+        self.create_request()
+
+    def etags(self):
+        etags = {}
+        for path in self.PATHS:
+            response = self.client.get(path)
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.has_header('Last-Modified'))
+            etags[path] = response['ETag']
+        return etags
+
+    def test_unchanged_data_is_a_304_before_the_main_query(self):
+        for path, etag in self.etags().items():
+            with self.subTest(path=path), self.assertNumQueries(2):  # the change token only
+                response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(set(self.etags().values())), len(self.PATHS))
+
+    def test_tenant_changes_move_the_etag(self):
+        before = self.etags()
+        self.create_request(self.other_equipment, created_by=self.other_tech)
+        self.create_equipment("Spare", team=self.other_team)
+        self.assertEqual(self.etags(), before)
+
+        for change in (
+            lambda: self.create_request(subject="Leak"),
+            lambda: self.create_equipment("Spare"),
+            lambda: MaintenanceRequest.objects.filter(company=self.company).first().delete(),
+        ):
+            change()
+            after = self.etags()
+            for path in self.PATHS:
+                self.assertNotEqual(after[path], before[path])
+                self.assertEqual(self.client.get(path, HTTP_IF_NONE_MATCH=before[path]).status_code, 200)
+            before = after
+
+
+class DashboardAggregateTests(TenantTestCase):
+    client_user = 'owner'
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        Status, Type = MaintenanceRequest.Status, MaintenanceRequest.Type
+        # Scrapping closes the equipment's open requests, so it gets equipment of its own.
+        scrapped = cls.create_equipment("Old press")
+        for equipment, status, request_type in (
+            (cls.equipment, Status.NEW, Type.CORRECTIVE), (cls.equipment, Status.NEW, Type.PREVENTIVE),
+            (cls.equipment, Status.IN_PROGRESS, Type.CORRECTIVE), (cls.equipment, Status.REPAIRED, Type.CORRECTIVE),
+            (scrapped, Status.SCRAP, Type.PREVENTIVE),
+        ):
+            cls.create_request(
+                equipment, status=status, request_type=request_type, assigned_technician=cls.tech,
+                scheduled_date=datetime.date(2026, 6, 1), duration_hours=Decimal('1.00'),
+            )
+        cls.create_request(cls.other_equipment, created_by=cls.other_tech)
+
+    def test_counters_come_from_two_queries(self):
+        with self.assertNumQueries(2):
+            counters = compute_company_stats(self.company.pk)
+        self.assertEqual(counters, {
+            'total_equipment': 2, 'total_teams': 1, 'total_employees': 4, 'open_requests': 3,
+            'new_requests': 2, 'in_progress_requests': 1, 'repaired_requests': 1, 'scrap_requests': 1,
+            'corrective_requests': 3, 'preventive_requests': 2,
+        })
+
+    def test_dashboard_reports_non_empty_buckets(self):
+        data = self.client.get('/maintenance/stats/').data
+        self.assertEqual(data['counters'], {
+            'total_equipment': 2, 'total_teams': 1, 'total_employees': 4, 'open_requests': 3,
+        })
+        self.assertEqual(data['status_distribution'], {'NEW': 2, 'IN_PROGRESS': 1, 'REPAIRED': 1, 'SCRAP': 1})
+        self.assertEqual(data['type_distribution'], {'CORRECTIVE': 3, 'PREVENTIVE': 2})
+        self.assertEqual(data['technician_workload'], [{'name': "Tech", 'count': 3}])
@@ -0,0 +1,101 @@
+"""
+Side effects of request state changes made in bulk.
+
+MaintenanceRequestQuerySet.update (and so bulk_update) routes updates of the
+tracked fields through update_tracked, which hands the same (old_state,
+new_state) pairs as post_save to apply_request_changes and the transition
+hooks, so no write path can skip them. Each hook runs a fixed number of
+set-based statements per batch.
+"""
+from django.db import transaction
+from django.utils import timezone
+from apps.core.events import publish_on_commit
+from apps.equipment.models import Equipment
+from .models import MaintenanceRequest
+from .stats import OPEN_STATUSES, REQUEST_STATE_FIELDS, apply_request_changes, bump_version
+from .versions import take_versions, version_expression
+
+STATUS = REQUEST_STATE_FIELDS.index('status')
+COMPANY = REQUEST_STATE_FIELDS.index('company_id')
+EQUIPMENT = REQUEST_STATE_FIELDS.index('equipment_id')
+
+def entered_status(changes, status):
+    """The new states of the changes that moved a request into ``status``."""
+    return [
+        new_state for old_state, new_state in changes
+        if new_state is not None and new_state[STATUS] == status
+        and (old_state is None or old_state[STATUS] != status)
+    ]
+
+def tracks(fields):
+    """Whether updating ``fields`` (field names or attnames) can change a request's tracked state."""
+    return any(MaintenanceRequest._meta.get_field(name).attname in REQUEST_STATE_FIELDS for name in fields)
+
+def update_tracked(queryset, fields, now=None, propagate=True):
+    """
+    ``queryset.update(**fields)`` that keeps the counters, technician loads,
+    push subscribers, delta sync (sync_version) and, unless ``propagate`` is
+    false, the transition hooks in step. Returns the number of rows updated.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        # Change versions are taken before the rows they stamp are locked (see versions.py).
+        versions = take_versions(queryset.order_by().values_list('company_id', flat=True).distinct())
+        rows = list(queryset.select_for_update().values_list('id', *REQUEST_STATE_FIELDS))
+        if not rows:
+            return 0
+        versions.update(take_versions({row[1 + COMPANY] for row in rows} - versions.keys()))
+        ids = [row[0] for row in rows]
+        updated = MaintenanceRequest.objects.filter(id__in=ids).update_untracked(
+            **{'updated_at': now, 'sync_version': version_expression(versions), **fields}
+        )
+        new_states = {
+            row[0]: tuple(row[1:])
+            for row in MaintenanceRequest.objects.filter(id__in=ids).values_list('id', *REQUEST_STATE_FIELDS)
+        }
+        changes = [(tuple(state), new_states[request_id]) for request_id, *state in rows]
+        apply_request_changes(changes)
+        if 'status' in fields:
+            _publish_status_changes(ids, changes)
+        if propagate:
+            propagate_scrap(changes, now)
+    return updated
+
+def _publish_status_changes(ids, changes):
+    per_company = {}
+    for request_id, (old_state, new_state) in zip(ids, changes):
+        per_company.setdefault(old_state[COMPANY], []).append({"id": request_id, "status": new_state[STATUS]})
+    for company_id, items in per_company.items():
+        publish_on_commit(company_id, 'maintenancerequest.bulk_updated', changes=items)
+
+def propagate_scrap(changes, now=None):
+    """
+    Scrap the equipment of requests that entered SCRAP, with one conditional
+    UPDATE, and close (SCRAP) the other open requests on that equipment.
+    Returns the number of equipment rows scrapped.
+    """
+    companies = {state[EQUIPMENT]: state[COMPANY] for state in entered_status(changes, MaintenanceRequest.Status.SCRAP)}
+    if not companies:
+        return 0
+    return _scrap_equipment(companies, now or timezone.now())
+
+@transaction.atomic
+def _scrap_equipment(companies, now):
+    versions = take_versions(companies.values())
+    scrapped = Equipment.objects.filter(pk__in=companies, is_scrapped=False).update(
+        is_scrapped=True, updated_at=now, sync_version=version_expression(versions)
+    )
+    if scrapped:
+        per_company = {}
+        for equipment_id, company_id in companies.items():
+            per_company.setdefault(company_id, []).append(equipment_id)
+        for company_id, equipment_ids in per_company.items():
+            bump_version(company_id)
+            publish_on_commit(company_id, 'equipment.bulk_updated', ids=sorted(equipment_ids))
+
+    # The closed requests' equipment is scrapped already, so they are not propagated again.
+    update_tracked(
+        MaintenanceRequest.objects.filter(equipment_id__in=companies, status__in=OPEN_STATUSES),
+        {'status': MaintenanceRequest.Status.SCRAP}, now, propagate=False
+    )
+    return scrapped
@@ -1,8 +1,10 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import MaintenanceRequestViewSet, DashboardStatsView
+from .views import MaintenanceRequestViewSet, MaintenancePlanViewSet, DashboardStatsView
 
 router = DefaultRouter()
+# Registered before the requests so 'plans/' is not taken for a request id.
+router.register(r'plans', MaintenancePlanViewSet, basename='maintenanceplan')
 router.register(r'', MaintenanceRequestViewSet, basename='maintenancerequest')
 
 urlpatterns = [
@@ -0,0 +1,64 @@
+"""
+Commit-ordered change versions for delta sync.
+
+Every transaction that writes MaintenanceRequest, Equipment or Tombstone
+rows takes the next value of its company's SyncSequence and stamps it on them
+as sync_version. Taking it is an UPDATE of the sequence row, which stays
+locked until the transaction ends, so a company's versions commit in the
+order they were taken: a reader that can see version n can see every version
+below it, and a cursor holding the last version read never skips a row that
+commits later. An updated_at timestamp gives no such guarantee, since it is
+taken before a commit that may come much later.
+
+To avoid lock-order deadlocks, a transaction takes its versions before it
+locks any row it stamps or any CompanyStats row.
+"""
+from django.db import transaction
+from django.db.models import Case, F, PositiveBigIntegerField, Value, When
+from .models import SyncSequence
+
+def take_versions(company_ids):
+    """
+    Return {company_id: version}: the next change version of each company
+    (None is skipped). Must run inside the transaction that writes the rows
+    stamped with them. Sequences are locked in id order, so transactions
+    spanning several companies cannot deadlock on them.
+    """
+    if not transaction.get_connection().in_atomic_block:
+        raise transaction.TransactionManagementError(
+            "Change versions must be taken in the transaction that writes them."
+        )
+    versions = {}
+    for company_id in sorted({company_id for company_id in company_ids if company_id is not None}):
+        sequence = SyncSequence.objects.filter(pk=company_id)
+        if not sequence.update(value=F('value') + 1):
+            SyncSequence.objects.get_or_create(company_id=company_id)
+            sequence.update(value=F('value') + 1)
+        versions[company_id] = sequence.values_list('value', flat=True).get()
+    return versions
+
+def stamp(instances):
+    """Set sync_version on unsaved or about-to-be-saved instances (e.g. before bulk_create)."""
+    versions = take_versions(instance.company_id for instance in instances)
+    for instance in instances:
+        if instance.company_id in versions:
+            instance.sync_version = versions[instance.company_id]
+
+def version_expression(versions):
+    """Value for sync_version in a QuerySet.update: each row's company version from ``versions``."""
+    return Case(
+        *(When(company_id=company_id, then=Value(version)) for company_id, version in versions.items()),
+        default=F('sync_version'),
+        output_field=PositiveBigIntegerField(),
+    )
+
+def save_versioned(instance, save, *args, **kwargs):
+    """Run Model.save (``save``) for ``instance`` with a new sync_version, in one transaction."""
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None:
+        if not update_fields:
+            return save(*args, **kwargs)  # Django skips the save entirely
+        kwargs['update_fields'] = {*update_fields, 'sync_version'}
+    with transaction.atomic(using=kwargs.get('using')):
+        stamp([instance])
+        save(*args, **kwargs)
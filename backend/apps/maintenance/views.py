@@ -1,19 +1,30 @@
-from django.contrib.auth import get_user_model
-from apps.equipment.models import Equipment
-from apps.teams.models import MaintenanceTeam
+import datetime
 from rest_framework.views import APIView
-from django.db.models import Count, Q
+from django.conf import settings
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 from rest_framework.response import Response
-from rest_framework import permissions
+from rest_framework import permissions, status
 from rest_framework import viewsets
 from rest_framework.decorators import action
-from .models import MaintenanceRequest
-from .serializers import MaintenanceRequestSerializer
+from .models import MaintenanceRequest, MaintenancePlan
+from .serializers import (
+    MaintenanceRequestSerializer, MaintenanceRequestCardSerializer, BulkStatusTransitionSerializer,
+    MaintenancePlanSerializer
+)
+from .stats import get_dashboard_stats
+from .exports import iter_export_rows, stream_csv, stream_ndjson
+from .conditional import conditional_on_company
+from .sync import get_changes, InvalidCursor, ExpiredCursor
+from .plans import materialize_plans
 from apps.authx.permissions import IsOwnerOrManager
+from apps.core.eager_loading import EagerLoadingMixin
+from apps.core.projection import ValuesReadMixin
+from apps.core.transactions import AtomicWritesMixin
 
-User = get_user_model()
-
-class MaintenanceRequestViewSet(viewsets.ModelViewSet):
+class MaintenanceRequestViewSet(AtomicWritesMixin, EagerLoadingMixin, ValuesReadMixin, viewsets.ModelViewSet):
     serializer_class = MaintenanceRequestSerializer
 
     def get_permissions(self):
@@ -21,35 +32,34 @@ class MaintenanceRequestViewSet(viewsets.ModelViewSet):
             return [IsOwnerOrManager()]
         return [permissions.IsAuthenticated()]
 
+    def get_serializer_class(self):
+        if self.action == 'kanban':
+            return MaintenanceRequestCardSerializer
+        return MaintenanceRequestSerializer
+
     def get_queryset(self):
-        return MaintenanceRequest.objects.filter(company=self.request.user.company).order_by('-created_at')
+        queryset = MaintenanceRequest.objects.filter(company=self.request.user.company).order_by('-created_at')
+        return self.eager_load(queryset)
 
     def perform_create(self, serializer):
         serializer.save(company=self.request.user.company)
 
     @action(detail=False, methods=['get'])
+    @conditional_on_company
     def kanban(self, request):
         """
         Return grouped requests for Kanban board.
+        Built from a single joined query and bucketed by status in Python;
+        cards use the compact projection, details load on the detail endpoint.
         """
         qs = self.get_queryset()
-        data = {
-            "NEW": MaintenanceRequestSerializer(
-                qs.filter(status='NEW'), many=True
-            ).data,
-            "IN_PROGRESS": MaintenanceRequestSerializer(
-                qs.filter(status='IN_PROGRESS'), many=True
-            ).data,
-            "REPAIRED": MaintenanceRequestSerializer(
-                qs.filter(status='REPAIRED'), many=True
-            ).data,
-            "SCRAP": MaintenanceRequestSerializer(
-                qs.filter(status='SCRAP'), many=True
-            ).data,
-        }
+        data = {choice: [] for choice in MaintenanceRequest.Status.values}
+        for card in self.get_serializer(qs, many=True).data:
+            data[card['status']].append(card)
         return Response(data)
 
     @action(detail=False, methods=['get'])
+    @conditional_on_company
     def calendar(self, request):
         """
         Return Preventive requests for Calendar.
@@ -63,6 +73,10 @@ class MaintenanceRequestViewSet(viewsets.ModelViewSet):
         if end_date:
             qs = qs.filter(scheduled_date__lte=end_date)
             
+        page = self.paginate_queryset(qs)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
         serializer = self.get_serializer(qs, many=True)
         return Response(serializer.data)
 
@@ -72,6 +86,10 @@ class MaintenanceRequestViewSet(viewsets.ModelViewSet):
         Return only tasks assigned to the current technician.
         """
         qs = self.get_queryset().filter(assigned_technician=request.user)
+        page = self.paginate_queryset(qs)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
         serializer = self.get_serializer(qs, many=True)
         return Response(serializer.data)
 
@@ -81,47 +99,177 @@ class MaintenanceRequestViewSet(viewsets.ModelViewSet):
         Return only tasks created by the current user.
         """
         qs = self.get_queryset().filter(created_by=request.user)
+        page = self.paginate_queryset(qs)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
         serializer = self.get_serializer(qs, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['post'], url_path='bulk-transition')
+    def bulk_transition(self, request):
+        """
+        Move many requests to a new status at once.
+        Body: {"transitions": [{"id": 1, "status": "REPAIRED", "duration_hours": "1.5"}, ...]}
+        All transitions are validated first and applied together in one
+        transaction, or none are applied. Errors come back keyed by request id:
+        {"transitions": {"7": {"id": ["Not found."]}, "9": {"duration_hours": [...]}}}
+        (an entry without a valid id by its position, e.g. "#2"). A missing,
+        empty or non-list body is the only error that is a plain list:
+        {"transitions": ["This list may not be empty."]}
+        """
+        serializer = BulkStatusTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        transitions = {item['id']: item for item in serializer.validated_data['transitions']}
+
+        with transaction.atomic():
+            requests = list(
+                MaintenanceRequest.objects.select_for_update()
+                .filter(company=request.user.company, id__in=transitions)
+                .only('id', 'status', 'duration_hours', 'equipment_id', 'company_id', 'request_type', 'assigned_technician_id')
+            )
+            found = {obj.id for obj in requests}
+            # Keyed by request id, each entry shaped like a serializer's field errors.
+            errors = {
+                str(request_id): {"id": ["Not found."]} for request_id in transitions if request_id not in found
+            }
+            for obj in requests:
+                item = transitions[obj.id]
+                duration = item.get('duration_hours') or obj.duration_hours
+                if item['status'] == MaintenanceRequest.Status.REPAIRED and not duration:
+                    errors[str(obj.id)] = {"duration_hours": ["Required when status is Repaired."]}
+            if errors:
+                return Response({"transitions": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+            now = timezone.now()
+            for obj in requests:
+                item = transitions[obj.id]
+                obj.status = item['status']
+                if item.get('duration_hours') is not None:
+                    obj.duration_hours = item['duration_hours']
+                obj.updated_at = now
+            # The tracked update behind bulk_update keeps the counters, push
+            # subscribers and transition hooks in step.
+            MaintenanceRequest.objects.bulk_update(requests, ['status', 'duration_hours', 'updated_at'])
+
+        return Response({"updated": len(requests)})
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Stream the full request history as CSV (default) or NDJSON
+        (?export_format=ndjson), optionally filtered by creation date
+        (?start=YYYY-MM-DD&end=YYYY-MM-DD) and ?status=NEW,IN_PROGRESS.
+        """
+        export_format = request.query_params.get('export_format', 'csv')
+        if export_format not in ('csv', 'ndjson'):
+            return Response({"export_format": ["Must be 'csv' or 'ndjson'."]}, status=status.HTTP_400_BAD_REQUEST)
+
+        qs = MaintenanceRequest.objects.filter(company=request.user.company)
+        errors = {}
+        for param, lookup in (('start', 'created_at__date__gte'), ('end', 'created_at__date__lte')):
+            value = request.query_params.get(param)
+            if not value:
+                continue
+            date = parse_date(value)
+            if date is None:
+                errors[param] = ["Date has wrong format. Use YYYY-MM-DD."]
+            else:
+                qs = qs.filter(**{lookup: date})
+        statuses = [value for value in request.query_params.get('status', '').split(',') if value]
+        if statuses:
+            invalid = set(statuses) - set(MaintenanceRequest.Status.values)
+            if invalid:
+                errors['status'] = [f"Invalid status: {', '.join(sorted(invalid))}."]
+            qs = qs.filter(status__in=statuses)
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = iter_export_rows(qs, chunk_size=settings.EXPORT_CHUNK_SIZE)
+        if export_format == 'ndjson':
+            response = StreamingHttpResponse(stream_ndjson(rows), content_type='application/x-ndjson')
+        else:
+            response = StreamingHttpResponse(stream_csv(rows), content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="maintenance-history.{export_format}"'
+        return response
+
+    @action(detail=False, methods=['get'])
+    def sync(self, request):
+        """
+        Return requests and equipment created/updated since ?cursor=, the ids
+        deleted since then, and a new cursor. Omit the cursor for a full sync;
+        keep calling while "has_more" is true.
+        """
+        try:
+            limit = min(int(request.query_params.get('limit', settings.SYNC_PAGE_SIZE)), settings.SYNC_PAGE_SIZE)
+        except ValueError:
+            return Response({"limit": ["A valid integer is required."]}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            payload = get_changes(
+                request.user.company, request.query_params.get('cursor'), max(limit, 1),
+                context=self.get_serializer_context()
+            )
+        except InvalidCursor as e:
+            return Response({"cursor": [str(e)]}, status=status.HTTP_400_BAD_REQUEST)
+        except ExpiredCursor as e:
+            return Response({"cursor": [str(e)]}, status=status.HTTP_410_GONE)
+        return Response(payload)
+
+class MaintenancePlanViewSet(viewsets.ModelViewSet):
+    serializer_class = MaintenancePlanSerializer
+
+    SCHEDULE_FIELDS = ('equipment', 'maintenance_team', 'interval', 'interval_unit', 'start_date', 'end_date')
+
+    def get_permissions(self):
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'generate']:
+            return [IsOwnerOrManager()]
+        return [permissions.IsAuthenticated()]
+
+    def get_queryset(self):
+        return MaintenancePlan.objects.filter(company=self.request.user.company).order_by('-created_at')
+
+    def perform_create(self, serializer):
+        serializer.save(company=self.request.user.company, created_by=self.request.user)
+
+    def perform_update(self, serializer):
+        plan = serializer.instance
+        old_schedule = [getattr(plan, field) for field in self.SCHEDULE_FIELDS]
+        with transaction.atomic():
+            plan = serializer.save()
+            if [getattr(plan, field) for field in self.SCHEDULE_FIELDS] != old_schedule:
+                # Regenerate from scratch on the next run; untouched future occurrences go away.
+                self._delete_pending_occurrences(plan)
+                plan.generated_until = None
+                plan.save(update_fields=['generated_until'])
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            self._delete_pending_occurrences(instance)
+            instance.delete()
+
+    def _delete_pending_occurrences(self, plan):
+        plan.requests.filter(
+            status=MaintenanceRequest.Status.NEW, scheduled_date__gte=timezone.localdate()
+        ).delete()
+
+    @action(detail=True, methods=['post'])
+    def generate(self, request, pk=None):
+        """Materialize this plan's occurrences now, up to ?horizon_days= (default PREVENTIVE_PLAN_HORIZON_DAYS)."""
+        plan = self.get_object()
+        try:
+            horizon_days = int(request.query_params.get('horizon_days', settings.PREVENTIVE_PLAN_HORIZON_DAYS))
+        except ValueError:
+            return Response({"horizon_days": ["A valid integer is required."]}, status=status.HTTP_400_BAD_REQUEST)
+        horizon_days = min(max(horizon_days, 1), settings.PREVENTIVE_PLAN_MAX_HORIZON_DAYS)
+        today = timezone.localdate()
+        created = materialize_plans(
+            MaintenancePlan.objects.filter(pk=plan.pk), today + datetime.timedelta(days=horizon_days), today
+        )
+        return Response({"created": created})
+
 class DashboardStatsView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
+    @conditional_on_company
     def get(self, request):
-        company = request.user.company
-        
-        # 1. Counters
-        counters = {
-            "total_equipment": Equipment.objects.filter(company=company).count(),
-            "total_teams": MaintenanceTeam.objects.filter(company=company).count(),
-            "total_employees": User.objects.filter(company=company).count(),
-            "open_requests": MaintenanceRequest.objects.filter(
-                company=company, 
-                status__in=['NEW', 'IN_PROGRESS']
-            ).count(),
-        }
-
-        # 2. Status Distribution (for Pie/Doughnut Chart)
-        status_dist = MaintenanceRequest.objects.filter(company=company).values('status').annotate(count=Count('id'))
-        
-        # 3. Request Type Distribution (for Bar Chart)
-        type_dist = MaintenanceRequest.objects.filter(company=company).values('request_type').annotate(count=Count('id'))
-
-        # 4. Top Technicians by Workload (for Horizontal Bar Chart)
-        tech_workload = User.objects.filter(
-            company=company, 
-            role='TECHNICIAN'
-        ).annotate(
-            request_count=Count('assigned_requests', filter=Q(assigned_requests__status__in=['NEW', 'IN_PROGRESS']))
-        ).order_by('-request_count')[:5]
-
-        data = {
-            "counters": counters,
-            "status_distribution": {item['status']: item['count'] for item in status_dist},
-            "type_distribution": {item['request_type']: item['count'] for item in type_dist},
-            "technician_workload": [
-                {"name": tech.full_name, "count": tech.request_count} for tech in tech_workload
-            ]
-        }
-        
-        return Response(data)
+        return Response(get_dashboard_stats(request.user.company))
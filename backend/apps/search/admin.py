@@ -0,0 +1,13 @@
+from .indexes import SEARCH_INDEXES
+
+ADMIN_SEARCH_LIMIT = 1000
+
+class FullTextSearchAdminMixin:
+    """Answer the changelist search box from a full-text index instead of icontains scans."""
+    search_index = None
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        ids = [pk for pk, _ in SEARCH_INDEXES[self.search_index].search(search_term, limit=ADMIN_SEARCH_LIMIT)]
+        return queryset.filter(pk__in=ids), False
@@ -0,0 +1,140 @@
+"""
+Full-text indexes over equipment and maintenance requests.
+
+MySQL uses native FULLTEXT indexes. SQLite uses FTS5 external-content
+tables that mirror the base table's rowids and are kept in sync by triggers,
+so bulk_create and QuerySet.update stay indexed too. Both are created by the
+search app's migrations. Other databases fall back to unranked icontains
+filtering.
+
+SQLite applies most ALTERs by rebuilding the table, which drops its triggers
+without an error, so ensure_triggers() recreates any that are missing after
+every migrate.
+"""
+import re
+from django.apps import apps
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.models import Q
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+MAX_TOKENS = 10
+
+class SearchIndex:
+    def __init__(self, name, model_label, fields):
+        self.name = name
+        self.model_label = model_label
+        self.fields = fields
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    @property
+    def table(self):
+        return self.model._meta.db_table
+
+    # -- schema ------------------------------------------------------------
+    # The tables and indexes themselves are created by migrations.
+
+    def trigger_sql(self, vendor):
+        """{trigger name: CREATE TRIGGER statement} keeping the index in sync, if it needs any."""
+        if vendor != 'sqlite':
+            return {}
+        fields = ', '.join(self.fields)
+        new = ', '.join(f"new.{field}" for field in self.fields)
+        old = ', '.join(f"old.{field}" for field in self.fields)
+        insert = f"INSERT INTO {self.name}(rowid, {fields}) VALUES (new.id, {new});"
+        delete = f"INSERT INTO {self.name}({self.name}, rowid, {fields}) VALUES ('delete', old.id, {old});"
+        bodies = {
+            'ai': f"AFTER INSERT ON {self.table} BEGIN {insert} END",
+            'ad': f"AFTER DELETE ON {self.table} BEGIN {delete} END",
+            'au': f"AFTER UPDATE OF {fields} ON {self.table} BEGIN {delete} {insert} END",
+        }
+        return {
+            f"{self.name}_{suffix}": f"CREATE TRIGGER IF NOT EXISTS {self.name}_{suffix} {body}"
+            for suffix, body in bodies.items()
+        }
+
+    def rebuild_sql(self, vendor):
+        """Statement that rebuilds the index from the base table, if it needs one."""
+        if vendor == 'sqlite':
+            return f"INSERT INTO {self.name}({self.name}) VALUES ('rebuild')"
+        return None
+
+    # -- queries -----------------------------------------------------------
+
+    def search(self, text, company_id=None, limit=20):
+        """
+        Return [(pk, score)] for rows matching every word of ``text`` (as
+        prefixes), best first, limited to ``company_id`` unless it is None.
+        """
+        tokens = TOKEN_RE.findall(text)[:MAX_TOKENS]
+        if not tokens:
+            return []
+        vendor = connection.vendor
+        if vendor not in ('sqlite', 'mysql'):
+            return self._search_unindexed(tokens, company_id, limit)
+        company_filter = f" AND {self.table}.company_id = %s" if company_id is not None else ""
+        company_params = [company_id] if company_id is not None else []
+        if vendor == 'sqlite':
+            # bm25() is lower for better matches.
+            sql = (
+                f"SELECT {self.name}.rowid, -bm25({self.name}) FROM {self.name} "
+                f"JOIN {self.table} ON {self.table}.id = {self.name}.rowid "
+                f"WHERE {self.name} MATCH %s{company_filter} ORDER BY bm25({self.name}) LIMIT %s"
+            )
+            params = [' '.join(f'"{token}"*' for token in tokens), *company_params, limit]
+        else:
+            match = ' '.join(f'+{token}*' for token in tokens)
+            against = f"MATCH ({', '.join(self.fields)}) AGAINST (%s IN BOOLEAN MODE)"
+            sql = (
+                f"SELECT id, {against} AS score FROM {self.table} "
+                f"WHERE {against}{company_filter} ORDER BY score DESC LIMIT %s"
+            )
+            params = [match, match, *company_params, limit]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [(pk, float(score)) for pk, score in cursor.fetchall()]
+
+    def _search_unindexed(self, tokens, company_id, limit):
+        condition = Q()
+        for token in tokens:
+            condition &= Q(*(Q(**{f"{field}__icontains": token}) for field in self.fields), _connector=Q.OR)
+        queryset = self.model.objects.filter(condition)
+        if company_id is not None:
+            queryset = queryset.filter(company_id=company_id)
+        ids = queryset.order_by('-id').values_list('id', flat=True)
+        return [(pk, 0.0) for pk in ids[:limit]]
+
+SEARCH_INDEXES = {
+    'equipment': SearchIndex('search_equipment', 'equipment.Equipment', ('name', 'serial_number', 'location')),
+    'maintenance_requests': SearchIndex(
+        'search_maintenancerequest', 'maintenance.MaintenanceRequest', ('subject', 'description')
+    ),
+}
+
+def ensure_triggers(using=DEFAULT_DB_ALIAS):
+    """
+    Recreate any sync trigger missing from an index's base table and rebuild
+    that index, since writes made without the trigger never reached it.
+    Indexes not created yet (search not migrated) are skipped. Returns the
+    names of the indexes that were repaired.
+    """
+    db = connections[using]
+    repaired = []
+    with db.cursor() as cursor:
+        tables = set(db.introspection.table_names(cursor))
+        for index in SEARCH_INDEXES.values():
+            triggers = index.trigger_sql(db.vendor)
+            if not triggers or index.name not in tables:
+                continue
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s", [index.table])
+            existing = {name for name, in cursor.fetchall()}
+            missing = [sql for name, sql in triggers.items() if name not in existing]
+            if not missing:
+                continue
+            for sql in missing:
+                cursor.execute(sql)
+            cursor.execute(index.rebuild_sql(db.vendor))
+            repaired.append(index.name)
+    return repaired
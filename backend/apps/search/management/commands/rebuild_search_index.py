@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from apps.search.indexes import SEARCH_INDEXES, ensure_triggers
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search indexes from the base tables (SQLite FTS5 only; MySQL maintains its own)."
+
+    def handle(self, *args, **options):
+        for name in ensure_triggers():
+            self.stdout.write(self.style.WARNING(f"{name}: recreated missing triggers"))
+        rebuilt = 0
+        with connection.cursor() as cursor:
+            for name, index in SEARCH_INDEXES.items():
+                sql = index.rebuild_sql(connection.vendor)
+                if sql:
+                    cursor.execute(sql)
+                    rebuilt += 1
+                    self.stdout.write(f"{name}: rebuilt")
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} search index(es)."))
@@ -0,0 +1,81 @@
+from django.db import migrations
+
+# The index definitions as of this migration, inlined so later changes to
+# apps.search.indexes do not rewrite history; change them with a new migration.
+# Other databases have no index and search falls back to icontains filtering.
+CREATE_SQL = {
+    'mysql': [
+        "ALTER TABLE equipment_equipment ADD FULLTEXT INDEX search_equipment (name, serial_number, location)",
+        "ALTER TABLE maintenance_maintenancerequest ADD FULLTEXT INDEX search_maintenancerequest (subject, description)",
+    ],
+    'sqlite': [
+        # FTS5 external-content tables over the base tables' rowids, kept in
+        # sync by triggers so bulk_create and QuerySet.update stay indexed.
+        "CREATE VIRTUAL TABLE search_equipment USING fts5(name, serial_number, location, "
+        "content='equipment_equipment', content_rowid='id', prefix='2 3')",
+        "CREATE TRIGGER search_equipment_ai AFTER INSERT ON equipment_equipment BEGIN "
+        "INSERT INTO search_equipment(rowid, name, serial_number, location) "
+        "VALUES (new.id, new.name, new.serial_number, new.location); END",
+        "CREATE TRIGGER search_equipment_ad AFTER DELETE ON equipment_equipment BEGIN "
+        "INSERT INTO search_equipment(search_equipment, rowid, name, serial_number, location) "
+        "VALUES ('delete', old.id, old.name, old.serial_number, old.location); END",
+        "CREATE TRIGGER search_equipment_au AFTER UPDATE OF name, serial_number, location ON equipment_equipment BEGIN "
+        "INSERT INTO search_equipment(search_equipment, rowid, name, serial_number, location) "
+        "VALUES ('delete', old.id, old.name, old.serial_number, old.location); "
+        "INSERT INTO search_equipment(rowid, name, serial_number, location) "
+        "VALUES (new.id, new.name, new.serial_number, new.location); END",
+        "INSERT INTO search_equipment(search_equipment) VALUES ('rebuild')",
+
+        "CREATE VIRTUAL TABLE search_maintenancerequest USING fts5(subject, description, "
+        "content='maintenance_maintenancerequest', content_rowid='id', prefix='2 3')",
+        "CREATE TRIGGER search_maintenancerequest_ai AFTER INSERT ON maintenance_maintenancerequest BEGIN "
+        "INSERT INTO search_maintenancerequest(rowid, subject, description) "
+        "VALUES (new.id, new.subject, new.description); END",
+        "CREATE TRIGGER search_maintenancerequest_ad AFTER DELETE ON maintenance_maintenancerequest BEGIN "
+        "INSERT INTO search_maintenancerequest(search_maintenancerequest, rowid, subject, description) "
+        "VALUES ('delete', old.id, old.subject, old.description); END",
+        "CREATE TRIGGER search_maintenancerequest_au AFTER UPDATE OF subject, description "
+        "ON maintenance_maintenancerequest BEGIN "
+        "INSERT INTO search_maintenancerequest(search_maintenancerequest, rowid, subject, description) "
+        "VALUES ('delete', old.id, old.subject, old.description); "
+        "INSERT INTO search_maintenancerequest(rowid, subject, description) "
+        "VALUES (new.id, new.subject, new.description); END",
+        "INSERT INTO search_maintenancerequest(search_maintenancerequest) VALUES ('rebuild')",
+    ],
+}
+
+DROP_SQL = {
+    'mysql': [
+        "ALTER TABLE equipment_equipment DROP INDEX search_equipment",
+        "ALTER TABLE maintenance_maintenancerequest DROP INDEX search_maintenancerequest",
+    ],
+    'sqlite': [
+        f"DROP TRIGGER IF EXISTS {index}_{suffix}"
+        for index in ('search_equipment', 'search_maintenancerequest') for suffix in ('ai', 'ad', 'au')
+    ] + [
+        "DROP TABLE IF EXISTS search_equipment",
+        "DROP TABLE IF EXISTS search_maintenancerequest",
+    ],
+}
+
+
+def create_indexes(apps, schema_editor):
+    for sql in CREATE_SQL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def drop_indexes(apps, schema_editor):
+    for sql in DROP_SQL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0004_equipment_open_request_count'),
+        ('maintenance', '0006_request_counter_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations
+
+# maintenance 0007 rebuilds maintenance_maintenancerequest on SQLite, which
+# drops the triggers 0001 put on it. Recreate them (as of this migration) and
+# rebuild the index, since writes made in between never reached it.
+CREATE_SQL = {
+    'sqlite': [
+        "CREATE TRIGGER IF NOT EXISTS search_maintenancerequest_ai AFTER INSERT ON maintenance_maintenancerequest BEGIN "
+        "INSERT INTO search_maintenancerequest(rowid, subject, description) "
+        "VALUES (new.id, new.subject, new.description); END",
+        "CREATE TRIGGER IF NOT EXISTS search_maintenancerequest_ad AFTER DELETE ON maintenance_maintenancerequest BEGIN "
+        "INSERT INTO search_maintenancerequest(search_maintenancerequest, rowid, subject, description) "
+        "VALUES ('delete', old.id, old.subject, old.description); END",
+        "CREATE TRIGGER IF NOT EXISTS search_maintenancerequest_au AFTER UPDATE OF subject, description "
+        "ON maintenance_maintenancerequest BEGIN "
+        "INSERT INTO search_maintenancerequest(search_maintenancerequest, rowid, subject, description) "
+        "VALUES ('delete', old.id, old.subject, old.description); "
+        "INSERT INTO search_maintenancerequest(rowid, subject, description) "
+        "VALUES (new.id, new.subject, new.description); END",
+        "INSERT INTO search_maintenancerequest(search_maintenancerequest) VALUES ('rebuild')",
+    ],
+}
+
+
+def recreate_triggers(apps, schema_editor):
+    for sql in CREATE_SQL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_fulltext_indexes'),
+        ('maintenance', '0007_maintenance_plans'),
+    ]
+
+    operations = [
+        # Reversing leaves the triggers to 0001's reverse, which drops them.
+        migrations.RunPython(recreate_triggers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,2 @@
+# The index tables are created by migrations, not models. This module only
+# exists so that Django sends post_migrate for this app (see apps.py).
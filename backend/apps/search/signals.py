@@ -0,0 +1,5 @@
+from .indexes import ensure_triggers
+
+def recreate_search_triggers(sender, using, **kwargs):
+    # After every migrate: a migration that rebuilt a base table dropped its triggers.
+    ensure_triggers(using)
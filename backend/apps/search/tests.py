@@ -0,0 +1,78 @@
+from unittest import skipUnless
+from django.db import connection
+from apps.core.testing import TenantTestCase
+from apps.equipment.models import Equipment
+from .indexes import SEARCH_INDEXES, ensure_triggers
+
+
+@skipUnless(connection.vendor == 'sqlite', "FTS5 triggers are SQLite only")
+class SearchTriggerTests(TenantTestCase):
+    def triggers(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'search%%'")
+            return {name for name, in cursor.fetchall()}
+
+    def test_every_trigger_exists_after_migrate(self):
+        expected = set()
+        for index in SEARCH_INDEXES.values():
+            expected |= set(index.trigger_sql('sqlite'))
+        self.assertEqual(len(expected), 6)
+        self.assertEqual(self.triggers(), expected)
+        self.assertEqual(ensure_triggers(), [])
+
+    def test_dropped_triggers_are_recreated_and_the_index_rebuilt(self):
+        # What SQLite's table rebuild for an ALTER does to them.
+        with connection.cursor() as cursor:
+            for suffix in ('ai', 'ad', 'au'):
+                cursor.execute(f"DROP TRIGGER search_maintenancerequest_{suffix}")
+        missed = self.create_request(subject="Gearbox whine")
+
+        self.assertEqual(ensure_triggers(), ['search_maintenancerequest'])
+        index = SEARCH_INDEXES['maintenance_requests']
+        self.assertEqual([pk for pk, _ in index.search("gearbox", self.company.pk)], [missed.pk])
+        indexed = self.create_request(subject="Gearbox leak")
+        self.assertEqual({pk for pk, _ in index.search("gearbox", self.company.pk)}, {missed.pk, indexed.pk})
+
+
+class SearchViewTests(TenantTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.pump = cls.create_equipment("Hydraulic pump", serial_number="HP-1", location="Basement")
+        cls.leak = cls.create_request(cls.pump, subject="Hydraulic leak", description="Oil under the hydraulic pump")
+        cls.noise = cls.create_request(subject="Noise", description="Hydraulics sound rough")
+        cls.create_equipment("Hydraulic pump", team=cls.other_team)
+
+    def search(self, query):
+        response = self.client.get(f'/search/?{query}')
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def ids(self, hits):
+        return [hit['id'] for hit in hits]
+
+    def test_matches_every_word_as_a_prefix_best_first(self):
+        data = self.search('q=hydraul')
+        self.assertEqual(self.ids(data['equipment']), [self.pump.pk])
+        self.assertEqual(self.ids(data['maintenance_requests']), [self.leak.pk, self.noise.pk])
+        self.assertEqual(data['maintenance_requests'][0]['equipment_name'], "Hydraulic pump")
+        self.assertEqual(self.ids(self.search('q=hydraul+oil')['maintenance_requests']), [self.leak.pk])
+
+    def test_type_and_limit(self):
+        data = self.search('q=hydraul&type=maintenance_requests&limit=1')
+        self.assertEqual(set(data), {'query', 'maintenance_requests'})
+        self.assertEqual(self.ids(data['maintenance_requests']), [self.leak.pk])
+
+    def test_index_follows_updates_and_deletes(self):
+        Equipment.objects.filter(pk=self.pump.pk).update(name="Pneumatic pump")
+        self.assertEqual(self.ids(self.search('q=pneumatic')['equipment']), [self.pump.pk])
+        self.assertEqual(self.search('q=hydraul&type=equipment')['equipment'], [])
+        self.noise.delete()
+        self.assertEqual(self.ids(self.search('q=hydraul')['maintenance_requests']), [self.leak.pk])
+
+    def test_invalid_parameters_are_rejected(self):
+        for query, field in (('q=+', 'q'), ('q=pump&type=teams', 'type'), ('q=pump&limit=all', 'limit')):
+            with self.subTest(query=query):
+                response = self.client.get(f'/search/?{query}')
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(field, response.data)
@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.db.models import F
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .indexes import SEARCH_INDEXES
+
+RESULT_FIELDS = {
+    'equipment': {
+        'fields': ('id', 'name', 'serial_number', 'location', 'department', 'is_scrapped'),
+        'expressions': {},
+    },
+    'maintenance_requests': {
+        'fields': ('id', 'subject', 'status', 'request_type', 'equipment'),
+        'expressions': {'equipment_name': F('equipment__name')},
+    },
+}
+
+class SearchView(APIView):
+    """
+    Ranked full-text search over the company's equipment (name, serial
+    number, location) and maintenance requests (subject, description).
+    ?q= words to match (all of them, as prefixes), ?type=equipment or
+    maintenance_requests (default both), ?limit= results per type.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        text = request.query_params.get('q', '').strip()
+        if not text:
+            return Response({"q": ["This field is required."]}, status=status.HTTP_400_BAD_REQUEST)
+        types = [name for name in request.query_params.get('type', '').split(',') if name] or list(SEARCH_INDEXES)
+        unknown = [name for name in types if name not in SEARCH_INDEXES]
+        if unknown:
+            return Response(
+                {"type": [f"Unknown type(s): {', '.join(unknown)}. Choose from {', '.join(SEARCH_INDEXES)}."]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limit = int(request.query_params.get('limit', settings.SEARCH_RESULT_LIMIT))
+        except ValueError:
+            return Response({"limit": ["A valid integer is required."]}, status=status.HTTP_400_BAD_REQUEST)
+        limit = min(max(limit, 1), settings.SEARCH_MAX_RESULT_LIMIT)
+
+        company = request.user.company
+        results = {"query": text}
+        for name in types:
+            results[name] = self.search(name, text, company, limit) if company else []
+        return Response(results)
+
+    def search(self, name, text, company, limit):
+        index = SEARCH_INDEXES[name]
+        scores = dict(index.search(text, company.pk, limit))
+        if not scores:
+            return []
+        fields = RESULT_FIELDS[name]
+        rows = index.model.objects.filter(pk__in=scores).values(*fields['fields'], **fields['expressions'])
+        hits = [{**row, "score": round(scores[row['id']], 4)} for row in rows]
+        hits.sort(key=lambda hit: hit['score'], reverse=True)
+        return hits
@@ -2,10 +2,11 @@ from rest_framework import serializers
 from .models import MaintenanceTeam
 from apps.authx.serializers import UserSerializer
 from django.contrib.auth import get_user_model
+from apps.core.serializers import SparseFieldsMixin
 
 User = get_user_model()
 
-class MaintenanceTeamSerializer(serializers.ModelSerializer):
+class MaintenanceTeamSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     members_details = UserSerializer(source='members', many=True, read_only=True)
     members = serializers.PrimaryKeyRelatedField(
         many=True, 
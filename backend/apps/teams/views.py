@@ -1,20 +1,31 @@
 from apps.authx.permissions import IsOwnerOrManager
 from rest_framework import permissions
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from .models import MaintenanceTeam
 from .serializers import MaintenanceTeamSerializer
+from apps.core.eager_loading import EagerLoadingMixin
+from apps.core.transactions import AtomicWritesMixin
+from apps.maintenance.assignment import rebalance_team
 
-class MaintenanceTeamViewSet(viewsets.ModelViewSet):
+class MaintenanceTeamViewSet(AtomicWritesMixin, EagerLoadingMixin, viewsets.ModelViewSet):
     queryset = MaintenanceTeam.objects.all()
     serializer_class = MaintenanceTeamSerializer
     
     def get_permissions(self):
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'rebalance']:
             return [IsOwnerOrManager()]
         return [permissions.IsAuthenticated()]
     
     def get_queryset(self):
-        return MaintenanceTeam.objects.filter(company=self.request.user.company)
+        queryset = MaintenanceTeam.objects.filter(company=self.request.user.company)
+        return self.eager_load(queryset)
 
     def perform_create(self, serializer):
         serializer.save(company=self.request.user.company)
+
+    @action(detail=True, methods=['post'])
+    def rebalance(self, request, pk=None):
+        """Spread the team's NEW requests over its technicians by planned hours."""
+        return Response(rebalance_team(self.get_object()))
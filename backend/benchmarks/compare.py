@@ -0,0 +1,41 @@
+"""
+Compare two benchmark result files.
+
+    python -m benchmarks.compare benchmarks/results/old.json benchmarks/results/new.json
+"""
+import argparse
+import json
+
+
+def load(path):
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def change(old, new):
+    if not old:
+        return 'n/a'
+    return f"{(new - old) / old * 100:+.1f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    args = parser.parse_args()
+
+    baseline, candidate = load(args.baseline), load(args.candidate)
+    print(f"{'route':40} {'p50 old':>10} {'p50 new':>10} {'change':>8} {'queries':>13} {'bytes':>21}")
+    for name, new in candidate['routes'].items():
+        old = baseline['routes'].get(name)
+        if old is None:
+            print(f"{name:40} {'-':>10} {new['p50_ms']:>10} {'new':>8}")
+            continue
+        print(
+            f"{name:40} {old['p50_ms']:>10} {new['p50_ms']:>10} {change(old['p50_ms'], new['p50_ms']):>8} "
+            f"{old['queries']:>6}->{new['queries']:<6} {old['bytes']:>10}->{new['bytes']:<10}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Encode time and bytes on the wire for the largest API payloads.
+
+    python -m benchmarks.seed_tenant --scale 0.1     # once
+    python -m benchmarks.payloads
+
+For each endpoint the response data is rendered with DRF's JSONRenderer and
+with ORJSONRenderer (the outputs must be identical), then compressed with
+gzip and, if installed, brotli at the middleware's settings.
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from apps.authx.models import Company, User  # noqa: E402
+from apps.core.middleware import brotli  # noqa: E402
+from apps.core.renderers import ORJSONRenderer, orjson  # noqa: E402
+from benchmarks.seed_tenant import LARGE_TENANT  # noqa: E402
+
+ENDPOINTS = [
+    ('maintenance-list-500', '/maintenance/?page_size=500'),
+    ('maintenance-kanban', '/maintenance/kanban/'),
+    ('equipment-list-all', '/equipment/?all=1'),
+    ('teams-list', '/teams/?all=1'),
+    ('dashboard-stats', '/maintenance/stats/'),
+]
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+    return result, round(min(timings) * 1000, 2)
+
+def measure(client, path, repeat):
+    data = client.get(path, HTTP_ACCEPT_ENCODING='identity').data
+    drf, drf_ms = best_of(lambda: JSONRenderer().render(data), repeat)
+    fast, fast_ms = best_of(lambda: ORJSONRenderer().render(data), repeat)
+    result = {
+        'identical': drf == fast,
+        'drf_encode_ms': drf_ms,
+        'orjson_encode_ms': fast_ms,
+        'bytes': len(fast),
+        'gzip_bytes': len(gzip.compress(fast, compresslevel=6)),
+    }
+    if brotli is not None:
+        result['br_bytes'] = len(brotli.compress(fast, quality=settings.COMPRESSION_BROTLI_QUALITY))
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help="Encode runs per endpoint; the best one is reported.")
+    args = parser.parse_args()
+
+    if orjson is None:
+        sys.exit("orjson is not installed; ORJSONRenderer falls back to JSONRenderer.")
+    company = Company.objects.filter(name=LARGE_TENANT).first()
+    if company is None:
+        sys.exit("Benchmark database is empty; run `python -m benchmarks.seed_tenant` first.")
+    client = APIClient()
+    client.force_authenticate(User.objects.filter(company=company, role=User.Role.COMPANY_OWNER).first())
+
+    results = {name: measure(client, path, args.repeat) for name, path in ENDPOINTS}
+    print(json.dumps(results, indent=2))
+    if not all(result['identical'] for result in results.values()):
+        sys.exit("ORJSONRenderer output differs from JSONRenderer.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""
+Check primary/replica routing (apps.core.routers) on two SQLite files.
+
+    python -m benchmarks.seed_tenant --scale 0.1     # once
+    python -m benchmarks.replica
+
+The benchmark database is copied to BENCH_REPLICA_DB (default
+benchmarks/bench_replica.sqlite3), which then stands in for a replica that
+stopped replicating. The check asserts that safe-method requests read only
+from the replica, that writes and their request's reads go to the primary,
+that the writing user reads their own write from the primary until the pin
+expires, and that other users keep reading the replica meanwhile.
+
+The pin is carried by the client (cookie, or the X-DB-Pin header echoed by
+clients without cookies), so the check also replays it from a fresh client
+with no cookies, as a request landing on another worker would be, and from
+another user, whom it must not pin.
+"""
+import argparse
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+os.environ.setdefault('BENCH_REPLICA_DB', str(Path(__file__).resolve().parent / 'bench_replica.sqlite3'))
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import connections  # noqa: E402
+from django.test import override_settings  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from apps.authx.models import Company, User  # noqa: E402
+from apps.core.routers import PIN_HEADER  # noqa: E402
+from apps.maintenance.models import MaintenanceRequest  # noqa: E402
+from benchmarks.seed_tenant import LARGE_TENANT  # noqa: E402
+
+READ_PATHS = [
+    '/maintenance/stats/',
+    '/maintenance/?page_size=50',
+    '/maintenance/kanban/',
+    '/maintenance/calendar/',
+    '/equipment/',
+    '/teams/',
+]
+
+def copy_primary_to_replica():
+    connections.close_all()
+    shutil.copyfile(settings.DATABASES['default']['NAME'], settings.DATABASES['replica']['NAME'])
+
+def call(client, method, path, **kwargs):
+    """(response, queries on the primary, queries on the replica)"""
+    with CaptureQueriesContext(connections['default']) as primary, \
+            CaptureQueriesContext(connections['replica']) as replica:
+        response = getattr(client, method)(path, **kwargs)
+    return response, len(primary.captured_queries), len(replica.captured_queries)
+
+class Checker:
+    def __init__(self):
+        self.failures = 0
+
+    def expect(self, ok, label, response, primary, replica):
+        self.failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {response.status_code} {label}: "
+              f"primary={primary} replica={replica}", file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pin-seconds', type=int, default=2, help="REPLICA_PIN_SECONDS for the check.")
+    args = parser.parse_args()
+
+    company = Company.objects.filter(name=LARGE_TENANT).first()
+    if company is None:
+        sys.exit("Benchmark database is empty; run `python -m benchmarks.seed_tenant` first.")
+    owner = User.objects.filter(company=company, role=User.Role.COMPANY_OWNER).first()
+    other = User.objects.filter(company=company, role=User.Role.MANAGER).first()
+    target = MaintenanceRequest.objects.filter(company=company).order_by('-created_at').first()
+    copy_primary_to_replica()
+
+    clients = {}
+    for user in (owner, other):
+        clients[user.pk] = APIClient()
+        clients[user.pk].force_authenticate(user)
+    check = Checker()
+    detail = f'/maintenance/{target.pk}/'
+    subject = f"{target.subject} (edited {time.time():.0f})"
+
+    with override_settings(REPLICA_PIN_SECONDS=args.pin_seconds):
+        for path in READ_PATHS:
+            response, primary, replica = call(clients[owner.pk], 'get', path)
+            check.expect(response.status_code == 200 and primary == 0 and replica > 0, f"GET {path}",
+                         response, primary, replica)
+
+        response, primary, replica = call(clients[owner.pk], 'patch', detail, data={'subject': subject}, format='json')
+        check.expect(response.status_code == 200 and replica == 0 and response.has_header(PIN_HEADER),
+                     f"PATCH {detail}", response, primary, replica)
+        pin = response.get(PIN_HEADER)
+
+        response, primary, replica = call(clients[owner.pk], 'get', detail)
+        check.expect(response.data.get('subject') == subject and replica == 0,
+                     f"GET {detail} by the writer (pinned, sees the write)", response, primary, replica)
+
+        cookieless = APIClient()
+        cookieless.force_authenticate(owner)
+        response, primary, replica = call(cookieless, 'get', detail, headers={PIN_HEADER: pin})
+        check.expect(response.data.get('subject') == subject and replica == 0,
+                     f"GET {detail} by the writer with only the {PIN_HEADER} header", response, primary, replica)
+
+        response, primary, replica = call(clients[other.pk], 'get', detail)
+        check.expect(response.data.get('subject') != subject and primary == 0,
+                     f"GET {detail} by another user (replica, lagging)", response, primary, replica)
+
+        response, primary, replica = call(clients[other.pk], 'get', detail, headers={PIN_HEADER: pin})
+        check.expect(primary == 0, f"GET {detail} by another user replaying the writer's pin",
+                     response, primary, replica)
+
+        time.sleep(args.pin_seconds + 0.5)
+        response, primary, replica = call(clients[owner.pk], 'get', detail)
+        check.expect(primary == 0 and replica > 0, f"GET {detail} by the writer after the pin expired",
+                     response, primary, replica)
+
+    MaintenanceRequest.objects.filter(pk=target.pk).update(subject=target.subject)
+    if check.failures:
+        sys.exit(f"{check.failures} routing check(s) failed.")
+
+
+if __name__ == '__main__':
+    main()
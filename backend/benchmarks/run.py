@@ -0,0 +1,163 @@
+"""
+Time every API route against the seeded benchmark database.
+
+    python -m benchmarks.seed_tenant --scale 0.1     # once
+    python -m benchmarks.run --output benchmarks/results/$(git rev-parse --short HEAD).json
+
+Each route is called through the DRF test client as a user of the large
+tenant; p50/p95 latency, query count and response size are recorded.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.db.models import Count  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from apps.authx.models import Company, User  # noqa: E402
+from apps.equipment.models import Equipment  # noqa: E402
+from apps.maintenance.models import MaintenanceRequest  # noqa: E402
+from apps.teams.models import MaintenanceTeam  # noqa: E402
+from benchmarks.seed_tenant import LARGE_TENANT  # noqa: E402
+
+
+def build_routes(company):
+    """(name, path, role) for every GET route in config/urls.py, using ids from the tenant."""
+    equipment = Equipment.objects.filter(company=company).annotate(
+        requests=Count('maintenancerequest')
+    ).order_by('-requests').first()
+    request = MaintenanceRequest.objects.filter(company=company).order_by('-created_at').first()
+    team = MaintenanceTeam.objects.filter(company=company).first()
+    employee = User.objects.filter(company=company, role=User.Role.TECHNICIAN).first()
+    manager = User.objects.filter(company=company, role=User.Role.MANAGER).first()
+    return [
+        ('auth_me', '/auth/me/', 'owner'),
+        ('auth_roles', '/auth/roles/', 'owner'),
+        ('company_profile', '/auth/company/', 'owner'),
+        ('manager-list', '/auth/managers/', 'owner'),
+        ('manager-detail', f'/auth/managers/{manager.pk}/', 'owner'),
+        ('employee-list', '/auth/employees/', 'owner'),
+        ('employee-detail', f'/auth/employees/{employee.pk}/', 'owner'),
+        ('maintenanceteam-list', '/teams/', 'owner'),
+        ('maintenanceteam-detail', f'/teams/{team.pk}/', 'owner'),
+        ('equipment-list', '/equipment/', 'owner'),
+        ('equipment-list-all', '/equipment/?all=1', 'owner'),
+        ('equipment-detail', f'/equipment/{equipment.pk}/', 'owner'),
+        ('equipment-maintenance-requests', f'/equipment/{equipment.pk}/maintenance-requests/', 'owner'),
+        ('maintenancerequest-list', '/maintenance/', 'owner'),
+        ('maintenancerequest-detail', f'/maintenance/{request.pk}/', 'owner'),
+        ('maintenancerequest-kanban', '/maintenance/kanban/', 'owner'),
+        ('maintenancerequest-calendar', '/maintenance/calendar/', 'owner'),
+        ('maintenancerequest-calendar-month', '/maintenance/calendar/?start={month_start}&end={month_end}', 'owner'),
+        ('maintenancerequest-my-tasks', '/maintenance/my_tasks/', 'technician'),
+        ('maintenancerequest-my-reports', '/maintenance/my_reports/', 'owner'),
+        ('dashboard_stats', '/maintenance/stats/', 'owner'),
+    ]
+
+
+def percentile(samples, pct):
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method='inclusive')[pct - 1]
+
+
+def time_route(client, path, iterations, warmup):
+    for _ in range(warmup):
+        client.get(path)
+    timings = []
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            response = client.get(path)
+            elapsed = time.perf_counter() - started
+        timings.append(elapsed * 1000)
+    return {
+        'path': path,
+        'status': response.status_code,
+        'p50_ms': round(percentile(timings, 50), 2),
+        'p95_ms': round(percentile(timings, 95), 2),
+        'mean_ms': round(statistics.fmean(timings), 2),
+        'queries': len(ctx.captured_queries),
+        'bytes': len(response.content),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--only', action='append', help="Only run routes whose name contains this (repeatable).")
+    parser.add_argument('--output', help="Write the JSON results here (default: stdout).")
+    args = parser.parse_args()
+
+    company = Company.objects.filter(name=LARGE_TENANT).first()
+    if company is None:
+        sys.exit("Benchmark database is empty; run `python -m benchmarks.seed_tenant` first.")
+    clients = {}
+    for role, user_role in (('owner', User.Role.COMPANY_OWNER), ('technician', User.Role.TECHNICIAN)):
+        user = User.objects.filter(company=company, role=user_role).annotate(
+            tasks=Count('assigned_requests')
+        ).order_by('-tasks').first()
+        clients[role] = APIClient()
+        clients[role].force_authenticate(user)
+
+    latest = MaintenanceRequest.objects.filter(company=company, scheduled_date__isnull=False).latest('scheduled_date')
+    month_start = latest.scheduled_date.replace(day=1)
+    placeholders = {'month_start': month_start.isoformat(), 'month_end': latest.scheduled_date.isoformat()}
+
+    results = {}
+    for name, path, role in build_routes(company):
+        if args.only and not any(part in name for part in args.only):
+            continue
+        results[name] = time_route(clients[role], path.format(**placeholders), args.iterations, args.warmup)
+        print(f"{name:40} p50={results[name]['p50_ms']:>9}ms queries={results[name]['queries']:>5} "
+              f"bytes={results[name]['bytes']}", file=sys.stderr)
+
+    report = {
+        'meta': {
+            'revision': git_revision(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'iterations': args.iterations,
+            'tenant': {
+                'equipment': Equipment.objects.filter(company=company).count(),
+                'requests': MaintenanceRequest.objects.filter(company=company).count(),
+                'users': User.objects.filter(company=company).count(),
+                'teams': MaintenanceTeam.objects.filter(company=company).count(),
+            },
+        },
+        'routes': results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as fh:
+            fh.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
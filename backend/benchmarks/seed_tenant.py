@@ -0,0 +1,181 @@
+"""
+Bulk-generate a realistic large tenant (plus a few small ones) for benchmarks.
+
+    python -m benchmarks.seed_tenant --scale 1.0
+
+At scale 1.0 the large tenant has 50k equipment, 500k maintenance requests,
+300 technicians and 40 teams. Signals are bypassed by bulk_create, so the
+dashboard counters and equipment open request counts are rebuilt at the end.
+"""
+import argparse
+import contextlib
+import datetime
+import os
+import random
+import time
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.hashers import make_password  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import transaction  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from apps.authx.models import Company, User  # noqa: E402
+from apps.equipment.models import Equipment  # noqa: E402
+from apps.maintenance.models import MaintenanceRequest  # noqa: E402
+from apps.maintenance.stats import rebuild_company_stats  # noqa: E402
+from apps.teams.models import MaintenanceTeam  # noqa: E402
+
+BENCH_PASSWORD = 'benchmark-password'
+LARGE_TENANT = 'Bench Large Tenant'
+BATCH_SIZE = 5000
+
+BASE_SIZES = {
+    'equipment': 50_000,
+    'requests': 500_000,
+    'technicians': 300,
+    'teams': 40,
+    'users': 200,
+}
+
+DEPARTMENTS = ['Production', 'Logistics', 'Utilities', 'Packaging', 'Quality', 'Facilities']
+LOCATIONS = ['Plant A', 'Plant B', 'Warehouse', 'Dock 1', 'Dock 2', 'Workshop']
+SUBJECTS = ['Oil leak', 'Overheating', 'Belt replacement', 'Calibration', 'Noise inspection', 'Filter change']
+
+
+@contextlib.contextmanager
+def manual_timestamps(*models):
+    """Let bulk_create keep the spread-out created_at/updated_at values we generate."""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def scaled(scale):
+    return {key: max(1, int(value * scale)) for key, value in BASE_SIZES.items()}
+
+
+def seed_company(name, sizes, rng, password_hash, now):
+    company = Company.objects.create(name=name)
+    slug = name.lower().replace(' ', '-')
+
+    def user(index, role, prefix):
+        return User(
+            email=f"{prefix}{index}@{slug}.bench", full_name=f"{prefix.title()} {index}",
+            role=role, company=company, password=password_hash,
+            created_at=now - datetime.timedelta(days=rng.randint(0, 1000)),
+        )
+
+    users = [user(0, User.Role.COMPANY_OWNER, 'owner')]
+    users += [user(i, User.Role.MANAGER, 'manager') for i in range(max(1, sizes['users'] // 20))]
+    users += [user(i, User.Role.TECHNICIAN, 'tech') for i in range(sizes['technicians'])]
+    users += [user(i, User.Role.USER, 'user') for i in range(sizes['users'])]
+    User.objects.bulk_create(users, batch_size=BATCH_SIZE)
+    users = list(User.objects.filter(company=company))
+    technicians = [u for u in users if u.role == User.Role.TECHNICIAN]
+    reporters = [u for u in users if u.role != User.Role.TECHNICIAN]
+
+    MaintenanceTeam.objects.bulk_create([
+        MaintenanceTeam(name=f"Team {i}", company=company, created_at=now - datetime.timedelta(days=i))
+        for i in range(sizes['teams'])
+    ])
+    teams = list(MaintenanceTeam.objects.filter(company=company).order_by('id'))
+    Membership = MaintenanceTeam.members.through
+    Membership.objects.bulk_create([
+        Membership(maintenanceteam_id=teams[i % len(teams)].id, user_id=tech.id)
+        for i, tech in enumerate(technicians)
+    ], batch_size=BATCH_SIZE)
+    team_members = {team.id: [] for team in teams}
+    for i, tech in enumerate(technicians):
+        team_members[teams[i % len(teams)].id].append(tech)
+
+    equipment = []
+    for i in range(sizes['equipment']):
+        team = rng.choice(teams)
+        members = team_members[team.id]
+        created_at = now - datetime.timedelta(minutes=rng.randint(0, 2_000_000))
+        equipment.append(Equipment(
+            name=f"Asset {i}", serial_number=f"{slug}-SN-{i:07d}",
+            department=rng.choice(DEPARTMENTS), location=rng.choice(LOCATIONS),
+            maintenance_team=team, default_technician=rng.choice(members) if members else None,
+            company=company, is_scrapped=rng.random() < 0.01,
+            purchase_date=(now - datetime.timedelta(days=rng.randint(100, 3000))).date(),
+            created_at=created_at, updated_at=created_at,
+        ))
+    Equipment.objects.bulk_create(equipment, batch_size=BATCH_SIZE)
+    equipment = list(
+        Equipment.objects.filter(company=company).values_list('id', 'maintenance_team_id', 'default_technician_id')
+    )
+
+    statuses = [
+        (MaintenanceRequest.Status.REPAIRED, 0.7),
+        (MaintenanceRequest.Status.NEW, 0.12),
+        (MaintenanceRequest.Status.IN_PROGRESS, 0.15),
+        (MaintenanceRequest.Status.SCRAP, 0.03),
+    ]
+    status_values, status_weights = zip(*statuses)
+    remaining = sizes['requests']
+    while remaining:
+        batch = []
+        for _ in range(min(BATCH_SIZE, remaining)):
+            equipment_id, team_id, technician_id = rng.choice(equipment)
+            status = rng.choices(status_values, status_weights)[0]
+            preventive = rng.random() < 0.4
+            created_at = now - datetime.timedelta(minutes=rng.randint(0, 2_000_000))
+            batch.append(MaintenanceRequest(
+                request_type=MaintenanceRequest.Type.PREVENTIVE if preventive else MaintenanceRequest.Type.CORRECTIVE,
+                subject=rng.choice(SUBJECTS), description="Generated by the benchmark seeder.",
+                equipment_id=equipment_id, maintenance_team_id=team_id, assigned_technician_id=technician_id,
+                scheduled_date=(created_at + datetime.timedelta(days=rng.randint(1, 60))).date() if preventive else None,
+                duration_hours=rng.randint(1, 16) if status == MaintenanceRequest.Status.REPAIRED else None,
+                status=status, company=company, created_by=rng.choice(reporters),
+                created_at=created_at, updated_at=created_at,
+            ))
+        MaintenanceRequest.objects.bulk_create(batch)
+        remaining -= len(batch)
+
+    rebuild_company_stats(company.pk)
+    return company
+
+
+def seed(scale=1.0, small_tenants=3, seed_value=42):
+    rng = random.Random(seed_value)
+    password_hash = make_password(BENCH_PASSWORD)
+    now = timezone.now()
+    call_command('flush', interactive=False, verbosity=0)
+    with manual_timestamps(User, MaintenanceTeam, Equipment, MaintenanceRequest), transaction.atomic():
+        seed_company(LARGE_TENANT, scaled(scale), rng, password_hash, now)
+        for i in range(small_tenants):
+            seed_company(f"Bench Small Tenant {i}", scaled(scale / 100), rng, password_hash, now)
+        call_command('reconcile_open_request_counts', verbosity=0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=float, default=1.0, help="Multiplier for the large tenant size (default 1.0).")
+    parser.add_argument('--small-tenants', type=int, default=3, help="Number of small tenants sharing the tables.")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed.")
+    args = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    started = time.perf_counter()
+    seed(args.scale, args.small_tenants, args.seed)
+    print(f"Seeded scale {args.scale} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+Parity check and microbenchmark for the values() read path (apps.core.projection).
+
+    python -m benchmarks.seed_tenant --scale 0.1     # once
+    python -m benchmarks.serialization --check       # parity only
+    python -m benchmarks.serialization --rows 2000
+
+--check calls every GET list/retrieve variant of /maintenance/ and
+/equipment/ with FAST_READ_SERIALIZATION on and off and fails if any
+response body differs. The benchmark renders the same rows with the
+ModelSerializer (instances loaded with the view's eager loading) and with
+the projection, and reports rows/sec for both.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.test import override_settings  # noqa: E402
+from rest_framework.test import APIClient, APIRequestFactory  # noqa: E402
+from rest_framework.request import Request  # noqa: E402
+
+from apps.authx.models import Company, User  # noqa: E402
+from apps.core.eager_loading import eager_load  # noqa: E402
+from apps.core.projection import ValuesProjection  # noqa: E402
+from apps.equipment.models import Equipment  # noqa: E402
+from apps.equipment.serializers import EquipmentSerializer  # noqa: E402
+from apps.maintenance.models import MaintenanceRequest  # noqa: E402
+from apps.maintenance.serializers import MaintenanceRequestSerializer  # noqa: E402
+from benchmarks.seed_tenant import LARGE_TENANT  # noqa: E402
+
+VARIANTS = [
+    '',
+    '?page_size=500',
+    '?expand=',
+    '?expand=equipment_details',
+    '?expand=equipment_details.maintenance_team_details',
+    '?fields=id,subject,status,created_at,assigned_technician_details.full_name',
+    '?fields=id,name,open_request_count,maintenance_team_details.members_details.email',
+]
+
+def parity_paths(company):
+    request = MaintenanceRequest.objects.filter(company=company).order_by('-created_at').first()
+    unassigned = MaintenanceRequest.objects.filter(company=company, assigned_technician__isnull=True).first()
+    equipment = Equipment.objects.filter(company=company).order_by('-created_at').first()
+    paths = []
+    for variant in VARIANTS:
+        paths += [f'/maintenance/{variant}', f'/maintenance/{request.pk}/{variant}']
+        paths += [f'/equipment/{variant}', f'/equipment/{equipment.pk}/{variant}']
+    if unassigned is not None:
+        paths.append(f'/maintenance/{unassigned.pk}/')
+    paths += ['/maintenance/0/', '/equipment/?all=1&fields=id,name']
+    return paths
+
+def check_parity(client, paths):
+    failures = 0
+    for path in paths:
+        responses = []
+        for enabled in (False, True):
+            with override_settings(FAST_READ_SERIALIZATION=enabled):
+                response = client.get(path)
+            responses.append((response.status_code, response.content))
+        same = responses[0] == responses[1]
+        failures += not same
+        print(f"{'ok  ' if same else 'FAIL'} {responses[1][0]} {path}", file=sys.stderr)
+        if not same:
+            print(f"     drf:  {responses[0][1][:300]!r}\n     fast: {responses[1][1][:300]!r}", file=sys.stderr)
+    return failures
+
+def rows_per_second(render, rows, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        render()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return round(rows / best)
+
+def benchmark(company, user, rows, repeat):
+    http_request = APIRequestFactory().get('/')
+    http_request.user = user
+    context = {'request': Request(http_request)}
+    results = {}
+    for name, model, serializer_class in (
+        ('maintenance', MaintenanceRequest, MaintenanceRequestSerializer),
+        ('equipment', Equipment, EquipmentSerializer),
+    ):
+        queryset = model.objects.filter(company=company).order_by('-created_at')[:rows]
+        serializer = serializer_class(context=context)
+        projection = ValuesProjection.for_serializer(serializer)
+
+        def drf():
+            return serializer_class(list(eager_load(queryset, serializer)), many=True, context=context).data
+
+        def fast():
+            return projection.render(projection.values(queryset))
+
+        results[name] = {
+            'rows': rows,
+            'drf_rows_per_sec': rows_per_second(drf, rows, repeat),
+            'fast_rows_per_sec': rows_per_second(fast, rows, repeat),
+        }
+        results[name]['speedup'] = round(results[name]['fast_rows_per_sec'] / results[name]['drf_rows_per_sec'], 1)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--check', action='store_true', help="Only run the parity check.")
+    parser.add_argument('--rows', type=int, default=1000, help="Rows rendered per benchmark run.")
+    parser.add_argument('--repeat', type=int, default=5, help="Benchmark runs; the best one is reported.")
+    args = parser.parse_args()
+
+    company = Company.objects.filter(name=LARGE_TENANT).first()
+    if company is None:
+        sys.exit("Benchmark database is empty; run `python -m benchmarks.seed_tenant` first.")
+    user = User.objects.filter(company=company, role=User.Role.COMPANY_OWNER).first()
+    client = APIClient()
+    client.force_authenticate(user)
+
+    failures = check_parity(client, parity_paths(company))
+    if failures:
+        sys.exit(f"{failures} response(s) differ between the DRF and values() paths.")
+    if not args.check:
+        print(json.dumps(benchmark(company, user, args.rows, args.repeat), indent=2))
+
+
+if __name__ == '__main__':
+    main()
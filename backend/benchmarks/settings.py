@@ -0,0 +1,28 @@
+"""
+Settings for the benchmark suite: the regular project settings on a local
+SQLite file, so benchmarks run without MySQL or any other service.
+"""
+import os
+
+from config.settings import *  # noqa: F401,F403
+from config.settings import BASE_DIR
+
+DEBUG = False
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.getenv('BENCH_DB', str(BASE_DIR / 'benchmarks' / 'bench.sqlite3')),
+    }
+}
+
+# A second SQLite file standing in for a read replica (see benchmarks/replica.py).
+if os.getenv('BENCH_REPLICA_DB'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.getenv('BENCH_REPLICA_DB'),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+# Hashing thousands of seeded passwords with PBKDF2 would dominate seeding time.
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
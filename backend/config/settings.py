@@ -29,7 +29,9 @@ ALLOWED_HOSTS = ['*']
 from corsheaders.defaults import default_headers
 CORS_ALLOW_HEADERS = list(default_headers) + [
     "ngrok-skip-browser-warning",
+    "x-db-pin",
 ]
+CORS_EXPOSE_HEADERS = ["X-DB-Pin"]
 # Application definition
 
 INSTALLED_APPS = [
@@ -48,25 +50,34 @@ INSTALLED_APPS = [
     'drf_spectacular',
 
     # Local Apps
+    'apps.core',
     'apps.authx',
     'apps.teams',
     'apps.equipment',
     'apps.maintenance',
+    'apps.search',
 ]
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # CORS first
     'django.middleware.security.SecurityMiddleware',
+    'apps.core.middleware.CompressionMiddleware',  # gzip/brotli, before anything that reads the body
+    'apps.core.middleware.ReplicaPinningMiddleware',  # No-op unless a replica database is configured
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'apps.core.middleware.RequestMetricsMiddleware',  # No-op unless REQUEST_METRICS_ENABLED
 ]
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
 
+# Per-request SQL/timing instrumentation (Server-Timing header + /metrics/requests/)
+REQUEST_METRICS_ENABLED = os.getenv('REQUEST_METRICS_ENABLED', 'False') == 'True'
+REQUEST_METRICS_WINDOW = int(os.getenv('REQUEST_METRICS_WINDOW', '500'))
+
 ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
@@ -101,6 +112,21 @@ DATABASES = {
     }
 }
 
+# Optional read replica: safe-method requests read from it (apps.core.routers).
+# A user who writes is pinned to the primary for REPLICA_PIN_SECONDS, which
+# should exceed the usual replication lag. The pin is a signed token the client
+# sends back (db_pin cookie or X-DB-Pin header), so it holds across workers.
+if os.getenv('DB_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': os.getenv('DB_REPLICA_HOST'),
+        'PORT': os.getenv('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['apps.core.routers.ReplicaRouter']
+DATABASE_REPLICA_ALIAS = 'replica'
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', '5'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -152,12 +178,23 @@ CORS_ALLOW_ALL_ORIGINS = True  # For hackathon/dev
 # DRF Settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.authx.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_RENDERER_CLASSES': (
+        'apps.core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'apps.core.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    'DEFAULT_PAGINATION_CLASS': 'apps.core.pagination.CreatedAtCursorPagination',
+    'PAGE_SIZE': int(os.getenv('API_PAGE_SIZE', '50')),
 }
 
 SPECTACULAR_SETTINGS = {
@@ -171,6 +208,69 @@ SPECTACULAR_SETTINGS = {
 
 CSRF_TRUSTED_ORIGINS = ['https://50b59bf0b1b9.ngrok-free.app']
 
+# Equipment bulk import (POST /equipment/bulk-import/)
+EQUIPMENT_IMPORT_BATCH_SIZE = int(os.getenv('EQUIPMENT_IMPORT_BATCH_SIZE', '1000'))
+EQUIPMENT_IMPORT_MAX_BATCH_SIZE = 5000
+
+# Rows fetched per query by the streaming maintenance export
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', '2000'))
+
+# Delta sync (GET /maintenance/sync/)
+SYNC_PAGE_SIZE = int(os.getenv('SYNC_PAGE_SIZE', '500'))
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv('SYNC_TOMBSTONE_RETENTION_DAYS', '30'))
+
+# Server push (GET /events/, Server-Sent Events over config.asgi)
+EVENT_BROKER = 'apps.core.events.InProcessBroker'
+EVENTS_HEARTBEAT_SECONDS = 15  # also how often an open stream re-checks its user
+EVENTS_QUEUE_SIZE = 100
+EVENTS_STREAM_TOKEN_SECONDS = 60  # lifetime of POST /events/token/ tokens, for opening a stream
+
+# Bounded thread pool for independent aggregates (apps.core.concurrency); set
+# to 1 to run them one after another on the calling thread. Each pool thread
+# keeps its database connection for CONCURRENT_QUERY_CONN_MAX_AGE seconds.
+CONCURRENT_QUERY_WORKERS = int(os.getenv('CONCURRENT_QUERY_WORKERS', '4'))
+CONCURRENT_QUERY_CONN_MAX_AGE = int(os.getenv('CONCURRENT_QUERY_CONN_MAX_AGE', '60'))
+
+# Serve GET list/retrieve of requests and equipment from values() rows
+# (apps.core.projection) instead of ModelSerializer instances.
+FAST_READ_SERIALIZATION = os.getenv('FAST_READ_SERIALIZATION', 'True') == 'True'
+
+# Preventive maintenance plans: occurrences are generated this many days ahead
+# by `manage.py generate_preventive_requests` (run it daily, e.g. from cron).
+PREVENTIVE_PLAN_HORIZON_DAYS = int(os.getenv('PREVENTIVE_PLAN_HORIZON_DAYS', '90'))
+PREVENTIVE_PLAN_MAX_HORIZON_DAYS = 730
+
+# New requests without a technician go to the least loaded member of their
+# team (apps.maintenance.assignment); off falls back to the equipment's
+# default technician. Requests without duration_hours count as
+# ASSIGNMENT_DEFAULT_HOURS. Each process re-reads a team's loads after
+# ASSIGNMENT_INDEX_TTL seconds to pick up other processes' writes.
+TECHNICIAN_AUTO_ASSIGNMENT = os.getenv('TECHNICIAN_AUTO_ASSIGNMENT', 'True') == 'True'
+ASSIGNMENT_DEFAULT_HOURS = 1
+ASSIGNMENT_INDEX_TTL = int(os.getenv('ASSIGNMENT_INDEX_TTL', '300'))
+
+# Response compression (apps.core.middleware.CompressionMiddleware)
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+COMPRESSION_BROTLI_QUALITY = 5
+
+# Full-text search (GET /search/)
+SEARCH_RESULT_LIMIT = 20
+SEARCH_MAX_RESULT_LIMIT = 100
+
+# Shared cache (REDIS_URL, e.g. redis://localhost:6379/1). Without it every
+# process has its own local-memory cache, and CachedJWTAuthentication reads
+# users from the database on each request: an invalidation made by one worker
+# would not reach the others, and deactivations must take effect immediately.
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+AUTH_USER_CACHE_ALIAS = 'default'
+AUTH_USER_CACHE_TIMEOUT = int(os.getenv('AUTH_USER_CACHE_TIMEOUT', '300'))
+
 # JWT Settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
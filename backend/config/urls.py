@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
+from apps.core.views import EventStreamTokenView, RequestMetricsView, company_events
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -8,6 +9,10 @@ urlpatterns = [
     path('teams/', include('apps.teams.urls')),
     path('equipment/', include('apps.equipment.urls')),
     path('maintenance/', include('apps.maintenance.urls')),
+    path('search/', include('apps.search.urls')),
+    path('metrics/requests/', RequestMetricsView.as_view(), name='request_metrics'),
+    path('events/', company_events, name='company_events'),  # SSE, needs the ASGI app
+    path('events/token/', EventStreamTokenView.as_view(), name='company_events_token'),
     
     # Swagger/Schema URLs
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
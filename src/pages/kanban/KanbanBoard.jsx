@@ -46,6 +46,7 @@ const KanbanBoard = () => {
         const status = req.status || req.Status; 
         const assignedTo = req.assignedTo || 
                            req.assigned_technician_details?.full_name || 
+                           req.assigned_technician_name || 
                            req.assigned_user?.full_name || 
                            req.assigned_to; 
 
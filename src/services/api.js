@@ -3,7 +3,7 @@ import axiosInstance from "./axiosConfig";
 const api = {
   equipment: {
     getAll: async () => {
-      const response = await axiosInstance.get("/equipment/");
+      const response = await axiosInstance.get("/equipment/", { params: { all: 1 } });
       return Array.isArray(response.data) ? response.data : (response.data.results || []);
     },
     getById: async (id) => {
@@ -21,7 +21,7 @@ const api = {
   },
   maintenance: {
     getRequests: async () => {
-      const response = await axiosInstance.get("/maintenance/");
+      const response = await axiosInstance.get("/maintenance/", { params: { all: 1 } });
       return Array.isArray(response.data) ? response.data : (response.data.results || []);
     },
     createRequest: async (data) => {
@@ -43,13 +43,13 @@ const api = {
       return Array.isArray(response.data) ? response.data : (response.data.results || []);
     },
     getMyTasks: async () => {
-      const response = await axiosInstance.get("/maintenance/my_tasks/");
+      const response = await axiosInstance.get("/maintenance/my_tasks/", { params: { all: 1 } });
       console.log(response.data);
       return Array.isArray(response.data) ? response.data : (response.data.results || []);
     },
     getCalendar: async (start, end) => {
       // Backend likely returns all scheduled requests.
-      const response = await axiosInstance.get("/maintenance/calendar/");
+      const response = await axiosInstance.get("/maintenance/calendar/", { params: { all: 1 } });
       console.log("Calendar API Response:", response.data);
       return Array.isArray(response.data) ? response.data : (response.data.results || []);
     },
@@ -60,7 +60,7 @@ const api = {
       return response.data;
     },
     getAll: async () => {
-      const response = await axiosInstance.get("/teams/");
+      const response = await axiosInstance.get("/teams/", { params: { all: 1 } });
       return Array.isArray(response.data) ? response.data : (response.data.results || []);
     },
   },
@@ -71,7 +71,7 @@ const api = {
       return response.data;
     },
     getAll: async () => { // Assuming an endpoint exists to list employees for team creation
-      const response = await axiosInstance.get("/auth/employees/"); 
+      const response = await axiosInstance.get("/auth/employees/", { params: { all: 1 } }); 
       console.log("Employees", response.data);
       return Array.isArray(response.data) ? response.data : (response.data.results || []);
     }
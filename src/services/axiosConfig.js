@@ -17,6 +17,11 @@ axiosInstance.interceptors.request.use(
     if (token) {
       config.headers.Authorization = `Bearer ${token}`;
     }
+    // Read-your-writes pin from the last write (see backend apps/core/routers.py)
+    const dbPin = sessionStorage.getItem("dbPin");
+    if (dbPin) {
+      config.headers["X-DB-Pin"] = dbPin;
+    }
 
     console.log("------------------------------");
     console.log("API Request Debug:");
@@ -33,7 +38,13 @@ axiosInstance.interceptors.request.use(
 );
 
 axiosInstance.interceptors.response.use(
-  (response) => response,
+  (response) => {
+    const dbPin = response.headers["x-db-pin"];
+    if (dbPin) {
+      sessionStorage.setItem("dbPin", dbPin);
+    }
+    return response;
+  },
   async (error) => {
     const originalRequest = error.config;
 
@@ -4,7 +4,9 @@ import { ENDPOINTS } from "./endpoints";
 const equipmentService = {
   getEquipmentList: async () => {
     try {
-      const response = await axiosInstance.get(ENDPOINTS.EQUIPMENT.LIST);
+      const response = await axiosInstance.get(ENDPOINTS.EQUIPMENT.LIST, {
+        params: { all: 1 },
+      });
       return response.data;
     } catch (error) {
       throw error.response?.data || error.message;
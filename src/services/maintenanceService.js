@@ -14,7 +14,7 @@ const maintenanceService = {
   getRequests: async (params = {}) => {
     try {
       const response = await axiosInstance.get(ENDPOINTS.MAINTENANCE.LIST, {
-        params,
+        params: { all: 1, ...params },
       });
       return response.data;
     } catch (error) {
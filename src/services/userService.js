@@ -4,7 +4,9 @@ import { ENDPOINTS } from "./endpoints";
 const userService = {
   getManagers: async () => {
     try {
-      const response = await axiosInstance.get(ENDPOINTS.AUTH.MANAGERS);
+      const response = await axiosInstance.get(ENDPOINTS.AUTH.MANAGERS, {
+        params: { all: 1 },
+      });
       return response.data;
     } catch (error) {
       throw error.response?.data || error.message;
@@ -13,7 +15,9 @@ const userService = {
 
   getEmployees: async () => {
     try {
-      const response = await axiosInstance.get(ENDPOINTS.AUTH.EMPLOYEES);
+      const response = await axiosInstance.get(ENDPOINTS.AUTH.EMPLOYEES, {
+        params: { all: 1 },
+      });
       return response.data;
     } catch (error) {
       throw error.response?.data || error.message;